@@ -0,0 +1,58 @@
+import logging
+import sqlite3
+
+from youtube_api.report import EventIdReport
+
+from committee_meeting.schema import require_current_schema
+
+## a row for every congress of every channel with a store (zeros included),
+##  in channel registry order like youtube-analyze's report, looked up from the
+##  materialized coverage table
+COVERAGE_QUERY = """
+SELECT channel.committee_name,
+       channel.handle,
+       COALESCE(coverage.total_videos, 0) AS total_videos,
+       COALESCE(coverage.missing_event_id, 0) AS missing_event_id,
+       congress.congress AS congress_number,
+       CASE channel.chamber
+           WHEN 'senate' THEN congress.senate_control
+           ELSE congress.house_control
+       END AS control,
+       channel.chamber
+FROM channel
+CROSS JOIN congress
+LEFT JOIN coverage
+    ON coverage.handle = channel.handle AND coverage.congress = congress.congress
+WHERE channel.has_store
+  AND congress.start_date IS NOT NULL
+  AND channel.committee_index NOT IN (SELECT committee_index FROM undated)
+ORDER BY channel.committee_index, channel.is_primary DESC, congress.congress
+"""
+
+## committees with videos published outside every known congress, which
+##  youtube-analyze refuses to report
+UNDATED_QUERY = """
+SELECT channel.committee_index,
+       channel.committee_name,
+       SUM(coverage.total_videos) AS excluded
+FROM coverage
+JOIN channel USING (handle)
+WHERE coverage.congress = 0 AND coverage.total_videos > 0
+GROUP BY channel.committee_index
+"""
+
+
+def coverage_report(connection: sqlite3.Connection) -> list[EventIdReport]:
+    """
+    Build the YouTube event id coverage report from the warehouse, raising
+    StaleSchema if it wasn't (re)built with the current schema.
+    """
+    require_current_schema(connection)
+    connection.execute("DROP TABLE IF EXISTS temp.undated")
+    connection.execute(f"CREATE TEMP TABLE undated AS {UNDATED_QUERY}")
+    for row in connection.execute("SELECT * FROM temp.undated"):
+        logging.error(
+            f"{row['excluded']} videos of {row['committee_name']} are outside"
+            " the applied date ranges and were excluded from reporting."
+        )
+    return [EventIdReport(**dict(row)) for row in connection.execute(COVERAGE_QUERY)]
@@ -0,0 +1,588 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+from congress_shared.congress_gov import (
+    SYSTEM_CODE_CHAMBERS,
+    as_list,
+    system_code_chamber,
+)
+from congress_shared.globals import (
+    CONGRESS_METADATA,
+    DEFAULT_CHANNELS_CSV,
+    DEFAULT_TINYDB_DIR,
+)
+from congress_shared.storage import read_tables, resolve_storage_path
+from youtube_api.congress_dates import CongressDateBuckets
+from youtube_api.event_id import extract_event_id, has_event_id
+from youtube_api.tables import (
+    VIDEOS_TABLE_PREFIX,
+    load_channel_registry,
+    youtube_tinydb_path,
+)
+
+from committee_meeting.schema import ensure_schema
+
+## source_system of the facts loaded from each kind of store
+CONGRESS_GOV = "congress.gov"
+YOUTUBE = "youtube"
+
+CHAMBERS = ("house", "senate", "joint", "nochamber")
+
+
+def _chamber(value: str | None) -> str:
+    return (value or "nochamber").lower()
+
+
+def _upsert(
+    connection: sqlite3.Connection,
+    table: str,
+    key: tuple[str, ...],
+    columns: tuple[str, ...],
+    rows: Iterable[tuple],
+) -> int:
+    """
+    Insert rows in one executemany, replacing the non-key columns of the
+    rows whose key already exists. Returns the number of rows written.
+    """
+    updates = ", ".join(
+        f"{column} = excluded.{column}" for column in columns if column not in key
+    )
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)})"
+        f" VALUES ({', '.join('?' * len(columns))})"
+        f" ON CONFLICT ({', '.join(key)})"
+        + (f" DO UPDATE SET {updates}" if updates else " DO NOTHING")
+    )
+    rows = list(rows)
+    connection.executemany(sql, rows)
+    return len(rows)
+
+
+# ---- dimensions ----
+def load_dimensions(
+    connection: sqlite3.Connection, csv_path: Path = DEFAULT_CHANNELS_CSV
+) -> int:
+    """Load the congress, chamber and channel dimensions."""
+    loaded = _upsert(
+        connection,
+        "congress",
+        ("congress",),
+        ("congress", "start_date", "end_date", "house_control", "senate_control"),
+        (
+            (int(congress), meta["start"], meta["end"], meta["house"], meta["senate"])
+            for congress, meta in CONGRESS_METADATA.items()
+        ),
+    )
+    loaded += _upsert(
+        connection, "chamber", ("chamber",), ("chamber",), ((c,) for c in CHAMBERS)
+    )
+
+    registry = load_channel_registry(csv_path)
+    channels = []
+    for committee_index, (system_code, meta) in enumerate(
+        registry.system_codes.items()
+    ):
+        for position, handle in enumerate(meta["handles"]):
+            ## rows with fewer handles than the max # have an empty column
+            if handle == "":
+                continue
+            channels.append(
+                (
+                    handle,
+                    system_code,
+                    meta["name"],
+                    committee_index,
+                    system_code_chamber(system_code),
+                    position == 0,
+                )
+            )
+    loaded += _upsert(
+        connection,
+        "channel",
+        ("handle",),
+        (
+            "handle",
+            "committee_system_code",
+            "committee_name",
+            "committee_index",
+            "chamber",
+            "is_primary",
+        ),
+        channels,
+    )
+    return loaded
+
+
+def _ensure_dimensions(
+    connection: sqlite3.Connection,
+    congresses: Iterable[int | None] = (),
+    chambers: Iterable[str] = (),
+) -> None:
+    """Add congresses and chambers missing from the dimensions, e.g. a new congress."""
+    connection.executemany(
+        "INSERT OR IGNORE INTO congress (congress) VALUES (?)",
+        ((c,) for c in set(congresses) if c is not None),
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO chamber (chamber) VALUES (?)",
+        ((c,) for c in set(chambers)),
+    )
+
+
+# ---- watermarks ----
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="seconds")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def store_signature(path: Path) -> tuple[float, int] | None:
+    """
+    The mtime and size of a store file, counting its SQLite write-ahead log
+    (which takes the writes of the sqlite backend until a checkpoint), or
+    None if it doesn't exist.
+    """
+    try:
+        stats = [os.stat(path)]
+    except FileNotFoundError:
+        return None
+    wal_path = Path(f"{path}-wal")
+    if wal_path.exists():
+        stats.append(os.stat(wal_path))
+    return max(stat.st_mtime for stat in stats), sum(stat.st_size for stat in stats)
+
+
+class StoreWatermarks:
+    """
+    The signature (mtime, size) of one store file (e.g. events.json) at the
+    previous load, to tell whether it needs to be read again.
+
+    Attributes:
+        path (Path): The store file, as resolved for the storage backend.
+        signature: The file's current (mtime, size), None if it's missing.
+        fetched_at (str): The file's mtime as an ISO timestamp.
+
+    Methods:
+        unchanged(): Whether the file is as it was at the previous load.
+        save(): Store the signature.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, path: Path) -> None:
+        self.connection = connection
+        self.path = path
+        self.store = path.name
+        self.signature = store_signature(path)
+        self.fetched_at = (
+            _timestamp(self.signature[0]) if self.signature is not None else None
+        )
+        row = connection.execute(
+            "SELECT mtime, size FROM load_source WHERE store = ?", (self.store,)
+        ).fetchone()
+        self._previous = tuple(row) if row is not None else None
+
+    def unchanged(self) -> bool:
+        return self.signature is not None and self._previous == self.signature
+
+    def save(self, loaded_at: str) -> None:
+        if self.signature is None:
+            return
+        self.connection.execute(
+            "INSERT INTO load_source (store, mtime, size, loaded_at) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (store) DO UPDATE SET mtime = excluded.mtime,"
+            " size = excluded.size, loaded_at = excluded.loaded_at",
+            (self.store, *self.signature, loaded_at),
+        )
+
+
+def content_hash(raw: str) -> str:
+    """The raw_hash of a row loaded from the JSON text raw."""
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _loaded_hashes(
+    connection: sqlite3.Connection, sql: str, params: tuple = ()
+) -> dict:
+    """key -> raw_hash of the loaded rows selected by sql (as key, raw_hash)."""
+    return dict(connection.execute(sql, params).fetchall())
+
+
+def _changed(
+    docs: Iterable[dict], key: Callable[[dict], Hashable], loaded_hashes: dict
+) -> list[dict]:
+    """
+    The docs whose key(doc) is new or whose content differs from the loaded
+    row's, e.g. a video enriched or edited in place (its publishedAt, like
+    many updateDates, doesn't move when it is).
+    """
+    return [
+        doc
+        for doc in docs
+        if loaded_hashes.get(key(doc)) != content_hash(json.dumps(doc))
+    ]
+
+
+def _delete(
+    connection: sqlite3.Connection, table: str, key: str, values: Iterable
+) -> int:
+    values = [(value,) for value in values]
+    connection.executemany(f"DELETE FROM {table} WHERE {key} = ?", values)
+    return len(values)
+
+
+# ---- facts ----
+## each loader returns the number of rows it (up)serted and deleted, and only
+##  processes the rows of the stores that changed since the previous load: new
+##  keys, rows whose content changed, and keys that disappeared
+def load_committees(
+    connection: sqlite3.Connection,
+    tinydb_dir: Path = DEFAULT_TINYDB_DIR,
+    loaded_at: str | None = None,
+) -> tuple[int, int]:
+    """Load the changed committee summaries, with the details stored for them."""
+    loaded_at = loaded_at or _now()
+    summaries_marks = StoreWatermarks(
+        connection,
+        resolve_storage_path(Path(tinydb_dir) / "committee-summaries.json"),
+    )
+    details_marks = [
+        StoreWatermarks(
+            connection,
+            resolve_storage_path(
+                Path(tinydb_dir) / f"{chamber}-committee-details.json"
+            ),
+        )
+        for chamber in SYSTEM_CODE_CHAMBERS.values()
+    ]
+    if all(marks.unchanged() for marks in (summaries_marks, *details_marks)):
+        return 0, 0
+
+    ## systemCode -> details
+    details = {}
+    for marks in details_marks:
+        for table in read_tables(marks.path).values():
+            for doc in table.values():
+                details[doc["systemCode"]] = doc
+
+    summaries = read_tables(summaries_marks.path).get("committees", {})
+    loaded_hashes = _loaded_hashes(
+        connection, "SELECT system_code, raw_hash FROM committee"
+    )
+    rows = []
+    for summary in summaries.values():
+        detail = details.get(summary["systemCode"])
+        ## a committee changes with either its summary or its details
+        raw_hash = content_hash(json.dumps([summary, detail]))
+        if loaded_hashes.get(summary["systemCode"]) == raw_hash:
+            continue
+        rows.append(
+            (
+                summary["systemCode"],
+                summary.get("name"),
+                _chamber(summary.get("chamber")),
+                summary.get("committeeTypeCode"),
+                (summary.get("parent") or {}).get("systemCode"),
+                summary.get("url"),
+                summary.get("updateDate"),
+                (detail or {}).get("isCurrent"),
+                json.dumps(summary),
+                json.dumps(detail) if detail is not None else None,
+                raw_hash,
+                CONGRESS_GOV,
+                summaries_marks.fetched_at,
+                loaded_at,
+            )
+        )
+
+    _ensure_dimensions(connection, chambers=(row[2] for row in rows))
+    upserted = _upsert(
+        connection,
+        "committee",
+        ("system_code",),
+        (
+            "system_code",
+            "name",
+            "chamber",
+            "committee_type_code",
+            "parent_system_code",
+            "url",
+            "update_date",
+            "is_current",
+            "summary",
+            "details",
+            "raw_hash",
+            "source_system",
+            "fetched_at",
+            "loaded_at",
+        ),
+        rows,
+    )
+    present = {summary["systemCode"] for summary in summaries.values()}
+    deleted = _delete(
+        connection, "committee", "system_code", loaded_hashes.keys() - present
+    )
+    for marks in (summaries_marks, *details_marks):
+        marks.save(loaded_at)
+    return upserted, deleted
+
+
+def meeting_row(meeting: dict, fetched_at: str | None, loaded_at: str) -> tuple:
+    location = meeting.get("location") or {}
+    raw = json.dumps(meeting)
+    return (
+        int(meeting["eventId"]),
+        int(meeting["congress"]),
+        _chamber(meeting.get("chamber")),
+        meeting.get("type"),
+        meeting.get("title"),
+        meeting.get("meetingStatus"),
+        meeting.get("date"),
+        meeting.get("updateDate"),
+        location.get("room"),
+        location.get("building"),
+        raw,
+        content_hash(raw),
+        CONGRESS_GOV,
+        fetched_at,
+        loaded_at,
+    )
+
+
+MEETING_COLUMNS = (
+    "event_id",
+    "congress",
+    "chamber",
+    "type",
+    "title",
+    "meeting_status",
+    "date",
+    "update_date",
+    "room",
+    "building",
+    "raw",
+    "raw_hash",
+    "source_system",
+    "fetched_at",
+    "loaded_at",
+)
+
+
+def upsert_meetings(
+    connection: sqlite3.Connection,
+    meetings: list[dict],
+    fetched_at: str | None,
+    loaded_at: str,
+) -> int:
+    """Upsert hydrated meetings and their committees by eventId."""
+    rows = [meeting_row(meeting, fetched_at, loaded_at) for meeting in meetings]
+    _ensure_dimensions(
+        connection,
+        congresses=(row[1] for row in rows),
+        chambers=(row[2] for row in rows),
+    )
+    loaded = _upsert(
+        connection, "committee_meeting", ("event_id",), MEETING_COLUMNS, rows
+    )
+    ## replace the committees of the loaded meetings
+    connection.executemany(
+        "DELETE FROM committee_meeting_committee WHERE event_id = ?",
+        ((row[0],) for row in rows),
+    )
+    _upsert(
+        connection,
+        "committee_meeting_committee",
+        ("event_id", "system_code"),
+        ("event_id", "system_code"),
+        (
+            (int(meeting["eventId"]), committee["systemCode"])
+            for meeting in meetings
+            for committee in as_list(meeting.get("committees"))
+            if committee.get("systemCode")
+        ),
+    )
+    return loaded
+
+
+def load_meetings(
+    connection: sqlite3.Connection,
+    tinydb_dir: Path = DEFAULT_TINYDB_DIR,
+    loaded_at: str | None = None,
+) -> tuple[int, int]:
+    """Load the hydrated committee meetings that are new or were updated."""
+    loaded_at = loaded_at or _now()
+    marks = StoreWatermarks(
+        connection, resolve_storage_path(Path(tinydb_dir) / "events.json")
+    )
+    if marks.unchanged():
+        return 0, 0
+
+    meetings = read_tables(marks.path).get("committee_meetings", {})
+    loaded_hashes = _loaded_hashes(
+        connection, "SELECT event_id, raw_hash FROM committee_meeting"
+    )
+    changed = _changed(
+        meetings.values(), lambda meeting: int(meeting["eventId"]), loaded_hashes
+    )
+    upserted = upsert_meetings(connection, changed, marks.fetched_at, loaded_at)
+    present = {int(meeting["eventId"]) for meeting in meetings.values()}
+    deleted = _delete(
+        connection, "committee_meeting", "event_id", loaded_hashes.keys() - present
+    )
+    marks.save(loaded_at)
+    return upserted, deleted
+
+
+def recording_row(
+    video: dict,
+    handle: str,
+    buckets: CongressDateBuckets,
+    fetched_at: str | None,
+    loaded_at: str,
+) -> tuple:
+    congress = buckets.congress_of(video["publishedAt"])
+    raw = json.dumps(video)
+    return (
+        video["videoId"],
+        handle,
+        video["title"],
+        video["publishedAt"],
+        int(congress) if congress is not None else None,
+        extract_event_id(video),
+        has_event_id(video),
+        raw,
+        content_hash(raw),
+        YOUTUBE,
+        fetched_at,
+        loaded_at,
+    )
+
+
+RECORDING_COLUMNS = (
+    "video_id",
+    "handle",
+    "title",
+    "published_at",
+    "congress",
+    "event_id",
+    "has_event_id",
+    "raw",
+    "raw_hash",
+    "source_system",
+    "fetched_at",
+    "loaded_at",
+)
+
+
+def upsert_recordings(
+    connection: sqlite3.Connection,
+    handle: str,
+    videos: Iterable[dict],
+    fetched_at: str | None,
+    loaded_at: str,
+    buckets: CongressDateBuckets | None = None,
+) -> int:
+    """Upsert the YouTube videos of a channel by videoId."""
+    buckets = buckets or CongressDateBuckets()
+    rows = [
+        recording_row(video, handle, buckets, fetched_at, loaded_at) for video in videos
+    ]
+    _ensure_dimensions(connection, congresses=(row[4] for row in rows))
+    return _upsert(connection, "recording", ("video_id",), RECORDING_COLUMNS, rows)
+
+
+def load_recordings(
+    connection: sqlite3.Connection,
+    tinydb_dir: Path = DEFAULT_TINYDB_DIR,
+    csv_path: Path = DEFAULT_CHANNELS_CSV,
+    loaded_at: str | None = None,
+) -> tuple[int, int]:
+    """Load the new and changed stored videos of every channel in the channel dimension."""
+    loaded_at = loaded_at or _now()
+    channels = {
+        row["handle"]: row["committee_index"]
+        for row in connection.execute("SELECT handle, committee_index FROM channel")
+    }
+    buckets = CongressDateBuckets()
+    upserted = deleted = 0
+    for committee_index in sorted(set(channels.values())):
+        marks = StoreWatermarks(
+            connection, youtube_tinydb_path(committee_index, tinydb_dir)
+        )
+        connection.execute(
+            "UPDATE channel SET has_store = ? WHERE committee_index = ?",
+            (marks.signature is not None, committee_index),
+        )
+        if marks.signature is None or marks.unchanged():
+            continue
+
+        tables = read_tables(marks.path)
+        for table_name in tables:
+            handle = table_name[len(VIDEOS_TABLE_PREFIX) :]
+            if (
+                table_name.startswith(VIDEOS_TABLE_PREFIX)
+                and channels.get(handle) != committee_index
+            ):
+                logging.warning(
+                    f"Skipping {table_name} of {marks.path}, not in {csv_path}"
+                )
+
+        for handle, index in channels.items():
+            if index != committee_index:
+                continue
+            table_name = f"{VIDEOS_TABLE_PREFIX}{handle}"
+            videos = tables.get(table_name, {})
+            loaded_hashes = _loaded_hashes(
+                connection,
+                "SELECT video_id, raw_hash FROM recording WHERE handle = ?",
+                (handle,),
+            )
+            changed = _changed(
+                videos.values(), lambda video: video["videoId"], loaded_hashes
+            )
+            upserted += upsert_recordings(
+                connection, handle, changed, marks.fetched_at, loaded_at, buckets
+            )
+            present = {video["videoId"] for video in videos.values()}
+            deleted += _delete(
+                connection, "recording", "video_id", loaded_hashes.keys() - present
+            )
+        marks.save(loaded_at)
+    return upserted, deleted
+
+
+def load_all(
+    connection: sqlite3.Connection,
+    tinydb_dir: Path = DEFAULT_TINYDB_DIR,
+    csv_path: Path = DEFAULT_CHANNELS_CSV,
+    full: bool = False,
+) -> dict[str, tuple[int, int]]:
+    """
+    Load what changed in every store since the previous load (everything
+    with full), each store kind in its own transaction, and return the
+    number of rows upserted and deleted in each table.
+    """
+    loaded_at = _now()
+    ## with full, or when the warehouse was built with another schema version,
+    ##  it's regenerated from the stores
+    ensure_schema(connection, rebuild=full)
+
+    loaded = {}
+    loaders = {
+        "dimensions": lambda: (load_dimensions(connection, csv_path), 0),
+        "committee": lambda: load_committees(connection, tinydb_dir, loaded_at),
+        "committee_meeting": lambda: load_meetings(connection, tinydb_dir, loaded_at),
+        "recording": lambda: load_recordings(
+            connection, tinydb_dir, csv_path, loaded_at
+        ),
+    }
+    for name, loader in loaders.items():
+        with connection:
+            loaded[name] = loader()
+    return loaded
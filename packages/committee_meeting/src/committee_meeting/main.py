@@ -1,6 +1,95 @@
-def main():
-    print("Hello from committee-meeting!")
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from congress_shared.globals import (
+    DEFAULT_CHANNELS_CSV,
+    add_global_args,
+    add_youtube_args,
+)
+from youtube_api.report import write_to_csv
+
+from committee_meeting.coverage import coverage_report
+from committee_meeting.ingest import load_all
+from committee_meeting.schema import StaleSchema, connect, default_warehouse_path
+
+
+def main(
+    tinydb_dir: Path,
+    warehouse_path: Path | None = None,
+    channels_csv_path: Path = DEFAULT_CHANNELS_CSV,
+    report_path: Path | None = None,
+    skip_load: bool = False,
+    full: bool = False,
+):
+    init_time = time.time()
+    warehouse_path = warehouse_path or default_warehouse_path(tinydb_dir)
+    connection = connect(warehouse_path)
+    try:
+        if not skip_load:
+            for table, (upserted, deleted) in load_all(
+                connection, tinydb_dir, channels_csv_path, full
+            ).items():
+                print(f"{table}: {upserted} rows upserted, {deleted} deleted")
+
+        if report_path is not None:
+            try:
+                report = coverage_report(connection)
+            except StaleSchema as e:
+                ## e.g. --skip-load on a warehouse of an older version
+                logging.error(f"Not writing {report_path}: {e}")
+            else:
+                write_to_csv(report, report_path)
+                print(f"Wrote {len(report)} coverage rows to {report_path}")
+    finally:
+        connection.close()
+    logging.info(f"{time.time() - init_time} s elapsed")
+
+
+def parse_args_and_run():
+    parser = argparse.ArgumentParser(
+        description="Load the stored committees, meetings and YouTube videos into"
+        " the SQLite warehouse, and report YouTube event id coverage from it."
+    )
+
+    ## add shared args to the parser
+    add_global_args(parser)
+    add_youtube_args(parser)
+
+    parser.add_argument(
+        "--warehouse-path",  ## dashes are automatically converted to underscores
+        type=lambda x: Path(x).expanduser().resolve(),
+        default=None,
+        help="SQLite file of the warehouse (default: <tinydb_dir>/warehouse.sqlite3).",
+    )
+
+    parser.add_argument(
+        "--report-path",
+        type=Path,
+        default=None,
+        help="Also write the YouTube event id coverage report (the CSV of"
+        " youtube-analyze) to this path.",
+    )
+
+    parser.add_argument(
+        "--skip-load",
+        action="store_true",
+        help="Only query the warehouse, without loading the stores first.",
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Reload every row, instead of only what changed in the stores"
+        " since the previous load.",
+    )
+
+    ## ignore the unknown args
+    args = parser.parse_known_args()[0]
+
+    main(**vars(args))
 
 
 if __name__ == "__main__":
-    main()
+    parse_args_and_run()
@@ -0,0 +1,231 @@
+import sqlite3
+from pathlib import Path
+
+from congress_shared.globals import DEFAULT_TINYDB_DIR
+
+## the warehouse lives next to the stores it's loaded from
+WAREHOUSE_FILENAME = "warehouse.sqlite3"
+
+## bumped on every change to SCHEMA; a warehouse built with another version is
+##  dropped and reloaded from the stores by the next load rather than migrated
+SCHEMA_VERSION = 5
+
+## Committee -> CommitteeMeeting -> Recording (see README.md), plus the
+##  congress / chamber / channel dimensions the coverage dashboard slices by.
+##  Timestamps are ISO-8601 UTC strings as returned by Congress.gov and YouTube,
+##  raw payloads are kept as JSON text for anything not promoted to a column.
+##  Every fact records where it came from (source_system), when its store was
+##  last written before it was loaded (fetched_at, the best the stores tell us),
+##  when it was loaded (loaded_at) and a hash of the payload it was loaded from
+##  (raw_hash), which is how a reload tells the rows that changed.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS congress (
+    congress INTEGER PRIMARY KEY,
+    start_date TEXT,
+    end_date TEXT,
+    house_control TEXT,
+    senate_control TEXT
+);
+
+CREATE TABLE IF NOT EXISTS chamber (
+    chamber TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS committee (
+    system_code TEXT PRIMARY KEY,
+    name TEXT,
+    chamber TEXT REFERENCES chamber (chamber),
+    committee_type_code TEXT,
+    parent_system_code TEXT,
+    url TEXT,
+    update_date TEXT,
+    is_current INTEGER,
+    summary TEXT CHECK (summary IS NULL OR json_valid(summary)),
+    details TEXT CHECK (details IS NULL OR json_valid(details)),
+    raw_hash TEXT NOT NULL,
+    source_system TEXT NOT NULL,
+    fetched_at TEXT,
+    loaded_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS channel (
+    handle TEXT PRIMARY KEY,
+    committee_system_code TEXT NOT NULL,
+    committee_name TEXT NOT NULL,
+    committee_index INTEGER NOT NULL,
+    chamber TEXT REFERENCES chamber (chamber),
+    is_primary INTEGER NOT NULL,
+    -- whether the committee's YouTube store existed at the last load
+    has_store INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS committee_meeting (
+    event_id INTEGER PRIMARY KEY,
+    congress INTEGER REFERENCES congress (congress),
+    chamber TEXT REFERENCES chamber (chamber),
+    type TEXT,
+    title TEXT,
+    meeting_status TEXT,
+    date TEXT,
+    update_date TEXT,
+    room TEXT,
+    building TEXT,
+    raw TEXT NOT NULL CHECK (json_valid(raw)),
+    raw_hash TEXT NOT NULL,
+    source_system TEXT NOT NULL,
+    fetched_at TEXT,
+    loaded_at TEXT NOT NULL
+);
+
+-- a meeting can be held jointly by several committees
+CREATE TABLE IF NOT EXISTS committee_meeting_committee (
+    event_id INTEGER NOT NULL REFERENCES committee_meeting (event_id) ON DELETE CASCADE,
+    system_code TEXT NOT NULL,
+    PRIMARY KEY (event_id, system_code)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS committee_meeting_committee_system_code
+    ON committee_meeting_committee (system_code);
+
+CREATE TABLE IF NOT EXISTS recording (
+    video_id TEXT PRIMARY KEY,
+    type TEXT NOT NULL DEFAULT 'youtube',
+    handle TEXT NOT NULL REFERENCES channel (handle),
+    title TEXT,
+    published_at TEXT,
+    -- NULL when published outside every known congress
+    congress INTEGER REFERENCES congress (congress),
+    -- the Congress.gov event the title or description refers to, if any;
+    --  not a foreign key since the meeting may not have been fetched
+    event_id INTEGER,
+    has_event_id INTEGER NOT NULL,
+    raw TEXT NOT NULL CHECK (json_valid(raw)),
+    raw_hash TEXT NOT NULL,
+    source_system TEXT NOT NULL,
+    fetched_at TEXT,
+    loaded_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS recording_handle_congress ON recording (handle, congress);
+CREATE INDEX IF NOT EXISTS recording_event_id ON recording (event_id);
+
+-- videos and videos without an event id per channel and congress, the grain
+--  of the coverage dashboard (the channel gives the committee and chamber,
+--  the congress the party control), kept current by the triggers below as
+--  recordings are upserted and deleted; congress is 0 for the videos
+--  published outside every known congress
+CREATE TABLE IF NOT EXISTS coverage (
+    handle TEXT NOT NULL REFERENCES channel (handle),
+    congress INTEGER NOT NULL,
+    total_videos INTEGER NOT NULL,
+    missing_event_id INTEGER NOT NULL,
+    PRIMARY KEY (handle, congress)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS coverage_recording_insert AFTER INSERT ON recording
+BEGIN
+    INSERT INTO coverage (handle, congress, total_videos, missing_event_id)
+    VALUES (NEW.handle, COALESCE(NEW.congress, 0), 1, NOT NEW.has_event_id)
+    ON CONFLICT (handle, congress) DO UPDATE SET
+        total_videos = total_videos + 1,
+        missing_event_id = missing_event_id + excluded.missing_event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS coverage_recording_delete AFTER DELETE ON recording
+BEGIN
+    UPDATE coverage SET
+        total_videos = total_videos - 1,
+        missing_event_id = missing_event_id - (NOT OLD.has_event_id)
+    WHERE handle = OLD.handle AND congress = COALESCE(OLD.congress, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS coverage_recording_update
+AFTER UPDATE OF handle, congress, has_event_id ON recording
+WHEN OLD.handle IS NOT NEW.handle
+    OR OLD.congress IS NOT NEW.congress
+    OR OLD.has_event_id IS NOT NEW.has_event_id
+BEGIN
+    UPDATE coverage SET
+        total_videos = total_videos - 1,
+        missing_event_id = missing_event_id - (NOT OLD.has_event_id)
+    WHERE handle = OLD.handle AND congress = COALESCE(OLD.congress, 0);
+    INSERT INTO coverage (handle, congress, total_videos, missing_event_id)
+    VALUES (NEW.handle, COALESCE(NEW.congress, 0), 1, NOT NEW.has_event_id)
+    ON CONFLICT (handle, congress) DO UPDATE SET
+        total_videos = total_videos + 1,
+        missing_event_id = missing_event_id + excluded.missing_event_id;
+END;
+
+-- the signature of each store file at its last load, to skip unchanged files
+--  without reading them
+CREATE TABLE IF NOT EXISTS load_source (
+    store TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+);
+"""
+
+
+def default_warehouse_path(tinydb_dir: str | Path = DEFAULT_TINYDB_DIR) -> Path:
+    return Path(tinydb_dir) / WAREHOUSE_FILENAME
+
+
+class StaleSchema(RuntimeError):
+    """Raised when querying a warehouse built with another SCHEMA_VERSION."""
+
+
+def connect(path: str | Path) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the warehouse at path, in WAL mode. Its schema
+    is created, or rebuilt if outdated, by ensure_schema (see load_all).
+    """
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    return connection
+
+
+def schema_current(connection: sqlite3.Connection) -> bool:
+    """Whether the warehouse was built with the current SCHEMA_VERSION."""
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    return version == SCHEMA_VERSION
+
+
+def require_current_schema(connection: sqlite3.Connection) -> None:
+    """Raise StaleSchema unless the warehouse has the current SCHEMA_VERSION."""
+    if not schema_current(connection):
+        raise StaleSchema(
+            f"The warehouse wasn't built with schema version {SCHEMA_VERSION},"
+            " load it (without --skip-load) to rebuild it from the stores"
+        )
+
+
+def ensure_schema(connection: sqlite3.Connection, rebuild: bool = False) -> None:
+    """
+    Create the schema, first dropping every table if rebuild is set or the
+    warehouse was built with another SCHEMA_VERSION (it's then reloaded from
+    the stores rather than migrated).
+    """
+    if rebuild or not schema_current(connection):
+        drop_all(connection)
+    connection.executescript(SCHEMA)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def drop_all(connection: sqlite3.Connection) -> None:
+    """Drop every table, e.g. to reload the warehouse from scratch."""
+    tables = [
+        name
+        for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+            " AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    connection.execute("PRAGMA foreign_keys=OFF")
+    with connection:
+        for name in tables:
+            connection.execute(f'DROP TABLE IF EXISTS "{name}"')
+    connection.execute("PRAGMA foreign_keys=ON")
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+from tinydb import Query
+
+from congress_shared.storage import open_tinydb
+from youtube_api.tables import youtube_tinydb_path
+
+from committee_meeting.schema import connect, default_warehouse_path
+
+## the two Agriculture channels, committee 0 of the bundled youtube-accounts.csv
+COMMITTEE_INDEX = 0
+HANDLES = ("@AgRepublicans", "@HouseAgDems")
+
+
+def make_video(video_id: str, published_at: str, title: str = "Hearing") -> dict:
+    return {
+        "videoId": video_id,
+        "title": title,
+        "description": "",
+        "publishedAt": published_at,
+    }
+
+
+class YoutubeStore:
+    """
+    The YouTube store of the Agriculture committee in a test's tinydb_dir,
+    written straight to disk so every change is seen by the next load.
+    """
+
+    def __init__(self, tinydb_dir: Path) -> None:
+        self.db = open_tinydb(
+            youtube_tinydb_path(COMMITTEE_INDEX, tinydb_dir), buffered=False
+        )
+
+    def insert(self, handle: str, *videos: dict) -> None:
+        self.db.table(f"youtube_videos_{handle}").insert_multiple(videos)
+
+    def update(self, handle: str, video_id: str, **fields) -> None:
+        self.db.table(f"youtube_videos_{handle}").update(
+            fields, Query().videoId == video_id
+        )
+
+    def remove(self, handle: str, video_id: str) -> None:
+        self.db.table(f"youtube_videos_{handle}").remove(Query().videoId == video_id)
+
+
+@pytest.fixture
+def tinydb_dir(tmp_path: Path) -> Path:
+    return tmp_path
+
+
+@pytest.fixture
+def youtube_store(tinydb_dir: Path) -> YoutubeStore:
+    store = YoutubeStore(tinydb_dir)
+    store.insert(
+        HANDLES[0],
+        make_video("ag1", "2023-02-01T15:00:00Z", "Farm Bill Hearing EventID=115001"),
+        make_video("ag2", "2023-06-01T15:00:00Z"),
+        make_video("ag3", "2021-03-01T15:00:00Z"),
+    )
+    store.insert(
+        HANDLES[1],
+        make_video("dem1", "2024-01-10T15:00:00Z"),
+        make_video("dem2", "2024-05-10T15:00:00Z", "Markup (Event ID: 116002)"),
+    )
+    yield store
+    store.db.close()
+
+
+@pytest.fixture
+def warehouse(tinydb_dir: Path):
+    connection = connect(default_warehouse_path(tinydb_dir))
+    yield connection
+    connection.close()
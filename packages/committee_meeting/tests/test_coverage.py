@@ -0,0 +1,90 @@
+from youtube_api import tables
+from youtube_api.analyze.main import main as youtube_analyze
+
+from committee_meeting.ingest import load_all
+from committee_meeting.main import main
+
+from conftest import HANDLES, make_video
+
+## what the coverage triggers maintain, recounted from the recordings
+RECOUNT_QUERY = """
+SELECT handle,
+       COALESCE(congress, 0) AS congress,
+       COUNT(*) AS total_videos,
+       SUM(NOT has_event_id) AS missing_event_id
+FROM recording
+GROUP BY handle, COALESCE(congress, 0)
+"""
+
+
+def assert_coverage_matches_recordings(warehouse) -> None:
+    coverage = {
+        tuple(row)
+        for row in warehouse.execute(
+            "SELECT handle, congress, total_videos, missing_event_id FROM coverage"
+            " WHERE total_videos > 0"
+        )
+    }
+    assert coverage == {tuple(row) for row in warehouse.execute(RECOUNT_QUERY)}
+
+
+def test_coverage_follows_has_event_id_flips(tinydb_dir, youtube_store, warehouse):
+    load_all(warehouse, tinydb_dir)
+    assert_coverage_matches_recordings(warehouse)
+
+    ## gains an event id
+    youtube_store.update(HANDLES[0], "ag2", description="house-event/118543")
+    load_all(warehouse, tinydb_dir)
+    assert_coverage_matches_recordings(warehouse)
+
+    ## loses it
+    youtube_store.update(HANDLES[0], "ag1", title="Farm Bill Hearing")
+    load_all(warehouse, tinydb_dir)
+    assert_coverage_matches_recordings(warehouse)
+
+    ## both at once, plus a video moving congress and one outside every congress
+    youtube_store.update(HANDLES[1], "dem1", title="Event ID: 116001")
+    youtube_store.update(HANDLES[1], "dem2", title="Markup")
+    youtube_store.update(HANDLES[0], "ag3", publishedAt="2019-06-01T15:00:00Z")
+    youtube_store.insert(HANDLES[0], make_video("old", "1990-01-01T00:00:00Z"))
+    load_all(warehouse, tinydb_dir)
+    assert_coverage_matches_recordings(warehouse)
+
+    youtube_store.remove(HANDLES[0], "old")
+    youtube_store.remove(HANDLES[1], "dem1")
+    load_all(warehouse, tinydb_dir)
+    assert_coverage_matches_recordings(warehouse)
+
+    ## and a full reload agrees with the incremental one
+    incremental = set(map(tuple, warehouse.execute(RECOUNT_QUERY)))
+    load_all(warehouse, tinydb_dir, full=True)
+    assert_coverage_matches_recordings(warehouse)
+    assert set(map(tuple, warehouse.execute(RECOUNT_QUERY))) == incremental
+
+
+def youtube_analyze_report(tinydb_dir, monkeypatch) -> str:
+    ## a fresh pool, so the stores are reread rather than served from memory
+    monkeypatch.setattr(tables, "_YOUTUBE_POOL", tables._YoutubeTinyDBPool())
+    output_path = tinydb_dir / "youtube-analyze.csv"
+    youtube_analyze(output_path=output_path, tinydb_dir=tinydb_dir, nthreads=1)
+    return output_path.read_text()
+
+
+def warehouse_report(tinydb_dir) -> str:
+    report_path = tinydb_dir / "warehouse.csv"
+    main(tinydb_dir, report_path=report_path)
+    return report_path.read_text()
+
+
+def test_report_matches_youtube_analyze(tinydb_dir, youtube_store, monkeypatch):
+    first = warehouse_report(tinydb_dir)
+    assert "Agriculture,@HouseAgDems,2,1,118,Republican,house" in first
+    assert first == youtube_analyze_report(tinydb_dir, monkeypatch)
+
+    youtube_store.update(HANDLES[0], "ag2", description="(EventID=118543)")
+    youtube_store.update(HANDLES[1], "dem2", title="Markup")
+    youtube_store.remove(HANDLES[0], "ag3")
+    youtube_store.insert(HANDLES[1], make_video("dem3", "2025-02-01T15:00:00Z"))
+    incremental = warehouse_report(tinydb_dir)
+    assert incremental != first
+    assert incremental == youtube_analyze_report(tinydb_dir, monkeypatch)
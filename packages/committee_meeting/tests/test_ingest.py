@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from committee_meeting.coverage import coverage_report
+from committee_meeting.ingest import load_all
+from committee_meeting.schema import SCHEMA_VERSION, StaleSchema
+
+from conftest import HANDLES
+
+
+def recording(warehouse, video_id: str):
+    return warehouse.execute(
+        "SELECT * FROM recording WHERE video_id = ?", (video_id,)
+    ).fetchone()
+
+
+def missing_event_id(warehouse, handle: str, congress: int) -> int:
+    (missing,) = warehouse.execute(
+        "SELECT missing_event_id FROM coverage WHERE handle = ? AND congress = ?",
+        (handle, congress),
+    ).fetchone()
+    return missing
+
+
+def test_first_load_and_noop_reload(tinydb_dir, youtube_store, warehouse):
+    loaded = load_all(warehouse, tinydb_dir)
+    assert loaded["recording"] == (5, 0)
+    assert recording(warehouse, "ag1")["event_id"] == 115001
+    assert recording(warehouse, "ag3")["congress"] == 117
+
+    ## nothing was written to the stores since
+    loaded = load_all(warehouse, tinydb_dir)
+    assert loaded["recording"] == (0, 0)
+
+
+def test_reload_picks_up_video_edited_in_place(tinydb_dir, youtube_store, warehouse):
+    load_all(warehouse, tinydb_dir)
+    before = recording(warehouse, "ag2")
+    assert not before["has_event_id"]
+    assert missing_event_id(warehouse, HANDLES[0], 118) == 1
+
+    ## e.g. enriched with its details, same videoId and publishedAt
+    youtube_store.update(
+        HANDLES[0], "ag2", description="(EventID=118543)", duration="PT2H3M"
+    )
+    loaded = load_all(warehouse, tinydb_dir)
+    assert loaded["recording"] == (1, 0)
+
+    after = recording(warehouse, "ag2")
+    assert after["raw"] != before["raw"]
+    assert after["raw_hash"] != before["raw_hash"]
+    assert json.loads(after["raw"])["duration"] == "PT2H3M"
+    assert after["has_event_id"]
+    assert after["event_id"] == 118543
+    assert missing_event_id(warehouse, HANDLES[0], 118) == 0
+
+
+def test_reload_deletes_removed_video(tinydb_dir, youtube_store, warehouse):
+    load_all(warehouse, tinydb_dir)
+    youtube_store.remove(HANDLES[1], "dem1")
+    loaded = load_all(warehouse, tinydb_dir)
+    assert loaded["recording"] == (0, 1)
+    assert recording(warehouse, "dem1") is None
+    assert missing_event_id(warehouse, HANDLES[1], 118) == 0
+
+
+def test_stale_schema_is_refused_then_rebuilt(tinydb_dir, youtube_store, warehouse):
+    load_all(warehouse, tinydb_dir)
+    warehouse.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+
+    ## e.g. --skip-load with a warehouse of an older version
+    with pytest.raises(StaleSchema):
+        coverage_report(warehouse)
+
+    ## the next load drops it and reloads everything
+    loaded = load_all(warehouse, tinydb_dir)
+    assert loaded["recording"] == (5, 0)
+    assert len(coverage_report(warehouse)) > 0
@@ -0,0 +1,145 @@
+"""
+Micro-benchmark of the XML fallback parser used by generic_request.
+
+Compares the original ElementTree parse and recursive conversion (copied
+below) against congress_api.xml_to_dict.parse_xml_string with ElementTree and
+with lxml, and checks that every variant returns the same dict.
+
+Runs over captured Congress.gov committee-meeting XML payloads (``*.xml`` in
+--xml_dir), or a synthetic meeting with --witnesses witnesses and documents
+when none are given.
+
+    python packages/congress_api/benchmarks/xml_to_dict.py [--xml_dir DIR] [--witnesses N] [--repeat N]
+"""
+
+import argparse
+import time
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+
+from congress_api.xml_to_dict import lxml_etree, parse_xml_string
+
+WITNESS_TEMPLATE = """
+      <item>
+        <name>Witness Number {i}</name>
+        <position>Director of Something, Department {i}</position>
+        <organization>Organization &amp; Affiliates {i}</organization>
+      </item>"""
+
+DOCUMENT_TEMPLATE = """
+      <item>
+        <name>Testimony {i}</name>
+        <documentType>Witness Statement</documentType>
+        <format>PDF</format>
+        <url>https://www.congress.gov/118/meeting/house/118543/witnesses/HHRG-118-{i:06d}.pdf</url>
+      </item>"""
+
+
+def synthetic_meeting(witnesses: int) -> bytes:
+    """A committee-meeting response shaped like Congress.gov's, with many witnesses."""
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<api-root>
+  <committeeMeeting>
+    <eventId>118543</eventId>
+    <updateDate>2025-01-01T12:00:00Z</updateDate>
+    <congress>118</congress>
+    <type>Hearing</type>
+    <title>Oversight of Something Important</title>
+    <meetingStatus>Scheduled</meetingStatus>
+    <date>2024-06-04T14:00:00Z</date>
+    <chamber>House</chamber>
+    <committees>
+      <item>
+        <url>https://api.congress.gov/v3/committee/house/hsgo00?format=xml</url>
+        <systemCode>hsgo00</systemCode>
+        <name>Oversight and Accountability Committee</name>
+      </item>
+    </committees>
+    <location>
+      <room>2154</room>
+      <building>Rayburn House Office Building</building>
+    </location>
+    <witnesses>{"".join(WITNESS_TEMPLATE.format(i=i) for i in range(witnesses))}
+    </witnesses>
+    <witnessDocuments>{"".join(DOCUMENT_TEMPLATE.format(i=i) for i in range(witnesses))}
+    </witnessDocuments>
+    <meetingDocuments/>
+  </committeeMeeting>
+  <request>
+    <format>xml</format>
+    <contentType>application/xml</contentType>
+  </request>
+</api-root>
+""".encode("utf-8")
+
+
+def legacy_xml_to_dict(elem):
+    # get text if no children
+    if not list(elem):
+        return elem.text.strip() if elem.text and elem.text.strip() else None
+
+    result = {}
+    for child in elem:
+        child_data = legacy_xml_to_dict(child)
+
+        # group by tag name
+        if child.tag in result:
+            # convert to list if needed
+            if not isinstance(result[child.tag], list):
+                result[child.tag] = [result[child.tag]]
+            result[child.tag].append(child_data)
+        else:
+            result[child.tag] = child_data
+
+    return result
+
+
+def legacy_parse_xml_string(xml_str) -> dict:
+    root = ET.fromstring(xml_str)
+    return {root.tag: legacy_xml_to_dict(root)}
+
+
+def time_parser(parser, payloads: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            parser(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(xml_dir: Path | None = None, witnesses: int = 500, repeat: int = 5) -> None:
+    if xml_dir is not None:
+        payloads = [path.read_bytes() for path in sorted(xml_dir.glob("*.xml"))]
+    else:
+        payloads = [synthetic_meeting(witnesses)]
+    total_bytes = sum(len(payload) for payload in payloads)
+    print(f"{len(payloads)} payloads, {total_bytes / 1024:.0f} KiB")
+
+    parsers = {
+        "legacy": legacy_parse_xml_string,
+        "ElementTree": lambda payload: parse_xml_string(payload, use_lxml=False),
+    }
+    if lxml_etree is not None:
+        parsers["lxml"] = parse_xml_string
+    else:
+        print("lxml not installed, skipping it")
+
+    expected = [legacy_parse_xml_string(payload) for payload in payloads]
+    legacy_time = None
+    for name, parser in parsers.items():
+        if [parser(payload) for payload in payloads] != expected:
+            raise SystemExit(f"{name} returned a different dict")
+        elapsed = time_parser(parser, payloads, repeat)
+        legacy_time = legacy_time or elapsed
+        print(f"{name:<12} {elapsed:8.4f} s  ({legacy_time / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--xml_dir", type=Path, default=None)
+    parser.add_argument("--witnesses", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(**vars(parser.parse_args()))
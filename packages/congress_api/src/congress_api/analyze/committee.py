@@ -1,9 +1,13 @@
 from tinydb import TinyDB
 
+from congress_shared.globals import DEFAULT_TINYDB_DIR
+
+from ..cache import ResponseCache
 from .committee_details import CommitteeDetails
 from .committee_summary import CommitteeSummary
 from youtube_api.tables import (
-    map_system_code_committee_handles,
+    YoutubeChannelMetadata,
+    load_channel_registry,
     open_tinydb_for_committee,
 )
 
@@ -11,7 +15,7 @@ from youtube_api.tables import (
 class Committee:
     summary: CommitteeSummary = None
     details: CommitteeDetails = None
-    youtube: TinyDB = None
+    youtube_channel: YoutubeChannelMetadata = None
     events: list
 
     def __init__(self):
@@ -25,7 +29,8 @@ class Committee:
     def from_summary(cls, summary: CommitteeSummary):
         ## TODO: replace chamber with validation and Literal; should extract that...
         inst = cls()
-        youtube_channel_meta_mapper = map_system_code_committee_handles()
+        ## parsed once per process and shared by every committee
+        channel_registry = load_channel_registry()
         ## bind the summary
         inst.summary = summary
         systemCode = (
@@ -33,22 +38,48 @@ class Committee:
             if inst.summary.parent is None
             else inst.summary.parent.systemCode
         )
-        try:
-            inst.youtube = open_tinydb_for_committee(
-                youtube_channel_meta_mapper[systemCode]["name"],
-                assert_exists=True,
-            )
-        except KeyError:
+        ## only bind the channel here, its tinydb is opened on first access
+        inst.youtube_channel = channel_registry.get(systemCode)
+        if inst.youtube_channel is None:
             print(f"No YouTube channel found for {inst.summary.systemCode}")
         return inst
 
-    def get_details(self, api_key: str, force_fetch: bool = False):
+    @property
+    def youtube(self) -> TinyDB | None:
+        if self.youtube_channel is None:
+            return None
+        ## served from the shared pool, so subcommittees reuse their parent's db
+        return open_tinydb_for_committee(
+            self.youtube_channel["name"],
+            assert_exists=True,
+        )
+
+    def get_details(
+        self,
+        api_key: str,
+        force_fetch: bool = False,
+        cache: ResponseCache | None = None,
+        tinydb_dir: str = DEFAULT_TINYDB_DIR,
+    ):
         if self.details is not None:
             return self.details
 
         ## will load from the tinydb before fetching
         self.details = CommitteeDetails.from_spec(
-            self.summary.chamber, self.summary.systemCode, api_key, force_fetch
+            self.summary.chamber,
+            self.summary.systemCode,
+            api_key,
+            force_fetch,
+            cache,
+            tinydb_dir,
         )
 
         return self.details
+
+    def details_outdated(self, tinydb_dir: str = DEFAULT_TINYDB_DIR) -> bool:
+        """
+        Whether the details stored under tinydb_dir are missing or older than
+        the updateDate reported by the (cheap) committee list endpoint's summary.
+        """
+        stored = CommitteeDetails.from_system_code(self.summary.systemCode, tinydb_dir)
+        return stored is None or stored.updateDate < self.summary.updateDate
@@ -1,11 +1,14 @@
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import os
-from tinydb import TinyDB, Query
+from tinydb import TinyDB
 from typing import TypedDict, Literal, Dict, List, Optional
 
 from ..api import congress_api_get
+from ..cache import ResponseCache
+from congress_shared.congress_gov import SYSTEM_CODE_CHAMBERS, system_code_chamber
 from congress_shared.globals import DEFAULT_TINYDB_DIR
+from congress_shared.storage import KeyIndex, flush_tinydb, get_key_index, open_tinydb
 
 DETAILS_TB = None
 
@@ -29,30 +32,52 @@ class HistoryEntry(TypedDict, total=False):
 ISO_FMT = "%Y-%m-%dT%H:%M:%SZ"
 
 
+## committee details are stored in one file per chamber of their systemCode
+DetailsChamber = Literal["house", "senate", "joint"]
+DETAILS_CHAMBERS: tuple[DetailsChamber, ...] = tuple(SYSTEM_CODE_CHAMBERS.values())
+
+
 class _TinyDBMemoizer:
     """Memoizes TinyDB instances per (tinydb_dir, chamber)."""
 
     def __init__(self) -> None:
         self._cache: Dict[tuple[str, str], TinyDB] = {}
 
-    def get(self, tinydb_dir: str, chamber: Literal["house", "senate"]) -> TinyDB:
+    def get(self, tinydb_dir: str, chamber: DetailsChamber) -> TinyDB:
         if not os.path.isdir(tinydb_dir):
             raise OSError(f"{tinydb_dir} does not exist. Cannot create details tinydb")
-        if chamber not in {"house", "senate"}:
+        if chamber not in DETAILS_CHAMBERS:
             raise ValueError(
-                f"Invalid chamber: {chamber}, must be one of: 'house', 'senate'"
+                f"Invalid chamber: {chamber}, must be one of: {DETAILS_CHAMBERS}"
             )
         key = (os.path.abspath(tinydb_dir), chamber)
         db = self._cache.get(key)
         if db is None:
-            db = TinyDB(os.path.join(tinydb_dir, f"{chamber}-committee-details.json"))
+            db = open_tinydb(
+                os.path.join(tinydb_dir, f"{chamber}-committee-details.json")
+            )
             self._cache[key] = db
         return db
 
+    def get_index(self, tinydb_dir: str, chamber: DetailsChamber) -> KeyIndex:
+        """Return the systemCode index of the memoized TinyDB."""
+        db = self.get(tinydb_dir, chamber)
+        return get_key_index(db.table(db.default_table_name), "systemCode")
+
+    def flush(self) -> None:
+        """Write the buffered changes of every memoized TinyDB to disk."""
+        for db in self._cache.values():
+            flush_tinydb(db)
+
 
 _DB_MEMO = _TinyDBMemoizer()
 
 
+def flush_committee_details() -> None:
+    """Write the buffered changes of every opened details TinyDB to disk."""
+    _DB_MEMO.flush()
+
+
 @dataclass(slots=True)
 class CommitteeDetails:
     bills: Optional[DocCount] = field(default_factory=lambda: {"count": 0, "url": ""})
@@ -74,26 +99,26 @@ class CommitteeDetails:
         self,
         update: bool = False,
         tinydb_dir: str = DEFAULT_TINYDB_DIR,
-        chamber: Literal["house", "senate"] = "house",
     ) -> None:
         """
-        Insert/update this record in TinyDB.
+        Insert/update this record in the TinyDB of its systemCode's chamber.
         - When update=False and a record exists, skip (preserves current DB value).
         - When update=True, overwrite the stored fields with this instance.
         """
-        db = _DB_MEMO.get(tinydb_dir=tinydb_dir, chamber=chamber)
-        details_q = Query()
+        index = _DB_MEMO.get_index(
+            tinydb_dir=tinydb_dir, chamber=system_code_chamber(self.systemCode)
+        )
         payload = self.to_dict()
 
-        if db.count(details_q.systemCode == self.systemCode) > 0:
+        if self.systemCode in index:
             ## update the entry storing, it's already in the db
             if update:
-                db.update(payload, details_q.systemCode == self.systemCode)
+                index.update(payload, self.systemCode)
             else:
                 ## skip storing, it's already in the db
                 pass
         else:
-            db.insert(payload)
+            index.insert(payload)
 
     # ---- (De)serialization ----
     @staticmethod
@@ -131,13 +156,10 @@ class CommitteeDetails:
         return cls(**new_dict)  # type: ignore[arg-type]
 
     @classmethod
-    def from_system_code(cls, system_code):
-        # Check if the committee is already in the memoized DB
-        db = _DB_MEMO.get(
-            DEFAULT_TINYDB_DIR, "house"
-        )  # Assuming "house" or "senate" can be determined here
-        details_q = Query()
-        result = db.get(details_q.systemCode == system_code)
+    def from_system_code(cls, system_code, tinydb_dir: str = DEFAULT_TINYDB_DIR):
+        # Check if the committee is already in the memoized DB of its chamber
+        index = _DB_MEMO.get_index(tinydb_dir, system_code_chamber(system_code))
+        result = index.get(system_code)
         if result:
             return cls.from_dict(result)
         else:
@@ -145,22 +167,40 @@ class CommitteeDetails:
             return None
 
     @classmethod
-    def from_spec(cls, chamber: str, system_code: str, api_key: str, force_fetch: bool):
+    def from_spec(
+        cls,
+        chamber: str,
+        system_code: str,
+        api_key: str,
+        force_fetch: bool,
+        cache: ResponseCache | None = None,
+        tinydb_dir: str = DEFAULT_TINYDB_DIR,
+    ):
         ## TODO: need to validate chamber with extracted logic
-        endpoint = f"committee/{chamber}/{system_code}"
-
         if not force_fetch:
             ## attempt to load the instance from the tinydb
-            inst = cls.from_system_code(system_code)
+            inst = cls.from_system_code(system_code, tinydb_dir)
         else:
             ## manually set to None so we are forced to fetch it below
             inst = None
 
         if inst is None:
             # Fetch from the URL if not in DB
-            details = congress_api_get(endpoint, pagination=False, api_key=api_key)[
-                "committee"
-            ]
-            inst = cls.from_dict(details)
-            inst.store(update=force_fetch)
+            inst = cls.fetch(chamber, system_code, api_key, cache)
+            inst.store(update=force_fetch, tinydb_dir=tinydb_dir)
         return inst
+
+    @classmethod
+    def fetch(
+        cls,
+        chamber: str,
+        system_code: str,
+        api_key: str,
+        cache: ResponseCache | None = None,
+    ) -> "CommitteeDetails":
+        """Fetch a committee's details from the API without storing them (thread safe)."""
+        endpoint = f"committee/{chamber}/{system_code}"
+        details = congress_api_get(
+            endpoint, pagination=False, cache=cache, api_key=api_key
+        )["committee"]
+        return cls.from_dict(details)
@@ -0,0 +1,97 @@
+import os
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, TypedDict
+
+from congress_shared.globals import DEFAULT_CHANNELS_CSV, DEFAULT_TINYDB_DIR
+from youtube_api.event_id import extract_event_id
+from youtube_api.tables import (
+    VIDEOS_TABLE_PREFIX,
+    load_channel_registry,
+    open_tinydb_for_committee,
+    youtube_tinydb_path,
+)
+
+
+class Recording(TypedDict):
+    videoId: str
+    handle: str
+    title: str
+    publishedAt: str
+
+
+class EventVideoIndex:
+    """
+    Inverted index from Congress.gov event ids to the YouTube videos whose
+    title or description references them, built in one pass over the videos.
+
+    Methods:
+        from_youtube_tinydbs(): Build the index over every youtube_NN.json store.
+        add(): Index a single video.
+        recordings_for(): Return the recordings of an event id.
+        video_ids_for(): Return the video ids of an event id.
+        link_meetings(): Attach recordings to committee meetings in one pass.
+    """
+
+    def __init__(self) -> None:
+        self._recordings: dict[int, list[Recording]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._recordings)
+
+    def __contains__(self, event_id: int) -> bool:
+        return int(event_id) in self._recordings
+
+    @classmethod
+    def from_youtube_tinydbs(
+        cls,
+        tinydb_dir: Path = DEFAULT_TINYDB_DIR,
+        csv_path: Path = DEFAULT_CHANNELS_CSV,
+    ) -> "EventVideoIndex":
+        inst = cls()
+        registry = load_channel_registry(csv_path)
+        for committee_index in range(len(registry)):
+            if not os.path.exists(youtube_tinydb_path(committee_index, tinydb_dir)):
+                continue
+            tinydb = open_tinydb_for_committee(
+                committee_index, csv_path=csv_path, tinydb_dir=tinydb_dir
+            )
+            for table_name in tinydb.tables():
+                if not table_name.startswith(VIDEOS_TABLE_PREFIX):
+                    continue
+                handle = table_name[len(VIDEOS_TABLE_PREFIX) :]
+                for video in tinydb.table(table_name):
+                    inst.add(handle, video)
+        return inst
+
+    def add(self, handle: str, video: dict) -> int | None:
+        """Index a video under the event id it references, returning that id."""
+        event_id = extract_event_id(video)
+        if event_id is not None:
+            self._recordings[event_id].append(
+                {
+                    "videoId": video["videoId"],
+                    "handle": handle,
+                    "title": video["title"],
+                    "publishedAt": video["publishedAt"],
+                }
+            )
+        return event_id
+
+    def recordings_for(self, event_id: int) -> list[Recording]:
+        return self._recordings.get(int(event_id), [])
+
+    def video_ids_for(self, event_id: int) -> list[str]:
+        return [recording["videoId"] for recording in self.recordings_for(event_id)]
+
+    def link_meetings(self, meetings: Iterable[dict]) -> int:
+        """
+        Set ``recordings`` on every committee meeting (in place) to the videos
+        referencing its eventId, returning the number of meetings with video.
+        """
+        linked = 0
+        for meeting in meetings:
+            meeting["recordings"] = self.recordings_for(meeting["eventId"])
+            linked += len(meeting["recordings"]) > 0
+        return linked
@@ -1,32 +1,41 @@
 import argparse
-from collections import defaultdict
-
 
 from congress_shared.globals import add_global_args
 from ..fetch.congress_committee_fetcher import CongressCommitteeFetcher
 from ..fetch.congress_event_fetcher import CongressEventFetcher
+from .event_video_index import EventVideoIndex
 
 
 def main(tinydb_dir: str, chamber: str = "house", congress_number: int = 119):
-    ## pass a dummy api_key so we can access tinydb tables
+    ## analysis only reads the tinydbs and the response cache, no api key needed
     committee_fetcher = CongressCommitteeFetcher("", tinydb_dir)
     committee_mapping = committee_fetcher.return_system_code_committees_mapping()
     event_fetcher = CongressEventFetcher("", tinydb_dir)
     event_mapping = event_fetcher.return_eventid_event_mapping()
-    lens = defaultdict(int)
+
+    ## index every stored video by the event id it references, once
+    event_video_index = EventVideoIndex.from_youtube_tinydbs(tinydb_dir)
+    print(f"Indexed videos for {len(event_video_index)} event ids")
+
+    ## link each meeting to its recordings and bind it to its committees
+    event_video_index.link_meetings(event_mapping.values())
     for event in event_mapping.values():
         committees: list | dict = event["committees"]
         if isinstance(committees, list):
             for committee in committees:
                 committee_mapping[committee["systemCode"]].events.append(event)
-        elif isinstance(committee, dict):
+        elif isinstance(committees, dict):
             if "item" not in committees.keys():
                 raise KeyError(
                     f"Expected 'item', got: {committees.keys()} for event {event['eventId']}"
                 )
+
     for committee in committee_mapping.values():
         if len(committee.events) > 0:
-            print(committee.youtube)
+            with_video = sum(1 for event in committee.events if event["recordings"])
+            print(
+                f"{committee.summary.name}: {with_video}/{len(committee.events)} meetings with video"
+            )
 
 
 def parse_args_and_run():
@@ -1,8 +1,24 @@
-import requests
+import contextlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Iterator
+
+from .cache import ResponseCache, get_response_cache
+from .rate_limit import TokenBucket
+from .session import get_session
 from .xml_to_dict import parse_xml_string
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 CONGRESS_API_BASE_URL = "https://api.congress.gov/v3/"
 
+## default number of threads used to fetch the remaining pages of a
+##  paginated response when running in concurrent mode
+DEFAULT_MAX_WORKERS = 8
+
 
 def validate_paginated_response(response_json: dict) -> list:
     """Validate that response_json contains aggregatable list keys and return them."""
@@ -22,7 +38,119 @@ def validate_paginated_response(response_json: dict) -> list:
     return response_keys
 
 
-def congress_api_get(endpoint: str, pagination=True, **kwargs):
+def congress_api_get(
+    endpoint: str,
+    pagination=True,
+    concurrent: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_requests: int | None = None,
+    cache: ResponseCache | None = None,
+    **kwargs,
+):
+    """
+    GET an endpoint of the Congress.gov API, aggregating every page of a
+    paginated response into the list keys of the first response.
+
+    Args:
+        endpoint (str): Path relative to CONGRESS_API_BASE_URL.
+        pagination (bool): Follow the pagination of the response.
+        concurrent (bool): Compute the offsets of the remaining pages from the
+            first page's ``pagination.count`` and fetch them over a pool of
+            ``max_workers`` threads instead of walking ``pagination.next``.
+        max_workers (int): Size of the thread pool in concurrent mode.
+        max_requests (int | None): Maximum number of requests (including the
+            first page) to spend on this call, ``None`` for no limit.
+        cache (ResponseCache | None): Response cache of this call's requests,
+            e.g. an offline_cache(), instead of the shared one.
+    """
+    pages = iter_congress_api_pages(
+        endpoint, pagination, concurrent, max_workers, max_requests, cache, **kwargs
+    )
+    response_json = next(pages)
+    response_keys = validate_paginated_response(response_json)
+    for page_json in pages:
+        for key in response_keys:
+            response_json[key].extend(page_json[key])
+    return response_json
+
+
+def iter_congress_api_pages(
+    endpoint: str,
+    pagination=True,
+    concurrent: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_requests: int | None = None,
+    cache: ResponseCache | None = None,
+    **kwargs,
+) -> Iterator[dict]:
+    """
+    GET an endpoint of the Congress.gov API, yielding every page of a
+    paginated response (in order) as it arrives instead of aggregating them.
+    Takes the same arguments as congress_api_get.
+    """
+    url, params = build_request(endpoint, **kwargs)
+    response_json = generic_request(url, cache=cache, **params)
+    if not pagination or "pagination" not in response_json:
+        yield response_json
+        return
+
+    ## read what we need off the first page before handing it to the caller,
+    ##  who is free to modify it (congress_api_get extends its lists)
+    pagination_json = response_json["pagination"]
+    response_keys = validate_paginated_response(response_json)
+    retrieved = len(response_json[response_keys[0]])
+    yield response_json
+
+    if concurrent:
+        yield from iter_remaining_pages_concurrently(
+            url, params, pagination_json, max_workers, max_requests, cache
+        )
+    else:
+        yield from iter_remaining_pages_serially(
+            params, pagination_json, retrieved, max_requests, cache
+        )
+
+
+def iter_congress_api_items(
+    endpoint: str,
+    key: str,
+    stream: bool = False,
+    pagination=True,
+    concurrent: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_requests: int | None = None,
+    cache: ResponseCache | None = None,
+    **kwargs,
+) -> Iterator[dict]:
+    """
+    GET an endpoint of the Congress.gov API, yielding the items listed under
+    ``key`` on every page as they arrive, so callers can persist records
+    without holding the whole result set in memory.
+
+    Args:
+        key (str): The list key of the response, e.g. "committeeMeetings".
+        stream (bool): Decode each page incrementally off the socket with
+            ijson, if it's installed and no response cache is configured,
+            instead of parsing it as a whole. Pages are then followed
+            serially and without the XML fallback.
+
+    The remaining arguments are those of congress_api_get.
+    """
+    ## pages go through the response cache whole when one is configured
+    if stream and ijson is not None and cache is None and get_response_cache() is None:
+        yield from iter_streamed_items(
+            endpoint, key, pagination, max_requests, **kwargs
+        )
+        return
+
+    for page_json in iter_congress_api_pages(
+        endpoint, pagination, concurrent, max_workers, max_requests, cache, **kwargs
+    ):
+        yield from page_json.get(key, [])
+
+
+def build_request(endpoint: str, **kwargs) -> tuple[str, dict]:
+    """Return the url and query parameters of a request to endpoint."""
     if "api_key" not in kwargs.keys():
         raise KeyError("Missing api key, provided:", kwargs.keys())
     url = f"{CONGRESS_API_BASE_URL}{endpoint}"
@@ -34,45 +162,197 @@ def congress_api_get(endpoint: str, pagination=True, **kwargs):
         **kwargs,
         "api_key": kwargs.get("api_key"),
     }
+    return url, params
 
-    response_json = generic_request(url, **params)
 
-    if pagination and "pagination" in response_json:
-        ## determine the key to aggregate
-        response_keys = validate_paginated_response(response_json)
-        ## find the total count
-        count = response_json.get("pagination", {}).get("count")
-        retrieved = len(response_json[response_keys[0]])
+def iter_remaining_pages_serially(
+    params: dict,
+    pagination_json: dict,
+    retrieved: int,
+    max_requests: int | None = None,
+    cache: ResponseCache | None = None,
+) -> Iterator[dict]:
+    """Follow ``pagination.next`` from the first page, yielding one page at a time."""
+    ## find the total count
+    count = pagination_json.get("count")
 
-        next_url = response_json.get("pagination", {}).get("next")
-        while next_url:
-            message = (
-                f"Fetched {retrieved: >5} summaries out of {count: >5} "
-                f"({(count - retrieved) // params['limit'] + 1: >3} fetches remaining)"
-            )
-            print(message)
-            next_response_json = generic_request(
-                next_url, api_key=kwargs.get("api_key")
+    requests_made = 1
+    next_url = pagination_json.get("next")
+    while next_url:
+        if max_requests is not None and requests_made >= max_requests:
+            print(
+                f"Request budget of {max_requests} reached, "
+                f"stopping at {retrieved} out of {count}"
             )
-            validate_paginated_response(next_response_json)
-            for key in response_keys:
-                response_json[key].extend(next_response_json[key])
-            next_url = next_response_json.get("pagination", {}).get("next")
-            retrieved += len(next_response_json[response_keys[0]])
+            break
+        message = (
+            f"Fetched {retrieved: >5} summaries out of {count: >5} "
+            f"({(count - retrieved) // params['limit'] + 1: >3} fetches remaining)"
+        )
+        print(message)
+        next_response_json = generic_request(
+            next_url, cache=cache, api_key=params["api_key"]
+        )
+        requests_made += 1
+        response_keys = validate_paginated_response(next_response_json)
+        next_url = next_response_json.get("pagination", {}).get("next")
+        retrieved += len(next_response_json[response_keys[0]])
+        yield next_response_json
+
+
+def iter_remaining_pages_concurrently(
+    url: str,
+    params: dict,
+    pagination_json: dict,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_requests: int | None = None,
+    cache: ResponseCache | None = None,
+) -> Iterator[dict]:
+    """
+    Fetch every page after the first over a thread pool, yielding them in
+    offset order so the result is identical to following ``pagination.next``.
+    """
+    offsets = remaining_page_offsets(pagination_json, params)
+
+    ## leave room for the request we already spent on the first page
+    if max_requests is not None and len(offsets) >= max_requests:
+        print(
+            f"Request budget of {max_requests} reached, "
+            f"fetching {max(max_requests - 1, 0)} of {len(offsets)} remaining pages"
+        )
+        offsets = offsets[: max(max_requests - 1, 0)]
+
+    if len(offsets) == 0:
+        return
+
+    count = pagination_json["count"]
+    print(
+        f"Fetching {len(offsets)} remaining pages of {count} results "
+        f"over {min(max_workers, len(offsets))} threads"
+    )
+
+    def fetch_page(offset: int) -> dict:
+        page_json = generic_request(url, cache=cache, **{**params, "offset": offset})
+        validate_paginated_response(page_json)
+        return page_json
+
+    ## keep only a couple of pages per thread in flight so a slow consumer
+    ##  doesn't end up with every page buffered in memory, and yield them in
+    ##  submission (i.e. offset) order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        for offset in offsets:
+            in_flight.append(executor.submit(fetch_page, offset))
+            if len(in_flight) >= 2 * max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def remaining_page_offsets(pagination_json: dict, params: dict) -> list[int]:
+    """Compute the offsets of every page after the first from its pagination count."""
+    count = pagination_json.get("count", 0)
+    limit = params["limit"]
+    start = params.get("offset", 0) + limit
+    return list(range(start, count, limit))
+
+
+def iter_streamed_items(
+    endpoint: str,
+    key: str,
+    pagination=True,
+    max_requests: int | None = None,
+    **kwargs,
+) -> Iterator[dict]:
+    """Follow ``pagination.next`` serially, streaming the items of every page."""
+    url, params = build_request(endpoint, **kwargs)
+    limit = params["limit"]
+    requests_made = 0
+    while url:
+        if max_requests is not None and requests_made >= max_requests:
+            print(f"Request budget of {max_requests} reached, stopping")
+            break
+        page_json = yield from stream_page_items(url, key, params)
+        requests_made += 1
+        if not pagination:
+            break
+        pagination_json = page_json.get("pagination", {})
+        count = pagination_json.get("count", 0)
+        print(f"Streamed page {requests_made: >3} of {-(-count // limit): >3}")
+        ## the next url carries every parameter but the api key
+        url = pagination_json.get("next")
+        params = {"api_key": params["api_key"]}
+
+
+def stream_page_items(url: str, key: str, params: dict) -> Generator[dict, None, dict]:
+    """
+    Yield the items listed under ``key`` of one JSON page as ijson decodes
+    them off the socket, then return the rest of the page (its pagination
+    etc.) with ``key`` left empty.
+    """
+    item_prefix = f"{key}.item"
+    response = get_session().get(url, params=params, stream=True)
+    with contextlib.closing(response):
+        response.raise_for_status()
+        ## let urllib3 undo any gzip content-encoding while we read
+        response.raw.decode_content = True
+
+        page = ijson.ObjectBuilder()
+        item = None
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            if item is not None:
+                item.event(event, value)
+                if prefix == item_prefix and event in ("end_map", "end_array"):
+                    yield item.value
+                    item = None
+            elif prefix == item_prefix:
+                if event in ("start_map", "start_array"):
+                    item = ijson.ObjectBuilder()
+                    item.event(event, value)
+                else:
+                    yield value
+            else:
+                page.event(event, value)
+    return page.value
+
+
+def generic_request(
+    url: str,
+    limiter: TokenBucket | None = None,
+    cache: ResponseCache | None = None,
+    **params,
+) -> dict:
+    ## answer from the response cache (the given one, else the shared one) when
+    ##  it holds a fresh copy (any copy in offline mode, which never lets a
+    ##  request through)
+    if cache is None:
+        cache = get_response_cache()
+    if cache is not None:
+        cached = cache.get(url, params)
+        if cached is not None:
+            return cached
 
+    ## only requests that actually go out count against the rate limit
+    if limiter is not None:
+        limiter.acquire()
+    ## the shared session reuses connections and retries 429/5xx with backoff
+    response_json = decode_response(get_session().get(url, params=params))
+    if cache is not None:
+        cache.put(url, params, response_json)
     return response_json
 
 
-def generic_request(url: str, **params) -> dict:
-    response = requests.get(url, params=params)
+def decode_response(response) -> dict:
+    """Decode a Congress.gov response, falling back to XML if it isn't JSON."""
     response.raise_for_status()
     try:
         return response.json()
     except ValueError:
         try:
-            return_value = parse_xml_string(response.text)
+            ## hand over the raw bytes so the declared encoding is honoured
+            return_value = parse_xml_string(response.content)
             if "api-root" not in return_value.keys():
                 raise ValueError(f"Invalid XML with keys: {return_value.keys()}")
         except Exception as e:
-            raise ValueError(f"Failed to parse XML {e.message}")
+            raise ValueError(f"Failed to parse XML: {e}") from e
         return return_value
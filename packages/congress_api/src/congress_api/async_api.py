@@ -0,0 +1,395 @@
+import asyncio
+import logging
+import random
+from collections import Counter, deque
+from typing import AsyncIterator, Awaitable, Callable, Literal, TypeVar
+
+from .analyze.committee_details import CommitteeDetails
+from .api import (
+    build_request,
+    decode_response,
+    remaining_page_offsets,
+    validate_paginated_response,
+)
+from .cache import ResponseCache, get_response_cache
+from .fetch.congress_committee_fetcher import committees_endpoint
+from .fetch.congress_event_fetcher import committee_meetings_endpoint
+from .rate_limit import TokenBucket
+from .session import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUS_CODES,
+    CongressSession,
+    get_session,
+    parse_retry_after,
+)
+
+try:
+    import httpx
+
+    ## httpx logs every request at INFO, far too chatty when hydrating events
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+except ImportError:
+    httpx = None
+
+T = TypeVar("T")
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError(
+            "The asyncio client needs httpx, install it with: pip install congress-api[async]"
+        )
+
+
+class AsyncCongressSession:
+    """
+    The asyncio counterpart of CongressSession: one httpx.AsyncClient whose
+    connection pool is shared by every coroutine, at most max_concurrency
+    requests in flight, and the same timeouts and retries of 429/5xx
+    responses and connection errors (exponential backoff with full jitter,
+    honoring Retry-After).
+
+    Attributes:
+        max_concurrency (int): Number of requests allowed in flight at once.
+        counters (Counter): Number of requests, retries and errors by kind.
+        parent (CongressSession | None): Session the counters are added to
+            on aclose(), when built with from_session().
+
+    Methods:
+        from_session(): Build one with the settings of a CongressSession.
+        get(): GET a url, retrying transient failures.
+        aclose(): Close the pooled connections.
+        stats(): Return a snapshot of the counters.
+    """
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        max_concurrency: int = DEFAULT_POOL_MAXSIZE,
+    ) -> None:
+        _require_httpx()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            follow_redirects=True,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.counters = Counter()
+        self.parent: CongressSession | None = None
+
+    @classmethod
+    def from_session(
+        cls, session: CongressSession, max_concurrency: int | None = None
+    ) -> "AsyncCongressSession":
+        """
+        Mirror the settings of a (e.g. the CLI-configured) CongressSession,
+        whose stats then include the requests made by this one.
+        """
+        inst = cls(
+            session.timeout,
+            session.max_retries,
+            session.backoff_factor,
+            session.backoff_max,
+            max_concurrency or session.pool_maxsize,
+        )
+        inst.parent = session
+        return inst
+
+    async def get(self, url: str, params: dict | None = None) -> "httpx.Response":
+        """GET url, retrying 429/5xx responses and connection errors with backoff."""
+        ## merge the params into the url's own query like requests does, httpx
+        ##  would replace it (dropping e.g. the format of a listing's detail url)
+        url = httpx.URL(url).copy_merge_params(params or {})
+        attempt = 0
+        while True:
+            self.counters["requests"] += 1
+            try:
+                ## the backoff sleeps below happen outside the semaphore so a
+                ##  retrying request doesn't hold a slot
+                async with self._semaphore:
+                    response = await self.client.get(url)
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                self.counters[type(e).__name__] += 1
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                self.counters[f"status_{response.status_code}"] += 1
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self.backoff_delay(attempt)
+                elif delay > self.backoff_max:
+                    ## not worth waiting on, let the caller decide what to do
+                    return response
+
+            self.counters["retries"] += 1
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given (0-based) attempt."""
+        cap = min(self.backoff_max, self.backoff_factor * 2**attempt)
+        return random.uniform(0, cap)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        if self.parent is not None:
+            self.parent.add_counts(self.counters)
+            self.counters.clear()
+
+    def stats(self) -> dict[str, int]:
+        return dict(self.counters)
+
+
+class AsyncCongressClient:
+    """
+    asyncio-native access to the Congress.gov endpoints the fetchers use, so
+    one process can fan out across committees, meetings and details without
+    threads. Responses go through the shared response cache (or the client's
+    own) like generic_request, and only requests that reach the network wait
+    on the limiter (a TokenBucket, which may be shared with threaded code).
+
+    Use it as an async context manager, or from synchronous code through
+    run_sync().
+
+    Attributes:
+        api_key (str): The Congress.gov API key.
+        session (AsyncCongressSession): The pooled, retrying HTTP session.
+        limiter (TokenBucket | None): Rate limit on requests that go out.
+        cache (ResponseCache | None): Response cache used instead of the
+            shared one, e.g. an offline_cache().
+
+    Methods:
+        request(): GET a url (with params) and decode the response.
+        congress_api_get(): GET an endpoint, aggregating its pages.
+        iter_pages(): GET an endpoint, yielding its pages in order.
+        get_committees(): The committees of a chamber.
+        get_committee_meetings(): The meeting stubs of a congress and chamber.
+        get_committee_meeting(): One hydrated meeting from its detail url.
+        get_committee_details(): The details of one committee.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        session: AsyncCongressSession | None = None,
+        limiter: TokenBucket | None = None,
+        cache: ResponseCache | None = None,
+        **session_kwargs,
+    ) -> None:
+        self.api_key = api_key
+        self.session = session or AsyncCongressSession(**session_kwargs)
+        self.limiter = limiter
+        self.cache = cache
+
+    async def __aenter__(self) -> "AsyncCongressClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.aclose()
+
+    async def request(self, url: str, **params) -> dict:
+        """The asyncio counterpart of generic_request."""
+        params.setdefault("api_key", self.api_key)
+        cache = self.cache if self.cache is not None else get_response_cache()
+        if cache is not None:
+            cached = cache.get(url, params)
+            if cached is not None:
+                return cached
+
+        if self.limiter is not None:
+            await self.limiter.acquire_async()
+        response_json = decode_response(await self.session.get(url, params=params))
+        if cache is not None:
+            cache.put(url, params, response_json)
+        return response_json
+
+    async def congress_api_get(
+        self,
+        endpoint: str,
+        pagination: bool = True,
+        max_requests: int | None = None,
+        **kwargs,
+    ) -> dict:
+        """
+        GET an endpoint, aggregating every page into the list keys of the
+        first one (see iter_pages). max_requests includes the first page.
+        """
+        pages = self.iter_pages(endpoint, pagination, max_requests, **kwargs)
+        response_json = await anext(pages)
+        response_keys = validate_paginated_response(response_json)
+        async for page_json in pages:
+            for key in response_keys:
+                response_json[key].extend(page_json[key])
+        return response_json
+
+    async def iter_pages(
+        self,
+        endpoint: str,
+        pagination: bool = True,
+        max_requests: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[dict]:
+        """
+        GET an endpoint, yielding its pages in offset order as they arrive.
+        The remaining pages are requested concurrently, their offsets computed
+        from the first page's count.
+        """
+        url, params = build_request(endpoint, **{"api_key": self.api_key, **kwargs})
+        response_json = await self.request(url, **params)
+        if not pagination or "pagination" not in response_json:
+            yield response_json
+            return
+
+        pagination_json = response_json["pagination"]
+        yield response_json
+
+        offsets = remaining_page_offsets(pagination_json, params)
+        ## leave room for the request we already spent on the first page
+        if max_requests is not None and len(offsets) >= max_requests:
+            print(
+                f"Request budget of {max_requests} reached, "
+                f"fetching {max(max_requests - 1, 0)} of {len(offsets)} remaining pages"
+            )
+            offsets = offsets[: max(max_requests - 1, 0)]
+
+        if len(offsets) == 0:
+            return
+
+        max_concurrency = self.session.max_concurrency
+        print(
+            f"Fetching {len(offsets)} remaining pages of {pagination_json['count']}"
+            f" results over {min(max_concurrency, len(offsets))} concurrent requests"
+        )
+
+        async def fetch_page(offset: int) -> dict:
+            page_json = await self.request(url, **{**params, "offset": offset})
+            validate_paginated_response(page_json)
+            return page_json
+
+        ## like iter_remaining_pages_concurrently, keep only a couple of pages
+        ##  per connection in flight and yield them in offset order
+        in_flight = deque()
+        try:
+            for offset in offsets:
+                in_flight.append(asyncio.create_task(fetch_page(offset)))
+                if len(in_flight) >= 2 * max_concurrency:
+                    yield await in_flight.popleft()
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            ## the caller stopped early (or a page failed), drop the rest
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def get_committees(
+        self, chamber: Literal["house", "senate"] = "house", **kwargs
+    ) -> dict:
+        return await self.congress_api_get(committees_endpoint(chamber), **kwargs)
+
+    async def get_committee_meetings(
+        self,
+        congress: int = 119,
+        chamber: Literal["house", "senate", "nochamber"] = "house",
+        **kwargs,
+    ) -> dict:
+        return await self.congress_api_get(
+            committee_meetings_endpoint(congress, chamber), **kwargs
+        )
+
+    async def get_committee_meeting(self, url: str, use_xml: bool = False) -> dict:
+        """Hydrate a meeting from the detail url of its listing entry."""
+        if use_xml:
+            event = await self.request(url.replace("json", "xml"))
+            event = event["api-root"]
+        else:
+            event = await self.request(url)
+        return event["committeeMeeting"]
+
+    async def get_committee_details(
+        self, chamber: str, system_code: str
+    ) -> CommitteeDetails:
+        """The asyncio counterpart of CommitteeDetails.fetch (nothing is stored)."""
+        endpoint = f"committee/{chamber}/{system_code}"
+        details = await self.congress_api_get(endpoint, pagination=False)
+        return CommitteeDetails.from_dict(details["committee"])
+
+
+def run_sync(
+    fn: Callable[[AsyncCongressClient], Awaitable[T]],
+    api_key: str,
+    max_concurrency: int | None = None,
+    **client_kwargs,
+) -> T:
+    """
+    Run fn with a fresh AsyncCongressClient on a new event loop and return
+    its result, e.g. for synchronous callers:
+
+        meetings = run_sync(lambda client: client.get_committee_meetings(119), api_key)
+
+    Unless a session is given, the client mirrors the settings of the shared
+    CongressSession (see configure_session).
+    """
+
+    async def run() -> T:
+        if "session" not in client_kwargs:
+            client_kwargs["session"] = AsyncCongressSession.from_session(
+                get_session(), max_concurrency
+            )
+        async with AsyncCongressClient(api_key, **client_kwargs) as client:
+            return await fn(client)
+
+    return asyncio.run(run())
+
+
+def get_committees_sync(
+    api_key: str,
+    chamber: Literal["house", "senate"] = "house",
+    max_concurrency: int | None = None,
+    **kwargs,
+) -> dict:
+    """get_committees, over the asyncio client."""
+    return run_sync(
+        lambda client: client.get_committees(chamber, **kwargs),
+        api_key,
+        max_concurrency,
+    )
+
+
+def get_committee_meetings_sync(
+    api_key: str,
+    congress: int = 119,
+    chamber: Literal["house", "senate", "nochamber"] = "house",
+    max_concurrency: int | None = None,
+    **kwargs,
+) -> dict:
+    """get_committee_meetings, over the asyncio client."""
+    return run_sync(
+        lambda client: client.get_committee_meetings(congress, chamber, **kwargs),
+        api_key,
+        max_concurrency,
+    )
@@ -0,0 +1,248 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from congress_shared.globals import DEFAULT_TINYDB_DIR
+
+## the cache lives next to the TinyDB files it's a source for
+HTTP_CACHE_DIRNAME = "http-cache"
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+## how long a response stays fresh, by the first pattern matching its url path;
+##  detail responses can be kept long since they're invalidated as soon as a
+##  listing reports a newer updateDate for them (see ResponseCache.put)
+DEFAULT_TTLS: tuple[tuple[re.Pattern, float], ...] = (
+    ## a single meeting, e.g. committee-meeting/118/house/115538
+    (re.compile(r"/committee-meeting/\d+/\w+/\d+$"), 30 * DAY),
+    ## a single committee, e.g. committee/house/hsgo00
+    (re.compile(r"/committee/\w+/\w+$"), 7 * DAY),
+)
+## listings, and anything else
+DEFAULT_TTL = HOUR
+
+## never part of the cache key, so a cache can be shared and read offline
+EXCLUDED_PARAMS = frozenset({"api_key"})
+
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode for a request that isn't in the cache."""
+
+
+def canonical_url(url: str, params: dict | None = None) -> str:
+    """
+    Fold params into url's query string, dropping the api key and sorting the
+    parameters so equivalent requests (e.g. a listing's ``url`` and the
+    request built for it) map onto the same url.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: str(value) for key, value in (params or {}).items()})
+    query = sorted(
+        (key, value) for key, value in query.items() if key not in EXCLUDED_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def parse_update_date(value: str) -> float | None:
+    """Timestamp of an ``updateDate`` such as "2025-01-01T12:00:00Z", if valid."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class ResponseCache:
+    """
+    On-disk cache of decoded Congress.gov responses.
+
+    Entries are addressed by hashes of the request: a directory per url path
+    holding a file per (canonical) query string, so every variant of a
+    resource (json/xml, limits...) can be invalidated at once. The file's
+    mtime is the time it was fetched.
+
+    Attributes:
+        cache_dir (Path): Root directory of the cache.
+        ttls: (url path pattern, seconds) pairs, the first match applies.
+        default_ttl (float): Freshness of responses matching no pattern.
+        offline (bool): Serve every cached response regardless of its age and
+            raise OfflineCacheMiss instead of letting a request through.
+        counters (Counter): Number of hits, misses, expired entries etc.
+
+    Methods:
+        get(): Return a fresh cached response, or None.
+        put(): Store a response and invalidate the details it reports updated.
+        invalidate_updated(): Drop cached details older than a listing's updateDate.
+        stats(): Return a snapshot of the counters.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        ttls: tuple[tuple[re.Pattern, float], ...] = DEFAULT_TTLS,
+        default_ttl: float = DEFAULT_TTL,
+        offline: bool = False,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url: str) -> float:
+        path = urlsplit(url).path
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def resource_dir(self, url: str) -> Path:
+        path_hash = _digest(urlsplit(url).path)
+        return self.cache_dir / path_hash[:2] / path_hash
+
+    def entry_path(self, url: str, params: dict | None = None) -> Path:
+        canonical = canonical_url(url, params)
+        return self.resource_dir(canonical) / f"{_digest(canonical)}.json"
+
+    def get(self, url: str, params: dict | None = None) -> dict | None:
+        path = self.entry_path(url, params)
+        try:
+            fetched_at = os.stat(path).st_mtime
+        except FileNotFoundError:
+            self._count("misses")
+            if self.offline:
+                raise OfflineCacheMiss(canonical_url(url, params))
+            return None
+
+        if not self.offline and time.time() - fetched_at > self.ttl_for(url):
+            self._count("expired")
+            return None
+
+        try:
+            with open(path, encoding="utf-8") as handle:
+                body = json.load(handle)["body"]
+        except (FileNotFoundError, ValueError, KeyError):
+            ## invalidated under us or a torn entry, treat it as a miss
+            self._count("misses")
+            if self.offline:
+                raise OfflineCacheMiss(canonical_url(url, params))
+            return None
+        self._count("hits")
+        return body
+
+    def put(self, url: str, params: dict | None, body: dict) -> None:
+        canonical = canonical_url(url, params)
+        path = self.entry_path(url, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ## write to a temporary file and rename it over the entry, so readers
+        ##  (other threads or processes) never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"url": canonical, "body": body}, handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._count("stores")
+        self.invalidate_updated(body)
+
+    def invalidate_updated(self, body: dict) -> int:
+        """
+        Drop the cached details of every listed item (anything with a ``url``
+        and an ``updateDate``) that was fetched before its updateDate,
+        returning the number of entries removed.
+        """
+        invalidated = 0
+        for value in body.values():
+            if not isinstance(value, list):
+                continue
+            for item in value:
+                if not isinstance(item, dict) or "url" not in item:
+                    continue
+                updated_at = parse_update_date(item.get("updateDate"))
+                if updated_at is None:
+                    continue
+                invalidated += self._invalidate_before(item["url"], updated_at)
+        return invalidated
+
+    def _invalidate_before(self, url: str, timestamp: float) -> int:
+        resource_dir = self.resource_dir(url)
+        if not resource_dir.is_dir():
+            return 0
+        invalidated = 0
+        for entry in resource_dir.glob("*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                if entry.stat().st_mtime < timestamp:
+                    entry.unlink()
+                    invalidated += 1
+        if invalidated:
+            self._count("invalidated", invalidated)
+        return invalidated
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += n
+
+
+def default_cache_dir(tinydb_dir: str | Path = DEFAULT_TINYDB_DIR) -> Path:
+    return Path(tinydb_dir) / HTTP_CACHE_DIRNAME
+
+
+## process-wide cache, disabled until configured
+_CACHE: ResponseCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the shared ResponseCache, or None if responses aren't cached."""
+    with _CACHE_LOCK:
+        return _CACHE
+
+
+def configure_response_cache(
+    cache_dir: str | Path | None = None, **kwargs
+) -> ResponseCache | None:
+    """
+    Replace the shared ResponseCache with one under cache_dir built from
+    kwargs, or disable caching if cache_dir is None.
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None if cache_dir is None else ResponseCache(cache_dir, **kwargs)
+        return _CACHE
+
+
+def offline_cache(tinydb_dir: str | Path = DEFAULT_TINYDB_DIR) -> ResponseCache:
+    """
+    An offline copy of the configured response cache (or of the one under
+    tinydb_dir), to pass to the requests that must be served from the cache
+    and raise OfflineCacheMiss rather than touch the network. The shared
+    cache, used by every other request, is left as is.
+    """
+    shared = get_response_cache()
+    if shared is not None:
+        return ResponseCache(
+            shared.cache_dir, shared.ttls, shared.default_ttl, offline=True
+        )
+    return ResponseCache(default_cache_dir(tinydb_dir), offline=True)
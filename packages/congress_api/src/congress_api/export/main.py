@@ -0,0 +1,97 @@
+import argparse
+import time
+from pathlib import Path
+
+from congress_shared.globals import (
+    DEFAULT_CHANNELS_CSV,
+    add_global_args,
+    add_youtube_args,
+)
+from .snapshot import (
+    committee_rows,
+    default_snapshot_dir,
+    meeting_rows,
+    video_rows,
+    write_snapshot,
+)
+
+SNAPSHOTS = ("committees", "meetings", "videos")
+
+
+def main(
+    tinydb_dir: Path,
+    snapshot_dir: Path | None = None,
+    snapshot_format: str = "parquet",
+    full: bool = False,
+    channels_csv_path: Path = DEFAULT_CHANNELS_CSV,
+    only: list[str] | None = None,
+):
+    snapshot_dir = snapshot_dir or default_snapshot_dir(tinydb_dir)
+    rows = {
+        "committees": lambda: committee_rows(tinydb_dir, channels_csv_path),
+        "meetings": lambda: meeting_rows(tinydb_dir),
+        "videos": lambda: video_rows(tinydb_dir, channels_csv_path),
+    }
+    for name in only or SNAPSHOTS:
+        start = time.perf_counter()
+        written, skipped = write_snapshot(
+            name,
+            rows[name](),
+            snapshot_dir,
+            snapshot_format,
+            incremental=not full,
+        )
+        print(
+            f"{name}: wrote {written} partitions, {skipped} unchanged"
+            f" ({time.perf_counter() - start:.2f}s) under {snapshot_dir / name}"
+        )
+
+
+def parse_args_and_run():
+    parser = argparse.ArgumentParser(
+        description="Export the stored committees, meetings and YouTube videos as"
+        " typed, hive-partitioned (congress=/chamber=) columnar snapshots."
+    )
+
+    ## add shared args to the parser
+    add_global_args(parser)
+    add_youtube_args(parser)
+
+    parser.add_argument(
+        "--snapshot-dir",  ## dashes are automatically converted to underscores
+        type=lambda x: Path(x).expanduser().resolve(),
+        default=None,
+        help="Directory to write the snapshots to (default: <tinydb_dir>/snapshots).",
+    )
+
+    parser.add_argument(
+        "--format",
+        dest="snapshot_format",
+        choices=["parquet", "arrow"],
+        default="parquet",
+        help="Parquet (zstd compressed) or uncompressed, memory-mappable Arrow IPC files.",
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rewrite every partition instead of only those whose rows changed"
+        " since the last export.",
+    )
+
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=SNAPSHOTS,
+        default=None,
+        help="Only export these snapshots (default: all of them).",
+    )
+
+    ## ignore the unknown args
+    args = parser.parse_known_args()[0]
+
+    main(**vars(args))
+
+
+if __name__ == "__main__":
+    parse_args_and_run()
@@ -0,0 +1,353 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Literal
+
+from congress_shared.congress_gov import (
+    SYSTEM_CODE_CHAMBERS,
+    as_list,
+    system_code_chamber,
+)
+from congress_shared.globals import DEFAULT_CHANNELS_CSV, DEFAULT_TINYDB_DIR
+from congress_shared.storage import read_tables
+from youtube_api.congress_dates import CongressDateBuckets
+from youtube_api.event_id import extract_event_id
+from youtube_api.tables import (
+    VIDEOS_TABLE_PREFIX,
+    load_channel_registry,
+    youtube_tinydb_path,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+SNAPSHOTS_DIRNAME = "snapshots"
+MANIFEST_FILENAME = "_manifest.json"
+
+SnapshotFormat = Literal["parquet", "arrow"]
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+## pyarrow.dataset's name for each format
+DATASET_FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "Snapshots need pyarrow, install it with: pip install congress-api[export]"
+        )
+
+
+def _schemas() -> dict[str, "pa.Schema"]:
+    """
+    Column types of every snapshot, without the hive partition columns
+    (congress=/chamber=) which are encoded in the directory names.
+    """
+    timestamp = pa.timestamp("us", tz="UTC")
+    return {
+        "committees": pa.schema(
+            [
+                ("systemCode", pa.string()),
+                ("name", pa.string()),
+                ("committeeTypeCode", pa.string()),
+                ("parentSystemCode", pa.string()),
+                ("url", pa.string()),
+                ("updateDate", timestamp),
+                ("isCurrent", pa.bool_()),
+                ("billsCount", pa.int32()),
+                ("reportsCount", pa.int32()),
+                ("communicationsCount", pa.int32()),
+                ("youtubeHandles", pa.list_(pa.string())),
+            ]
+        ),
+        "meetings": pa.schema(
+            [
+                ("eventId", pa.int64()),
+                ("type", pa.string()),
+                ("title", pa.string()),
+                ("meetingStatus", pa.string()),
+                ("date", timestamp),
+                ("updateDate", timestamp),
+                ("committeeSystemCodes", pa.list_(pa.string())),
+                ("room", pa.string()),
+                ("building", pa.string()),
+                ("witnessCount", pa.int32()),
+                ("witnessDocumentCount", pa.int32()),
+                ("meetingDocumentCount", pa.int32()),
+            ]
+        ),
+        "videos": pa.schema(
+            [
+                ("videoId", pa.string()),
+                ("handle", pa.string()),
+                ("committeeSystemCode", pa.string()),
+                ("title", pa.string()),
+                ("description", pa.string()),
+                ("publishedAt", timestamp),
+                ("eventId", pa.int64()),
+                ("duration", pa.string()),
+                ("scheduledStartTime", timestamp),
+                ("actualStartTime", timestamp),
+                ("actualEndTime", timestamp),
+                ("viewCount", pa.int64()),
+                ("likeCount", pa.int64()),
+                ("commentCount", pa.int64()),
+            ]
+        ),
+    }
+
+
+## hive partition columns of every snapshot, outermost first
+PARTITION_COLUMNS = {
+    "committees": ("chamber",),
+    "meetings": ("congress", "chamber"),
+    "videos": ("congress", "chamber"),
+}
+
+
+# ---- reading JSON files ----
+def read_json(path: str | Path) -> dict:
+    """
+    Read a JSON file, e.g. a snapshot manifest, returning {} if it's missing
+    or empty.
+    """
+    try:
+        with open(path, encoding="utf-8") as handle:
+            contents = handle.read()
+    except FileNotFoundError:
+        return {}
+    return json.loads(contents) if contents else {}
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _count(value) -> int | None:
+    return int(value["count"]) if isinstance(value, dict) and "count" in value else None
+
+
+# ---- normalizing the documents into rows ----
+def committee_rows(
+    tinydb_dir: Path, csv_path: Path = DEFAULT_CHANNELS_CSV
+) -> Iterator[dict]:
+    """Committee summaries joined with their stored details and YouTube handles."""
+    summaries = read_tables(Path(tinydb_dir) / "committee-summaries.json")
+    details = {}
+    ## one file per chamber of the committees' systemCodes
+    for chamber in SYSTEM_CODE_CHAMBERS.values():
+        path = Path(tinydb_dir) / f"{chamber}-committee-details.json"
+        for table in read_tables(path).values():
+            details.update({doc["systemCode"]: doc for doc in table.values()})
+    registry = load_channel_registry(csv_path)
+
+    for summary in summaries.get("committees", {}).values():
+        system_code = summary["systemCode"]
+        detail = details.get(system_code, {})
+        channel = registry.get(system_code)
+        yield {
+            "chamber": (summary.get("chamber") or "").lower(),
+            "systemCode": system_code,
+            "name": summary.get("name"),
+            "committeeTypeCode": summary.get("committeeTypeCode"),
+            "parentSystemCode": (summary.get("parent") or {}).get("systemCode"),
+            "url": summary.get("url"),
+            "updateDate": _parse_timestamp(summary.get("updateDate")),
+            "isCurrent": detail.get("isCurrent"),
+            "billsCount": _count(detail.get("bills")),
+            "reportsCount": _count(detail.get("reports")),
+            "communicationsCount": _count(detail.get("communications")),
+            "youtubeHandles": channel["handles"] if channel is not None else [],
+        }
+
+
+def meeting_rows(tinydb_dir: Path) -> Iterator[dict]:
+    """Hydrated committee meetings, one row each."""
+    events = read_tables(Path(tinydb_dir) / "events.json")
+    for meeting in events.get("committee_meetings", {}).values():
+        location = meeting.get("location") or {}
+        yield {
+            "congress": int(meeting["congress"]),
+            "chamber": (meeting.get("chamber") or "").lower(),
+            "eventId": int(meeting["eventId"]),
+            "type": meeting.get("type"),
+            "title": meeting.get("title"),
+            "meetingStatus": meeting.get("meetingStatus"),
+            "date": _parse_timestamp(meeting.get("date")),
+            "updateDate": _parse_timestamp(meeting.get("updateDate")),
+            "committeeSystemCodes": [
+                committee.get("systemCode")
+                for committee in as_list(meeting.get("committees"))
+            ],
+            "room": location.get("room"),
+            "building": location.get("building"),
+            "witnessCount": len(as_list(meeting.get("witnesses"))),
+            "witnessDocumentCount": len(as_list(meeting.get("witnessDocuments"))),
+            "meetingDocumentCount": len(as_list(meeting.get("meetingDocuments"))),
+        }
+
+
+def video_rows(
+    tinydb_dir: Path, csv_path: Path = DEFAULT_CHANNELS_CSV
+) -> Iterator[dict]:
+    """Stored YouTube videos of every committee channel, with their event id."""
+    registry = load_channel_registry(csv_path)
+    buckets = CongressDateBuckets()
+    for committee_index, system_code in enumerate(registry.system_codes):
+        tables = read_tables(youtube_tinydb_path(committee_index, tinydb_dir))
+        chamber = system_code_chamber(system_code)
+        for table_name, table in tables.items():
+            if not table_name.startswith(VIDEOS_TABLE_PREFIX):
+                continue
+            handle = table_name[len(VIDEOS_TABLE_PREFIX) :]
+            for video in table.values():
+                congress = buckets.congress_of(video["publishedAt"])
+                yield {
+                    "congress": int(congress) if congress is not None else 0,
+                    "chamber": chamber,
+                    "videoId": video["videoId"],
+                    "handle": handle,
+                    "committeeSystemCode": system_code,
+                    "title": video["title"],
+                    "description": video["description"],
+                    "publishedAt": _parse_timestamp(video["publishedAt"]),
+                    "eventId": extract_event_id(video),
+                    "duration": video.get("duration"),
+                    "scheduledStartTime": _parse_timestamp(
+                        video.get("scheduledStartTime")
+                    ),
+                    "actualStartTime": _parse_timestamp(video.get("actualStartTime")),
+                    "actualEndTime": _parse_timestamp(video.get("actualEndTime")),
+                    "viewCount": video.get("viewCount"),
+                    "likeCount": video.get("likeCount"),
+                    "commentCount": video.get("commentCount"),
+                }
+
+
+# ---- writing ----
+def _fingerprint(rows: list[dict]) -> str:
+    payload = json.dumps(rows, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _write_atomically(table: "pa.Table", path: Path, fmt: SnapshotFormat) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "parquet":
+            pq.write_table(table, tmp_path, compression="zstd")
+        else:
+            ## uncompressed so the file can be memory-mapped
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_snapshot(
+    name: str,
+    rows: Iterable[dict],
+    snapshot_dir: Path,
+    fmt: SnapshotFormat = "parquet",
+    incremental: bool = True,
+) -> tuple[int, int]:
+    """
+    Write rows as the hive-partitioned snapshot ``snapshot_dir/name``, one
+    file per partition (e.g. ``meetings/congress=118/chamber=house/``).
+
+    A manifest records the fingerprint of every partition's rows; with
+    incremental set, partitions whose rows haven't changed since the last
+    export (e.g. every past congress) aren't rewritten. Returns the number of
+    partitions written and skipped.
+    """
+    _require_pyarrow()
+    schema = _schemas()[name]
+    partition_columns = PARTITION_COLUMNS[name]
+    table_dir = Path(snapshot_dir) / name
+    manifest_path = table_dir / MANIFEST_FILENAME
+
+    partitions: dict[str, list[dict]] = {}
+    for row in rows:
+        key = "/".join(f"{column}={row.pop(column)}" for column in partition_columns)
+        partitions.setdefault(key, []).append(row)
+
+    manifest = read_json(manifest_path) if incremental else {}
+    if manifest.get("format") != fmt:
+        manifest = {}
+    previous = manifest.get("partitions", {})
+    filename = f"part-0.{FILE_EXTENSIONS[fmt]}"
+
+    written = skipped = 0
+    fingerprints = {}
+    for key, partition_rows in sorted(partitions.items()):
+        path = table_dir / key / filename
+        fingerprint = _fingerprint(partition_rows)
+        fingerprints[key] = {"fingerprint": fingerprint, "rows": len(partition_rows)}
+        if previous.get(key, {}).get("fingerprint") == fingerprint and path.exists():
+            skipped += 1
+            continue
+        _write_atomically(pa.Table.from_pylist(partition_rows, schema), path, fmt)
+        written += 1
+
+    ## drop partitions (or files of another format) that are no longer exported
+    for path in table_dir.glob("**/part-0.*"):
+        key = path.parent.relative_to(table_dir).as_posix()
+        if key not in partitions or path.name != filename:
+            path.unlink()
+
+    table_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as handle:
+        json.dump({"format": fmt, "partitions": fingerprints}, handle, indent=1)
+    return written, skipped
+
+
+# ---- reading ----
+def default_snapshot_dir(tinydb_dir: str | Path = DEFAULT_TINYDB_DIR) -> Path:
+    return Path(tinydb_dir) / SNAPSHOTS_DIRNAME
+
+
+def read_snapshot(
+    name: str,
+    snapshot_dir: str | Path,
+    columns: list[str] | None = None,
+    filter=None,
+) -> "pa.Table":
+    """
+    Load (only the requested columns of) a snapshot, e.g.
+    ``read_snapshot("videos", dir, ["videoId", "eventId"], ds.field("congress") == 118)``
+    only reads those two columns of the 118th congress's partitions.
+    """
+    _require_pyarrow()
+    table_dir = Path(snapshot_dir) / name
+    manifest = read_json(table_dir / MANIFEST_FILENAME)
+    fmt = manifest.get("format", "parquet")
+    partition_fields = [
+        (column, pa.int32() if column == "congress" else pa.string())
+        for column in PARTITION_COLUMNS[name]
+    ]
+    dataset = ds.dataset(
+        table_dir,
+        format=DATASET_FORMATS[fmt],
+        partitioning=ds.partitioning(pa.schema(partition_fields), flavor="hive"),
+        exclude_invalid_files=False,
+        ignore_prefixes=["_", "."],
+    )
+    return dataset.to_table(columns=columns, filter=filter)
@@ -1,11 +1,21 @@
+import asyncio
 import os
-from tinydb import TinyDB, Query
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tinydb.table import Document
-from typing import Literal
+from typing import Callable, Iterator, Literal
 from congress_shared.globals import DEFAULT_TINYDB_DIR
-from ..api import congress_api_get
+from congress_shared.storage import (
+    flush_tinydb,
+    get_key_index,
+    open_tinydb,
+    resolve_storage_path,
+)
+from ..api import congress_api_get, iter_congress_api_items
+from ..cache import OfflineCacheMiss, offline_cache
+from ..analyze.committee_details import CommitteeDetails, flush_committee_details
 from ..analyze.committee_summary import CommitteeSummary
 from ..analyze.committee import Committee
+from ..session import HTTP_ERRORS, get_session
 
 
 class CongressCommitteeFetcher:
@@ -16,18 +26,22 @@ class CongressCommitteeFetcher:
         tinydb_dir (str): Directory path for TinyDB database.
         committees_tinydb_path (str): Path to the TinyDB JSON file storing committee data.
         committees_tb (TinyDB.table): TinyDB table for committee data.
+        committees_index (KeyIndex): Index of committees_tb by systemCode.
     Methods:
         fetch_all_committees(chamber): Retrieve and store committee data by chamber.
+        refresh_committee_details(): Re-fetch the details of changed committees.
     """
 
     def __init__(self, api_key: str, tinydb_dir: str = DEFAULT_TINYDB_DIR) -> None:
         self.api_key = api_key
         self.tinydb_dir = tinydb_dir
 
-        self.committees_tinydb_path = os.path.join(
-            tinydb_dir, "committee-summaries.json"
+        self.committees_tinydb_path = resolve_storage_path(
+            os.path.join(tinydb_dir, "committee-summaries.json")
         )
-        self.committees_tb = TinyDB(self.committees_tinydb_path).table("committees")
+        self.committees_db = open_tinydb(self.committees_tinydb_path)
+        self.committees_tb = self.committees_db.table("committees")
+        self.committees_index = get_key_index(self.committees_tb, "systemCode")
         print(
             f"Loaded {len(self.committees_tb):d} committees from {os.path.abspath(self.committees_tinydb_path)}"
         )
@@ -35,20 +49,175 @@ class CongressCommitteeFetcher:
     def fetch_all_committees(
         self,
         chamber: Literal["house", "senate", "nochamber"] = "house",
+        nthreads: int = 1,
+        max_requests: int | None = None,
+        stream: bool = False,
+        refresh: bool = False,
+        use_async: bool = False,
     ) -> tuple[list[Document], list[Document]]:
-        committees = get_committees(chamber, api_key=self.api_key)["committees"]
-        committee_q = Query()
+        """
+        Store the summaries of the committees of a chamber not stored yet.
+        With refresh set, stored summaries whose updateDate changed are
+        updated too, so refresh_committee_details can tell what changed.
+        """
+        if use_async and stream:
+            raise ValueError("stream and use_async can't be combined")
+        if use_async:
+            ## imported here since the async client builds on this module
+            from ..async_api import get_committees_sync
+
+            committees = get_committees_sync(
+                self.api_key, chamber, nthreads, max_requests=max_requests
+            )["committees"]
+        else:
+            committees = iter_committees(
+                chamber,
+                api_key=self.api_key,
+                stream=stream,
+                concurrent=nthreads > 1,
+                max_workers=nthreads,
+                max_requests=max_requests,
+            )
         new_committees = []
+        updated = 0
         for committee in committees:
             system_code = committee.get("systemCode")
-            if not self.committees_tb.contains(committee_q.systemCode == system_code):
-                id = self.committees_tb.insert(committee)
+            if system_code not in self.committees_index:
+                id = self.committees_index.insert(committee)
                 doc = Document(committee, doc_id=id)
                 new_committees.append(doc)
+            elif refresh and committee.get("updateDate") != (
+                self.committees_index.get(system_code).get("updateDate")
+            ):
+                self.committees_index.update(committee, system_code)
+                updated += 1
+        ## write all the new committees out at once
+        flush_tinydb(self.committees_db)
         if len(new_committees) > 0:
             print(f"Added {len(new_committees)} new committees.")
+        if updated > 0:
+            print(f"Updated {updated} changed committees.")
         return [self.committees_tb.all(), new_committees]
 
+    def refresh_committee_details(
+        self,
+        committees: list[Committee],
+        nthreads: int = 1,
+        use_async: bool = False,
+        missing_only: bool = False,
+    ) -> int:
+        """
+        Re-fetch, over a pool of nthreads (or, with use_async, as up to
+        nthreads concurrent requests on one event loop), the details of every
+        committee whose summary reports a newer updateDate than its stored
+        details (or that has none stored), returning the number of committees
+        refreshed. With missing_only, only the details not stored yet are
+        fetched.
+        """
+        if missing_only:
+            outdated = [
+                committee
+                for committee in committees
+                if CommitteeDetails.from_system_code(
+                    committee.summary.systemCode, self.tinydb_dir
+                )
+                is None
+            ]
+        else:
+            outdated = [
+                committee
+                for committee in committees
+                if committee.details_outdated(self.tinydb_dir)
+            ]
+        print(
+            f"Refreshing the details of {len(outdated)}/{len(committees)} committees"
+            f" over {nthreads} {'concurrent requests' if use_async else 'threads'}"
+        )
+        if use_async:
+            refreshed = self._fetch_details_async(outdated, nthreads)
+        else:
+            refreshed = self._fetch_details(outdated, nthreads)
+        flush_committee_details()
+        return refreshed
+
+    def _fetch_details(self, committees: list[Committee], nthreads: int) -> int:
+        refreshed = 0
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            futures = {
+                executor.submit(
+                    CommitteeDetails.fetch,
+                    committee.summary.chamber,
+                    committee.summary.systemCode,
+                    self.api_key,
+                ): committee
+                for committee in committees
+            }
+            ## store the results from this thread only, tinydb isn't thread safe
+            for future in as_completed(futures):
+                if self._store_details(futures[future], future.result):
+                    refreshed += 1
+                    if not refreshed % 25:
+                        ## checkpoint the details fetched so far
+                        flush_committee_details()
+        return refreshed
+
+    def _fetch_details_async(
+        self, committees: list[Committee], max_concurrency: int
+    ) -> int:
+        ## imported here since the async client builds on this module
+        from ..async_api import AsyncCongressClient, AsyncCongressSession
+
+        async def fetch() -> int:
+            refreshed = 0
+            session = AsyncCongressSession.from_session(get_session(), max_concurrency)
+            async with AsyncCongressClient(self.api_key, session) as client:
+                tasks = {
+                    asyncio.create_task(
+                        client.get_committee_details(
+                            committee.summary.chamber, committee.summary.systemCode
+                        )
+                    ): committee
+                    for committee in committees
+                }
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    ## the loop runs on this thread, so storing is safe here
+                    for task in done:
+                        if self._store_details(tasks[task], task.result):
+                            refreshed += 1
+                            if not refreshed % 25:
+                                ## checkpoint the details fetched so far
+                                flush_committee_details()
+            return refreshed
+
+        return asyncio.run(fetch())
+
+    def _store_details(
+        self, committee: Committee, get_details: Callable[[], CommitteeDetails]
+    ) -> bool:
+        """Store the details get_details() returns for committee, returning whether it was stored."""
+        system_code = committee.summary.systemCode
+        try:
+            details = get_details()
+        except HTTP_ERRORS as e:
+            print(f"Failed to fetch {system_code}: {e}")
+            return False
+        except OfflineCacheMiss:
+            ## not cached, it's fetched again by an online run
+            print(f"No cached details for {system_code}")
+            return False
+        except Exception as e:
+            ## e.g. a connection error after the retries, or an undecodable
+            ##  response; the other committees are still stored
+            print(f"Unexpected error while fetching {system_code}: {e}")
+            return False
+        details.store(update=True, tinydb_dir=self.tinydb_dir)
+        committee.details = details
+        return True
+
     def return_system_code_committees_mapping(self):
         ## generate a list of committees from the summary endpoint
         dicts = self.committees_tb.all()
@@ -57,10 +226,16 @@ class CongressCommitteeFetcher:
             Committee.from_summary(summary) for summary in summaries
         ]
 
-        ## load details for each committee
+        ## load details for each committee from the tinydb, or the response
+        ##  cache, without ever touching the api
+        cache = offline_cache(self.tinydb_dir)
         for committee in committees:
-            ## use dummy api key to ensure we load from cache and don't hit api
-            committee.get_details("")
+            try:
+                committee.get_details(
+                    self.api_key, cache=cache, tinydb_dir=self.tinydb_dir
+                )
+            except OfflineCacheMiss:
+                print(f"No stored details for {committee.summary.systemCode}")
 
         ## bind the committee object to corresponding system code
         committee_map = {
@@ -70,12 +245,24 @@ class CongressCommitteeFetcher:
         return committee_map
 
 
-def get_committees(
-    chamber: Literal["house", "senate"] = "house",
-    **kwargs,
-):
+def committees_endpoint(chamber: Literal["house", "senate"] = "house") -> str:
     if chamber not in {"house", "senate"}:
         raise ValueError(
             f"Invalid chamber: {chamber}, must be one of: 'house', 'senate'"
         )
-    return congress_api_get(f"committee/{chamber}", **kwargs)
+    return f"committee/{chamber}"
+
+
+def get_committees(
+    chamber: Literal["house", "senate"] = "house",
+    **kwargs,
+):
+    return congress_api_get(committees_endpoint(chamber), **kwargs)
+
+
+def iter_committees(
+    chamber: Literal["house", "senate"] = "house",
+    **kwargs,
+) -> Iterator[dict]:
+    """Yield the committees of a chamber page by page."""
+    return iter_congress_api_items(committees_endpoint(chamber), "committees", **kwargs)
@@ -1,12 +1,21 @@
+import asyncio
 import os
-import requests
-import time
-from tinydb import TinyDB
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tinydb.table import Document
-from typing import Literal
+from typing import Callable, Iterator, Literal
 
 from congress_shared.globals import DEFAULT_TINYDB_DIR
-from ..api import congress_api_get, generic_request
+from congress_shared.storage import flush_tinydb, open_tinydb, resolve_storage_path
+from ..api import (
+    CONGRESS_API_BASE_URL,
+    congress_api_get,
+    generic_request,
+    iter_congress_api_items,
+)
+from ..cache import OfflineCacheMiss
+from ..rate_limit import DATA_GOV_HOURLY_QUOTA, TokenBucket
+from ..session import HTTP_ERRORS, get_session, http_status_code
 
 
 class CongressEventFetcher(object):
@@ -15,94 +24,296 @@ class CongressEventFetcher(object):
     from the Congress.gov API.
 
     Attributes:
-        record_path (str): The base path used to read/write cached event data.
-        events (dict): A dictionary of committee events, keyed by event ID.
+        event_urls (dict): Detail URLs of the listed events, keyed by event ID.
+        events_tb (TinyDB.table): TinyDB table of hydrated committee meetings.
+        pending_tb (TinyDB.table): TinyDB table of listed events that have not
+            been hydrated yet, so an interrupted run can resume.
 
     Methods:
-        read(): Load previously cached events from disk.
         fetch_event_list(): Populate the event dictionary with committee meeting URLs.
         process_events(): Expand and hydrate stored event URLs into full metadata.
-        committee_meetings(): Fetch committee meeting metadata by chamber and congress.
-        committee_meeting_details(): Fetch full metadata for a specific committee event.
+        return_eventid_event_mapping(): Map event IDs to the stored meetings.
     """
 
-    ## initialize a dictionary to store the events in; keyed by their ids
-    event_urls = {}
-
     def __init__(self, api_key: str, tinydb_dir: str = DEFAULT_TINYDB_DIR) -> None:
         self.api_key = api_key
         self.tinydb_dir = tinydb_dir
 
-        self.events_tinydb_path = os.path.join(tinydb_dir, "events.json")
-        self.events_tb = TinyDB(self.events_tinydb_path).table("committee_meetings")
+        self.events_tinydb_path = resolve_storage_path(
+            os.path.join(tinydb_dir, "events.json")
+        )
+        self.events_db = open_tinydb(self.events_tinydb_path)
+        self.events_tb = self.events_db.table("committee_meetings")
+        self.pending_tb = self.events_db.table("pending_event_urls")
+
+        ## initialize a dictionary to store the events in; keyed by their ids
+        ##  and seeded with whatever a previous run left unhydrated
+        self.event_urls = {doc.doc_id: doc["url"] for doc in self.pending_tb.all()}
         print(
-            f"Loaded {len(self.events_tb):d} events from {os.path.abspath(self.events_tinydb_path)}"
+            f"Loaded {len(self.events_tb):d} events ({len(self.event_urls):d} pending) from {os.path.abspath(self.events_tinydb_path)}"
         )
 
     def fetch_event_list(
         self,
         chamber: Literal["house", "senate", "nochamber"] = "house",
         congress_number: int = 119,
+        nthreads: int = 1,
+        max_requests: int | None = None,
+        stream: bool = False,
+        use_async: bool = False,
     ):
-        events = get_committee_meetings(
-            congress=congress_number, chamber=chamber, api_key=self.api_key
-        )["committeeMeetings"]
+        if use_async and stream:
+            raise ValueError("stream and use_async can't be combined")
+        if use_async:
+            ## imported here since the async client builds on this module
+            from ..async_api import get_committee_meetings_sync
+
+            events = get_committee_meetings_sync(
+                self.api_key,
+                congress_number,
+                chamber,
+                nthreads,
+                max_requests=max_requests,
+            )["committeeMeetings"]
+        else:
+            ## store the meetings page by page as they arrive rather than
+            ##  aggregating the whole listing in memory first
+            events = iter_committee_meetings(
+                congress=congress_number,
+                chamber=chamber,
+                api_key=self.api_key,
+                stream=stream,
+                concurrent=nthreads > 1,
+                max_workers=nthreads,
+                max_requests=max_requests,
+            )
         for event in events:
-            self.event_urls[event["eventId"]] = event["url"]
-
-    def process_events(self) -> None:
-        total = len(self.event_urls.keys())
-
-        i = 0
-        event_ids = list(self.event_urls.keys())
-        retried = False
-        ## use a while loop so we can stay in one spot
-        ##  and only advance if we succeed
-        while i < total:
-            eventId = event_ids[i]
-            url: str = self.event_urls[eventId]
-            ## if the value is a placeholder url, let's expand it
-            if not self.events_tb.contains(doc_id=eventId) and url.startswith(
-                "https://api.congress.gov"
-            ):
-                message = f"Fetching details for {i + 1}/{total} -> {eventId}"
-                print(f"\r{message.ljust(40)}", end="", flush=True)
+            event_id = int(event["eventId"])
+            self.event_urls[event_id] = event["url"]
+            ## remember the url until it's hydrated so we can resume later
+            if not self.events_tb.contains(
+                doc_id=event_id
+            ) and not self.pending_tb.contains(doc_id=event_id):
+                self.pending_tb.insert(Document({"url": event["url"]}, doc_id=event_id))
+        flush_tinydb(self.events_db)
+
+    def process_events(
+        self,
+        nthreads: int = 1,
+        requests_per_hour: int = DATA_GOV_HOURLY_QUOTA,
+        use_async: bool = False,
+    ) -> None:
+        """
+        Hydrate every listed event that isn't stored yet over a pool of nthreads
+        (or, with use_async, as up to nthreads concurrent requests on one event
+        loop).
+
+        Requests are throttled by a token bucket sized to requests_per_hour.
+        Events whose JSON endpoint returns a 500 are queued and retried against
+        the XML endpoint. If the quota is exhausted (429) the remaining events
+        stay in pending_tb and are picked up by the next run.
+        """
+        ## only expand placeholder urls we haven't stored yet
+        todo = [
+            (event_id, url)
+            for event_id, url in self.event_urls.items()
+            if not self.events_tb.contains(doc_id=event_id)
+            and url.startswith(CONGRESS_API_BASE_URL)
+        ]
+        total = len(todo)
+        if use_async:
+            print(f"Hydrating {total} events over {nthreads} concurrent requests")
+            hydrate_batch = self._hydrate_batch_async
+        else:
+            print(f"Hydrating {total} events over {nthreads} threads")
+            hydrate_batch = self._hydrate_batch
+
+        limiter = TokenBucket.per_hour(requests_per_hour)
+        quota_hit = threading.Event()
+
+        hydrated, retry_queue = hydrate_batch(todo, False, nthreads, limiter, quota_hit)
+        if len(retry_queue) > 0 and not quota_hit.is_set():
+            ## apparently some entries are broken and can't be json serialized...
+            ##  so we'll try the xml endpoint instead
+            print(f"Retrying {len(retry_queue)} events with XML instead...")
+            hydrated_xml, _ = hydrate_batch(
+                retry_queue, True, nthreads, limiter, quota_hit
+            )
+            hydrated += hydrated_xml
+
+        if quota_hit.is_set():
+            print(
+                f"Rate limit hit after hydrating {hydrated}/{total} events. "
+                f"{len(self.pending_tb)} events are pending, rerun to resume."
+            )
+        else:
+            print(f"Done with all events, hydrated {hydrated}/{total}.")
+
+    def _hydrate_batch(
+        self,
+        batch: list[tuple[int, str]],
+        use_xml: bool,
+        nthreads: int,
+        limiter: TokenBucket,
+        quota_hit: threading.Event,
+    ) -> tuple[int, list[tuple[int, str]]]:
+        """Hydrate a batch of (event_id, url) pairs, returning the # stored and the 500s."""
+        hydrated = 0
+        retry_queue = []
+        total = len(batch)
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            futures = {
+                executor.submit(self._fetch_event, url, use_xml, limiter, quota_hit): (
+                    event_id,
+                    url,
+                )
+                for event_id, url in batch
+            }
+            ## store the results from this thread only, tinydb isn't thread safe
+            for i, future in enumerate(as_completed(futures)):
+                event_id, url = futures[future]
+                if not self._store_event(
+                    event_id, url, future.result, use_xml, quota_hit, retry_queue
+                ):
+                    continue
+                hydrated += 1
+                if not (i + 1) % 25:
+                    print(f"Working on {i + 1}/{total}")
+                    ## checkpoint so an interrupted run loses at most 25 events
+                    flush_tinydb(self.events_db)
+        flush_tinydb(self.events_db)
+        return hydrated, retry_queue
+
+    def _hydrate_batch_async(
+        self,
+        batch: list[tuple[int, str]],
+        use_xml: bool,
+        max_concurrency: int,
+        limiter: TokenBucket,
+        quota_hit: threading.Event,
+    ) -> tuple[int, list[tuple[int, str]]]:
+        """_hydrate_batch over the asyncio client, without threads."""
+        ## imported here since the async client builds on this module
+        from ..async_api import AsyncCongressClient, AsyncCongressSession
+
+        async def hydrate() -> tuple[int, list[tuple[int, str]]]:
+            hydrated = 0
+            retry_queue = []
+            total = len(batch)
+            session = AsyncCongressSession.from_session(get_session(), max_concurrency)
+            async with AsyncCongressClient(self.api_key, session, limiter) as client:
+
+                async def fetch_event(url: str) -> dict | None:
+                    if quota_hit.is_set():
+                        return None
+                    return await client.get_committee_meeting(url, use_xml)
+
+                tasks = {
+                    asyncio.create_task(fetch_event(url)): (event_id, url)
+                    for event_id, url in batch
+                }
+                pending = set(tasks)
+                i = 0
                 try:
-                    if retried:
-                        ## apparently some entries are broken and can't be json serialized...
-                        ##  so we'll try the xml endpoint instead
-                        url = url.replace("json", "xml")
-                        print("Trying XML instead...")
-                        event = generic_request(url, api_key=self.api_key)
-                        event = event["api-root"]
-                    else:
-                        event = generic_request(url, api_key=self.api_key)
-
-                    self.events_tb.insert(
-                        Document(event["committeeMeeting"], doc_id=eventId)
-                    )
-                except requests.HTTPError as e:
-                    if e.response is not None and e.response.status_code == 429:
-                        print(
-                            f"\nRate limit hit while fetching {eventId}. Skipping remaining fetches."
+                    while pending:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
                         )
-                        return
-                    elif (
-                        e.response is not None
-                        and e.response.status_code == 500
-                        and not retried
-                    ):
-                        retried = True
-                        time.sleep(1)
-                        continue
-                    else:
-                        raise RuntimeError(f"Failed to fetch {eventId}: {e}")
-                except Exception as e:
-                    message = f"Unexpected error while fetching {eventId}: {e}, try: {url}&api_key={self.api_key}"
-                    print(message)
-            i += 1
-            retried = False
-        print("\nDone with all events.")
+                        ## the loop runs on this thread, so storing is safe here
+                        for task in done:
+                            i += 1
+                            event_id, url = tasks[task]
+                            if not self._store_event(
+                                event_id,
+                                url,
+                                task.result,
+                                use_xml,
+                                quota_hit,
+                                retry_queue,
+                            ):
+                                continue
+                            hydrated += 1
+                            if not i % 25:
+                                print(f"Working on {i}/{total}")
+                                ## checkpoint so an interrupted run loses at most 25 events
+                                flush_tinydb(self.events_db)
+                        if quota_hit.is_set():
+                            ## the rest stay pending for the next run
+                            break
+                finally:
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+            return hydrated, retry_queue
+
+        try:
+            return asyncio.run(hydrate())
+        finally:
+            flush_tinydb(self.events_db)
+
+    def _store_event(
+        self,
+        event_id: int,
+        url: str,
+        get_meeting: Callable[[], dict | None],
+        use_xml: bool,
+        quota_hit: threading.Event,
+        retry_queue: list[tuple[int, str]],
+    ) -> bool:
+        """
+        Store the meeting get_meeting() returns for event_id, returning whether
+        it was stored. Its 429s set quota_hit and its JSON 500s are queued in
+        retry_queue.
+        """
+        try:
+            meeting = get_meeting()
+        except HTTP_ERRORS as e:
+            status_code = http_status_code(e)
+            if status_code == 429:
+                if not quota_hit.is_set():
+                    print(
+                        f"Rate limit hit while fetching {event_id}. Skipping remaining fetches."
+                    )
+                quota_hit.set()
+            elif status_code == 500 and not use_xml:
+                retry_queue.append((event_id, url))
+            else:
+                print(f"Failed to fetch {event_id}: {e}")
+            return False
+        except OfflineCacheMiss:
+            ## not cached, it stays pending for an online run
+            return False
+        except Exception as e:
+            print(f"Unexpected error while fetching {event_id}: {e}, try: {url}")
+            return False
+
+        if meeting is None:
+            ## skipped after the quota was exhausted
+            return False
+
+        self.events_tb.insert(Document(meeting, doc_id=event_id))
+        self.pending_tb.remove(doc_ids=[event_id])
+        return True
+
+    def _fetch_event(
+        self,
+        url: str,
+        use_xml: bool,
+        limiter: TokenBucket,
+        quota_hit: threading.Event,
+    ) -> dict | None:
+        if quota_hit.is_set():
+            return None
+
+        ## the limiter is only waited on when the event isn't in the response cache
+        if use_xml:
+            event = generic_request(
+                url.replace("json", "xml"), limiter=limiter, api_key=self.api_key
+            )
+            event = event["api-root"]
+        else:
+            event = generic_request(url, limiter=limiter, api_key=self.api_key)
+        return event["committeeMeeting"]
 
     def return_eventid_event_mapping(self):
         dicts = self.events_tb.all()
@@ -110,11 +321,10 @@ class CongressEventFetcher(object):
         return dict(zip(event_ids, dicts))
 
 
-def get_committee_meetings(
+def committee_meetings_endpoint(
     congress: int = 119,
     chamber: Literal["house", "senate", "nochamber"] = "house",
-    **kwargs,
-) -> dict:
+) -> str:
     ## validate chamber input
     if not (100 <= congress <= 120):
         raise ValueError(f"Invalid congress: {congress}, must be between 100 and 120")
@@ -122,4 +332,22 @@ def get_committee_meetings(
         raise ValueError(
             f"Invalid chamber: {chamber}, must be one of: 'house', 'senate', 'nochamber'"
         )
-    return congress_api_get(f"committee-meeting/{congress}/{chamber}", **kwargs)
+    return f"committee-meeting/{congress}/{chamber}"
+
+
+def get_committee_meetings(
+    congress: int = 119,
+    chamber: Literal["house", "senate", "nochamber"] = "house",
+    **kwargs,
+) -> dict:
+    return congress_api_get(committee_meetings_endpoint(congress, chamber), **kwargs)
+
+
+def iter_committee_meetings(
+    congress: int = 119,
+    chamber: Literal["house", "senate", "nochamber"] = "house",
+    **kwargs,
+) -> Iterator[dict]:
+    """Yield the meeting stubs of a congress and chamber page by page."""
+    endpoint = committee_meetings_endpoint(congress, chamber)
+    return iter_congress_api_items(endpoint, "committeeMeetings", **kwargs)
@@ -4,16 +4,48 @@ from pathlib import Path
 from congress_shared.auth import load_congress_api_key
 from congress_shared.globals import add_global_args
 from ..analyze.committee import Committee
+from ..analyze.committee_details import flush_committee_details
+from ..cache import (
+    configure_response_cache,
+    default_cache_dir,
+    get_response_cache,
+)
+from ..rate_limit import DATA_GOV_HOURLY_QUOTA
+from ..session import DEFAULT_MAX_RETRIES, configure_session, get_session
 from ..analyze.committee_summary import CommitteeSummary
 from .congress_event_fetcher import CongressEventFetcher
 from .congress_committee_fetcher import CongressCommitteeFetcher
 
 
-def fetch_committees(api_key: str, tinydb_dir: Path, chamber):
+def positive_int(value: str) -> int:
+    """argparse type of the options that only make sense above zero."""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def fetch_committees(
+    api_key: str,
+    tinydb_dir: Path,
+    chamber,
+    nthreads: int = 1,
+    max_requests: int | None = None,
+    stream: bool = False,
+    refresh_details: bool = False,
+    use_async: bool = False,
+):
     committee_fetcher = CongressCommitteeFetcher(api_key, tinydb_dir)
 
     ## fetch the summaries
-    committee_fetcher.fetch_all_committees(chamber)
+    committee_fetcher.fetch_all_committees(
+        chamber,
+        nthreads,
+        max_requests,
+        stream,
+        refresh=refresh_details,
+        use_async=use_async,
+    )
     dicts = committee_fetcher.committees_tb.all()
 
     ## map the summaries to their class instances
@@ -21,23 +53,96 @@ def fetch_committees(api_key: str, tinydb_dir: Path, chamber):
 
     ## initialize Committee instances in order to fetch the details
     committees = [Committee.from_summary(summary) for summary in summaries]
+    if refresh_details:
+        ## only the committees whose updateDate moved are fetched again
+        committee_fetcher.refresh_committee_details(committees, nthreads, use_async)
+        return
+    if use_async:
+        ## fan out the details not stored yet, the loop below then finds them all
+        committee_fetcher.refresh_committee_details(
+            committees, nthreads, use_async, missing_only=True
+        )
+
     num_committees = len(committees)
     for i, committee in enumerate(committees):
         if not i % 25:
             print(f"Working on {i}/{num_committees}")
-        committee.get_details(api_key)
+            ## checkpoint the details fetched so far
+            flush_committee_details()
+        committee.get_details(api_key, tinydb_dir=tinydb_dir)
+    flush_committee_details()
 
 
 ## TODO import chamber + congress_number typing and validation
-def fetch_events(api_key: str, tinydb_dir: Path, chamber, congress_number: int):
+def fetch_events(
+    api_key: str,
+    tinydb_dir: Path,
+    chamber,
+    congress_number: int,
+    nthreads: int = 1,
+    max_requests: int | None = None,
+    hydrate: bool = False,
+    requests_per_hour: int = DATA_GOV_HOURLY_QUOTA,
+    stream: bool = False,
+    use_async: bool = False,
+):
     event_fetcher = CongressEventFetcher(api_key, tinydb_dir)
-    event_fetcher.fetch_event_list(chamber, congress_number)
+    event_fetcher.fetch_event_list(
+        chamber, congress_number, nthreads, max_requests, stream, use_async
+    )
+    if hydrate:
+        event_fetcher.process_events(nthreads, requests_per_hour, use_async)
 
 
-def main(tinydb_dir: Path, chamber: str = "house", congress_number: int = 119):
+def main(
+    tinydb_dir: Path,
+    chamber: str = "house",
+    congress_number: int = 119,
+    nthreads: int = 1,
+    max_requests: int | None = None,
+    timeout: float | None = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    hydrate: bool = False,
+    requests_per_hour: int = DATA_GOV_HOURLY_QUOTA,
+    stream: bool = False,
+    cache: bool = False,
+    offline: bool = False,
+    refresh_details: bool = False,
+    use_async: bool = False,
+):
     api_key = load_congress_api_key()
-    fetch_committees(api_key, tinydb_dir, chamber)
-    fetch_events(api_key, tinydb_dir, chamber, congress_number)
+    session_kwargs = {"max_retries": max_retries, "pool_maxsize": max(nthreads, 1)}
+    if timeout is not None:
+        session_kwargs["timeout"] = timeout
+    configure_session(**session_kwargs)
+    if cache or offline:
+        configure_response_cache(default_cache_dir(tinydb_dir), offline=offline)
+
+    fetch_committees(
+        api_key,
+        tinydb_dir,
+        chamber,
+        nthreads,
+        max_requests,
+        stream,
+        refresh_details,
+        use_async,
+    )
+    fetch_events(
+        api_key,
+        tinydb_dir,
+        chamber,
+        congress_number,
+        nthreads,
+        max_requests,
+        hydrate,
+        requests_per_hour,
+        stream,
+        use_async,
+    )
+    print(f"HTTP stats: {get_session().stats()}")
+    if cache or offline:
+        print(f"Response cache stats: {get_response_cache().stats()}")
 
 
 def parse_args_and_run():
@@ -64,6 +169,96 @@ def parse_args_and_run():
         help="The session of Congress to pull data from (NOTE: only tried 119, not sure how early you can go back).",
     )
 
+    parser.add_argument(
+        "--nthreads",
+        type=positive_int,
+        default=1,
+        help="Number of threads used to fetch the pages of paginated endpoints"
+        " concurrently (default: 1, i.e. follow the pages serially).",
+    )
+
+    parser.add_argument(
+        "--max-requests",  ## dashes are automatically converted to underscores
+        type=int,
+        default=None,
+        help="Maximum number of requests to spend on each paginated endpoint"
+        " (default: no limit).",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Timeout in seconds for each Congress.gov request"
+        " (default: 10s to connect, 60s to read).",
+    )
+
+    parser.add_argument(
+        "--max-retries",  ## dashes are automatically converted to underscores
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help="Number of times to retry a request after a 429/5xx response or"
+        " connection error, with exponential backoff.",
+    )
+
+    parser.add_argument(
+        "--hydrate",
+        action="store_true",
+        help="Fetch the details of every listed event that isn't stored yet,"
+        " resuming from the events left pending by a previous run.",
+    )
+
+    parser.add_argument(
+        "--requests-per-hour",  ## dashes are automatically converted to underscores
+        type=positive_int,
+        default=DATA_GOV_HOURLY_QUOTA,
+        help="Rate limit applied while hydrating events (default: the data.gov"
+        " quota of 5,000 requests per hour).",
+    )
+
+    ## the streamed listings are decoded off the (threaded) requests session
+    listing_mode = parser.add_mutually_exclusive_group()
+
+    listing_mode.add_argument(
+        "--stream",
+        action="store_true",
+        help="Decode the pages of the committee and meeting listings"
+        " incrementally as they download (requires ijson; pages are then"
+        " followed serially).",
+    )
+
+    listing_mode.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch the listings, committee details and events with the asyncio"
+        " client (requires httpx), as up to --nthreads concurrent requests on"
+        " one event loop instead of a thread pool.",
+    )
+
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep the responses under <tinydb_dir>/http-cache and reuse them"
+        " while fresh; details are invalidated as soon as a listing reports a"
+        " newer updateDate.",
+    )
+
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve every request from the response cache, regardless of age,"
+        " and never touch the network.",
+    )
+
+    parser.add_argument(
+        "--refresh-details",  ## dashes are automatically converted to underscores
+        action="store_true",
+        help="Update the stored committee summaries and re-fetch (over"
+        " --nthreads) the details of only those committees whose updateDate"
+        " is newer than their stored details.",
+    )
+
     ## ignore the unknown args
     args = parser.parse_known_args()[0]
 
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+## api.data.gov allows 5,000 requests per hour per key
+DATA_GOV_HOURLY_QUOTA = 5000
+DEFAULT_BURST = 10
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request consumes one, blocking until one is available. A bucket can be
+    shared by threads and coroutines alike.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens, i.e. the largest burst.
+
+    Methods:
+        per_hour(): Build a bucket from an hourly request quota.
+        acquire(): Block until the requested number of tokens is available.
+        acquire_async(): Wait, without blocking the event loop, for the tokens.
+    """
+
+    def __init__(self, rate: float, capacity: float = DEFAULT_BURST) -> None:
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}, must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_hour(
+        cls, requests_per_hour: int = DATA_GOV_HOURLY_QUOTA, burst: int = DEFAULT_BURST
+    ) -> "TokenBucket":
+        if requests_per_hour <= 0:
+            raise ValueError(
+                f"Invalid requests_per_hour: {requests_per_hour}, must be positive"
+            )
+        ## keep the burst inside the quota so a full hour never exceeds it, and
+        ##  small enough that a tiny quota still leaves a positive refill rate
+        burst = min(burst, max(1, requests_per_hour // 10))
+        return cls(max(requests_per_hour - burst, 1) / 3600, burst)
+
+    def acquire(self, tokens: float = 1) -> None:
+        while (wait := self._try_acquire(tokens)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        while (wait := self._try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Take the tokens and return 0, or return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self.rate
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+## (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10, 60)
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 1.0
+## never sleep longer than this between two attempts; a Retry-After beyond it
+##  (e.g. the data.gov hourly quota) is surfaced to the caller instead
+DEFAULT_BACKOFF_MAX = 60.0
+DEFAULT_POOL_MAXSIZE = 16
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+## the errors raised for an error status by this session or the asyncio one
+HTTP_ERRORS: tuple[type[Exception], ...] = (requests.HTTPError,) + (
+    (httpx.HTTPStatusError,) if httpx is not None else ()
+)
+
+
+class CongressSession:
+    """
+    A pooled HTTP session shared by all Congress.gov calls.
+
+    Connections are kept alive and reused across requests (and threads) by a
+    single requests.Session. Every request gets a timeout, and 429/5xx
+    responses or connection errors are retried with exponential backoff and
+    full jitter, honoring the Retry-After header when the server sends one.
+
+    Attributes:
+        timeout: (connect, read) timeout passed to every request.
+        max_retries (int): Number of retries after the first attempt.
+        backoff_factor (float): Base delay in seconds, doubled every attempt.
+        backoff_max (float): Upper bound on a single delay in seconds.
+        pool_maxsize (int): Number of connections kept alive per host.
+        counters (Counter): Number of requests, retries and errors by kind.
+
+    Methods:
+        get(): GET a url, retrying transient failures.
+        stats(): Return a snapshot of the counters.
+        add_counts(): Fold in the counters of another (e.g. asyncio) session.
+    """
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.pool_maxsize = pool_maxsize
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def get(
+        self, url: str, params: dict | None = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        GET url, retrying 429/5xx responses and connection errors with backoff.
+        With stream set the body is left unread for the caller to consume.
+        """
+        attempt = 0
+        while True:
+            self._count("requests")
+            try:
+                response = self.session.get(
+                    url, params=params, timeout=self.timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._count(type(e).__name__)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                self._count(f"status_{response.status_code}")
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self.backoff_delay(attempt)
+                elif delay > self.backoff_max:
+                    ## not worth waiting on, let the caller decide what to do
+                    return response
+                ## hand the connection back to the pool before retrying
+                response.close()
+
+            self._count("retries")
+            time.sleep(delay)
+            attempt += 1
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given (0-based) attempt."""
+        cap = min(self.backoff_max, self.backoff_factor * 2**attempt)
+        return random.uniform(0, cap)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def add_counts(self, counters: Counter) -> None:
+        with self._lock:
+            self.counters.update(counters)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def http_status_code(error: Exception) -> int | None:
+    """The status code of one of the HTTP_ERRORS, if it carries a response."""
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else None
+
+
+## process-wide session, created on first use
+_SESSION: CongressSession = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> CongressSession:
+    """Return the shared CongressSession, creating it with the defaults if needed."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = CongressSession()
+        return _SESSION
+
+
+def configure_session(**kwargs) -> CongressSession:
+    """Replace the shared CongressSession with one built from kwargs."""
+    global _SESSION
+    with _SESSION_LOCK:
+        _SESSION = CongressSession(**kwargs)
+        return _SESSION
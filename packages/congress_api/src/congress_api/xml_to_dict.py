@@ -1,27 +1,70 @@
+import threading
 import xml.etree.ElementTree as ET
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 
 def xml_to_dict(elem):
     # get text if no children
-    if not list(elem):
+    if len(elem) == 0:
         return elem.text.strip() if elem.text and elem.text.strip() else None
+    return _children_to_dict(elem)
+
 
+def _children_to_dict(elem) -> dict:
+    ## leaves (the bulk of a response) are converted inline rather than through
+    ##  another call, and the child count is read with len() instead of copying
+    ##  the children into a list for every element
     result = {}
     for child in elem:
-        child_data = xml_to_dict(child)
-
-        # group by tag name
-        if child.tag in result:
-            # convert to list if needed
-            if not isinstance(result[child.tag], list):
-                result[child.tag] = [result[child.tag]]
-            result[child.tag].append(child_data)
+        tag = child.tag
+        if len(child):
+            value = _children_to_dict(child)
         else:
-            result[child.tag] = child_data
+            text = child.text
+            value = (text.strip() or None) if text else None
 
+        # group by tag name, converting to a list on the second occurrence
+        if tag in result:
+            existing = result[tag]
+            if type(existing) is list:
+                existing.append(value)
+            else:
+                result[tag] = [existing, value]
+        else:
+            result[tag] = value
     return result
 
 
-def parse_xml_string(xml_str):
-    root = ET.fromstring(xml_str)
+## lxml parsers can't be shared between threads, and events are hydrated over
+##  a thread pool
+_LXML_PARSERS = threading.local()
+
+
+def _lxml_parser():
+    parser = getattr(_LXML_PARSERS, "parser", None)
+    if parser is None:
+        ## whitespace between elements, comments and processing instructions
+        ##  never reach the dict, so don't build nodes for them at all
+        parser = _LXML_PARSERS.parser = lxml_etree.XMLParser(
+            remove_blank_text=True, remove_comments=True, remove_pis=True
+        )
+    return parser
+
+
+def parse_xml_string(xml_str, use_lxml: bool = True) -> dict:
+    """
+    Parse a Congress.gov XML response into ``{root tag: converted root}``.
+
+    Raw response bytes are parsed with lxml when it's installed (and use_lxml
+    is set), which honours the document's declared encoding; str, or bytes
+    without lxml, go through ElementTree. Both give the same dict.
+    """
+    if use_lxml and lxml_etree is not None and isinstance(xml_str, bytes):
+        root = lxml_etree.fromstring(xml_str, _lxml_parser())
+    else:
+        root = ET.fromstring(xml_str)
     return {root.tag: xml_to_dict(root)}
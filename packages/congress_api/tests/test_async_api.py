@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from congress_api.async_api import AsyncCongressSession
+from congress_api.session import CongressSession
+
+URL = "https://api.congress.gov/v3/committee-meeting/118/house/115538?format=xml"
+
+
+def run_get(handler, session=None, **params) -> tuple[httpx.Response, dict]:
+    """GET URL through an AsyncCongressSession served by handler."""
+
+    async def get():
+        inst = session or AsyncCongressSession(backoff_factor=0.001)
+        await inst.client.aclose()
+        inst.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await inst.get(URL, params), inst.stats()
+        finally:
+            await inst.aclose()
+
+    return asyncio.run(get())
+
+
+def responses(*responses: httpx.Response):
+    """A handler answering each request with the next of responses."""
+    requests = []
+    pending = list(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return pending.pop(0)
+
+    handler.requests = requests
+    return handler
+
+
+def test_merges_params_into_the_url_query():
+    handler = responses(httpx.Response(200))
+    run_get(handler, api_key="k")
+    assert handler.requests[0].url.params == httpx.QueryParams(
+        {"format": "xml", "api_key": "k"}
+    )
+
+
+def test_retries_5xx_honoring_retry_after():
+    handler = responses(
+        httpx.Response(503, headers={"Retry-After": "0"}),
+        httpx.Response(429),
+        httpx.Response(200, json={"ok": True}),
+    )
+    response, stats = run_get(handler)
+    assert response.json() == {"ok": True}
+    assert stats == {"requests": 3, "retries": 2, "status_503": 1, "status_429": 1}
+
+
+def test_returns_long_retry_after_to_the_caller():
+    ## e.g. the hourly quota, not worth sleeping on
+    handler = responses(httpx.Response(429, headers={"Retry-After": "3600"}))
+    response, stats = run_get(handler)
+    assert response.status_code == 429
+    assert stats == {"requests": 1, "status_429": 1}
+
+
+def test_returns_the_last_response_once_out_of_retries():
+    handler = responses(*(httpx.Response(502) for _ in range(4)))
+    response, stats = run_get(handler)
+    assert response.status_code == 502
+    assert stats["requests"] == 4
+    assert stats["retries"] == 3
+
+
+def test_reraises_connection_errors_once_out_of_retries():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        run_get(handler)
+
+
+def test_adds_its_counts_to_the_parent_session_on_close():
+    parent = CongressSession(backoff_factor=0.001)
+    session = AsyncCongressSession.from_session(parent)
+    handler = responses(httpx.Response(500), httpx.Response(200))
+    run_get(handler, session)
+    assert parent.stats() == {"requests": 2, "retries": 1, "status_500": 1}
+    assert session.stats() == {}
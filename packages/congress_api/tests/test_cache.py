@@ -0,0 +1,98 @@
+import os
+import time
+
+import pytest
+
+from congress_api.cache import (
+    DAY,
+    HOUR,
+    OfflineCacheMiss,
+    ResponseCache,
+    configure_response_cache,
+    get_response_cache,
+    offline_cache,
+)
+
+API = "https://api.congress.gov/v3"
+LISTING = f"{API}/committee-meeting/118/house"
+DETAILS = f"{API}/committee-meeting/118/house/115538"
+
+
+def age(cache: ResponseCache, url: str, seconds: float, params=None) -> None:
+    """Backdate the entry of url as if it had been fetched seconds ago."""
+    fetched_at = time.time() - seconds
+    os.utime(cache.entry_path(url, params), (fetched_at, fetched_at))
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    return ResponseCache(tmp_path / "http-cache")
+
+
+@pytest.fixture
+def no_shared_cache():
+    yield
+    configure_response_cache(None)
+
+
+def test_hit_ignores_api_key_and_param_order(cache):
+    cache.put(DETAILS, {"format": "json", "api_key": "a"}, {"event": {"id": 1}})
+    assert cache.get(f"{DETAILS}?api_key=b&format=json") == {"event": {"id": 1}}
+    assert cache.get(DETAILS, {"format": "xml"}) is None
+    assert cache.stats() == {"stores": 1, "hits": 1, "misses": 1}
+
+
+def test_ttl_by_url_path(cache):
+    assert cache.ttl_for(DETAILS) == 30 * DAY
+    assert cache.ttl_for(f"{API}/committee/house/hsgo00") == 7 * DAY
+    assert cache.ttl_for(LISTING) == HOUR
+
+    cache.put(LISTING, None, {"committeeMeetings": []})
+    cache.put(DETAILS, None, {"event": {}})
+    age(cache, LISTING, 2 * HOUR)
+    age(cache, DETAILS, 2 * HOUR)
+
+    assert cache.get(LISTING) is None
+    assert cache.get(DETAILS) == {"event": {}}
+    assert cache.stats()["expired"] == 1
+
+
+def test_listing_invalidates_details_updated_since(cache):
+    cache.put(DETAILS, None, {"event": {}})
+    age(cache, DETAILS, DAY)
+    listing = {
+        "committeeMeetings": [
+            {"url": f"{DETAILS}?format=json", "updateDate": "2099-01-01T00:00:00Z"}
+        ]
+    }
+    cache.put(LISTING, None, listing)
+    assert cache.get(DETAILS) is None
+    assert cache.stats()["invalidated"] == 1
+
+
+def test_offline_serves_expired_entries_and_raises_on_miss(cache):
+    cache.put(LISTING, None, {"committeeMeetings": []})
+    age(cache, LISTING, 30 * DAY)
+
+    offline = ResponseCache(cache.cache_dir, offline=True)
+    assert offline.get(LISTING) == {"committeeMeetings": []}
+    with pytest.raises(OfflineCacheMiss):
+        offline.get(DETAILS)
+
+
+def test_offline_cache_copies_the_shared_one(tmp_path, no_shared_cache):
+    shared = configure_response_cache(tmp_path / "shared", default_ttl=5.0)
+    offline = offline_cache(tmp_path)
+    assert offline.offline
+    assert offline.cache_dir == shared.cache_dir
+    assert offline.default_ttl == 5.0
+    ## the shared cache, used by every other request, isn't switched offline
+    assert get_response_cache() is shared
+    assert not shared.offline
+
+
+def test_offline_cache_defaults_under_tinydb_dir(tmp_path, no_shared_cache):
+    configure_response_cache(None)
+    offline = offline_cache(tmp_path)
+    assert offline.cache_dir == tmp_path / "http-cache"
+    assert get_response_cache() is None
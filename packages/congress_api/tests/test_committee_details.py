@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from congress_api.analyze.committee import Committee
+from congress_api.analyze.committee_details import (
+    CommitteeDetails,
+    flush_committee_details,
+)
+from congress_api.analyze.committee_summary import CommitteeSummary
+
+UPDATED = datetime(2025, 3, 1, 12, 0, 0)
+
+
+def committee(system_code: str, chamber: str, updated: datetime) -> Committee:
+    inst = Committee()
+    inst.summary = CommitteeSummary(
+        chamber=chamber,
+        committeeTypeCode="Standing",
+        name=system_code,
+        systemCode=system_code,
+        url=f"https://api.congress.gov/v3/committee/{chamber.lower()}/{system_code}",
+        updateDate=updated,
+    )
+    return inst
+
+
+@pytest.mark.parametrize(
+    "system_code, chamber, file_chamber",
+    [
+        ("hsag00", "House", "house"),
+        ("ssju00", "Senate", "senate"),
+        ("jsec00", "Joint", "joint"),
+    ],
+)
+def test_details_are_stored_under_tinydb_dir_by_chamber(
+    tmp_path, system_code, chamber, file_chamber
+):
+    CommitteeDetails(systemCode=system_code, updateDate=UPDATED).store(
+        tinydb_dir=str(tmp_path)
+    )
+    flush_committee_details()
+    assert (tmp_path / f"{file_chamber}-committee-details.json").exists()
+
+    stored = CommitteeDetails.from_system_code(system_code, str(tmp_path))
+    assert stored.updateDate == UPDATED
+    assert not committee(system_code, chamber, UPDATED).details_outdated(str(tmp_path))
+    assert committee(system_code, chamber, datetime(2025, 4, 1)).details_outdated(
+        str(tmp_path)
+    )
+
+
+def test_details_missing_from_tinydb_dir_are_outdated(tmp_path):
+    assert CommitteeDetails.from_system_code("ssju00", str(tmp_path)) is None
+    assert committee("ssju00", "Senate", UPDATED).details_outdated(str(tmp_path))
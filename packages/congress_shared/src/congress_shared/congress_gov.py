@@ -0,0 +1,18 @@
+## first letter of a systemCode -> chamber, e.g. hsag00 -> house
+SYSTEM_CODE_CHAMBERS = {"h": "house", "s": "senate", "j": "joint"}
+
+
+def system_code_chamber(system_code: str) -> str:
+    """The chamber of a committee's systemCode, "nochamber" if it has none."""
+    return SYSTEM_CODE_CHAMBERS.get(system_code[:1].lower(), "nochamber")
+
+
+def as_list(value) -> list:
+    """Normalize a JSON list, or its XML-fallback shape ({"item": ...}), to a list."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict) and "item" in value:
+        return as_list(value["item"])
+    return [value]
@@ -3,7 +3,9 @@ import logging
 import sys
 
 from pathlib import Path
-from argparse import ArgumentParser
+from argparse import SUPPRESS, Action, ArgumentParser
+
+from congress_shared.storage import STORAGE_BACKENDS, configure_storage_backend
 
 ## setup the logging config
 logging.basicConfig(
@@ -23,6 +25,14 @@ DEFAULT_CHANNELS_CSV = PACKAGE_DIR / "youtube" / "youtube-accounts.csv"
 DEFAULT_YOUTUBE_REPORT_FILE = DATA_DIR / "youtube_event_id_report.csv"
 
 
+class _StorageBackendAction(Action):
+    """Configure the storage backend as soon as it's parsed, rather than
+    threading it through every main()."""
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        configure_storage_backend(values)
+
+
 def add_global_args(parser: ArgumentParser) -> None:
     """Add shared arguments to an argparser for re-use throughout different modules."""
 
@@ -32,6 +42,14 @@ def add_global_args(parser: ArgumentParser) -> None:
         default=DEFAULT_TINYDB_DIR,
         help="Path to the directory containing TinyDB database json files.",
     )
+    parser.add_argument(
+        "--storage-backend",  ## dashes are automatically converted to underscores
+        action=_StorageBackendAction,
+        choices=STORAGE_BACKENDS,
+        default=SUPPRESS,
+        help="Store the tables as TinyDB json files (the default) or in SQLite files "
+        "(see congress-storage-migrate). Also set by $CONGRESS_STORAGE_BACKEND.",
+    )
 
 
 def add_youtube_args(parser: ArgumentParser) -> None:
@@ -0,0 +1,97 @@
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+
+from tinydb.table import Document
+
+from congress_shared.globals import add_global_args
+from congress_shared.sqlite_storage import SQLiteDatabase
+from congress_shared.storage import resolve_storage_path
+
+
+def is_tinydb_file(data) -> bool:
+    """Whether decoded JSON has TinyDB's {table: {doc_id: document}} layout."""
+    return isinstance(data, dict) and all(
+        isinstance(table, dict)
+        and all(
+            doc_id.isdigit() and isinstance(doc, dict) for doc_id, doc in table.items()
+        )
+        for table in data.values()
+    )
+
+
+def migrate_file(json_path: Path, force: bool = False) -> Path | None:
+    """
+    Copy every table of a TinyDB JSON file into the SQLite file next to it,
+    keeping the doc ids. Returns the SQLite path, or None if json_path isn't
+    a TinyDB file or was already migrated (unless force).
+    """
+    sqlite_path = resolve_storage_path(json_path, "sqlite")
+    with open(json_path, encoding="utf-8") as handle:
+        contents = handle.read()
+    data = json.loads(contents) if contents else {}
+    if not is_tinydb_file(data):
+        logging.info(f"Skipping {json_path}, not a TinyDB file")
+        return None
+    if sqlite_path.exists():
+        if not force:
+            logging.info(f"Skipping {json_path}, {sqlite_path} already exists")
+            return None
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{sqlite_path}{suffix}").unlink(missing_ok=True)
+
+    db = SQLiteDatabase(sqlite_path)
+    try:
+        for name, documents in data.items():
+            db.table(name).insert_multiple(
+                Document(doc, doc_id=int(doc_id)) for doc_id, doc in documents.items()
+            )
+        db.flush()
+        ## check nothing was lost before anyone switches over to the new file
+        for name, documents in data.items():
+            if len(db.table(name)) != len(documents):
+                raise RuntimeError(
+                    f"{sqlite_path} has {len(db.table(name))} documents in {name},"
+                    f" expected {len(documents)}"
+                )
+    finally:
+        db.close()
+    return sqlite_path
+
+
+def main(tinydb_dir: Path, force: bool = False):
+    for json_path in sorted(Path(tinydb_dir).glob("*.json")):
+        start = time.perf_counter()
+        sqlite_path = migrate_file(json_path, force)
+        if sqlite_path is not None:
+            print(
+                f"Migrated {json_path.name} to {sqlite_path.name}"
+                f" ({time.perf_counter() - start:.2f}s)"
+            )
+
+
+def parse_args_and_run():
+    parser = argparse.ArgumentParser(
+        description="Copy every TinyDB json file in --tinydb_dir into a SQLite file"
+        " next to it, for use with --storage-backend sqlite."
+    )
+
+    ## add shared args to the parser
+    add_global_args(parser)
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite SQLite files that were already migrated.",
+    )
+
+    ## ignore the unknown args
+    args = parser.parse_known_args()[0]
+
+    main(**vars(args))
+
+
+if __name__ == "__main__":
+    parse_args_and_run()
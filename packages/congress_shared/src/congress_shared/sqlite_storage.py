@@ -0,0 +1,344 @@
+import json
+import sqlite3
+import threading
+
+from pathlib import Path
+from tinydb.table import Document
+from typing import Callable, Iterable, Iterator, Mapping
+
+## commit every this many modifications, like BufferedStorage.WRITE_CACHE_SIZE
+WRITE_BATCH_SIZE = 1000
+
+## every logical table lives in the one documents table, the raw payloads are
+##  kept as JSON text (validated and queried with the JSON1 functions)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    tbl TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    doc TEXT NOT NULL CHECK (json_valid(doc)),
+    PRIMARY KEY (tbl, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteDatabase:
+    """
+    A SQLite file exposing the subset of the TinyDB API the fetchers and
+    analyzers use (table(), tables(), and the Table methods of SQLiteTable).
+
+    The file is opened in WAL mode so other processes can read it while a
+    fetch writes to it. Writes are committed on flush(), every
+    WRITE_BATCH_SIZE modifications and on close(), like BufferedStorage.
+
+    Attributes:
+        path (Path): The SQLite file.
+        default_table_name (str): Name of TinyDB's default table.
+
+    Methods:
+        table(): Return a (logical) table by name.
+        tables(): Return the names of the non-empty tables.
+        drop_table(): Remove a table's documents.
+        flush(): Commit the pending writes.
+        close(): Commit and close the connection.
+    """
+
+    default_table_name = "_default"
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._tables: dict[str, SQLiteTable] = {}
+        ## shared by the threads of a fetch, access is serialized by _lock
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.path}>"
+
+    def table(self, name: str) -> "SQLiteTable":
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                table = self._tables[name] = SQLiteTable(self, name)
+            return table
+
+    def tables(self) -> set[str]:
+        with self._lock:
+            rows = self.connection.execute("SELECT DISTINCT tbl FROM documents")
+            return {name for (name,) in rows}
+
+    def drop_table(self, name: str) -> None:
+        self.table(name).truncate()
+
+    def flush(self) -> None:
+        with self._lock:
+            self.connection.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.commit()
+            self.connection.close()
+
+    def execute(self, sql: str, parameters: Iterable = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self.connection.execute(sql, tuple(parameters))
+
+    def write(self, sql: str, rows: Iterable[Iterable], many: bool = False) -> None:
+        """Execute a modification, committing once a batch of them is pending."""
+        with self._lock:
+            if many:
+                rows = [tuple(row) for row in rows]
+                self.connection.executemany(sql, rows)
+                self._pending += len(rows)
+            else:
+                self.connection.execute(sql, tuple(rows))
+                self._pending += 1
+            if self._pending >= WRITE_BATCH_SIZE:
+                self.flush()
+
+
+def _decode(doc_id: int, doc: str) -> Document:
+    return Document(json.loads(doc), doc_id=doc_id)
+
+
+def _encode(document: Mapping) -> str:
+    return json.dumps(dict(document), ensure_ascii=False)
+
+
+class SQLiteTable:
+    """
+    A TinyDB-style table stored as the rows of ``documents`` with tbl=name.
+
+    Conditions (TinyDB queries, or any callable over a document) are
+    evaluated in Python; lookups by doc_id, and by an indexed natural key
+    through SQLiteKeyIndex, are answered by the primary key and the JSON1
+    expression indexes instead.
+    """
+
+    def __init__(self, db: SQLiteDatabase, name: str) -> None:
+        self.db = db
+        self.name = name
+        self._next_id: int | None = None
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} name={self.name!r}, total={len(self)}, db={self.db.path}>"
+
+    def __len__(self) -> int:
+        (count,) = self.db.execute(
+            "SELECT COUNT(*) FROM documents WHERE tbl = ?", (self.name,)
+        ).fetchone()
+        return count
+
+    def __iter__(self) -> Iterator[Document]:
+        return iter(self.all())
+
+    def _allocate_id(self) -> int:
+        if self._next_id is None:
+            (max_id,) = self.db.execute(
+                "SELECT MAX(doc_id) FROM documents WHERE tbl = ?", (self.name,)
+            ).fetchone()
+            self._next_id = (max_id or 0) + 1
+        doc_id = self._next_id
+        self._next_id += 1
+        return doc_id
+
+    def _reserve_id(self, doc_id: int) -> None:
+        if self._next_id is not None:
+            self._next_id = max(self._next_id, doc_id + 1)
+
+    def all(self) -> list[Document]:
+        rows = self.db.execute(
+            "SELECT doc_id, doc FROM documents WHERE tbl = ? ORDER BY doc_id",
+            (self.name,),
+        )
+        return [_decode(doc_id, doc) for doc_id, doc in rows]
+
+    def insert(self, document: Mapping) -> int:
+        with self.db._lock:
+            if isinstance(document, Document):
+                doc_id = document.doc_id
+                if self.contains(doc_id=doc_id):
+                    raise ValueError(f"Document with ID {doc_id} already exists")
+                self._reserve_id(doc_id)
+            else:
+                doc_id = self._allocate_id()
+            self.db.write(
+                "INSERT INTO documents (tbl, doc_id, doc) VALUES (?, ?, ?)",
+                (self.name, doc_id, _encode(document)),
+            )
+        return doc_id
+
+    def insert_multiple(self, documents: Iterable[Mapping]) -> list[int]:
+        with self.db._lock:
+            rows = []
+            for document in documents:
+                if isinstance(document, Document):
+                    doc_id = document.doc_id
+                    self._reserve_id(doc_id)
+                else:
+                    doc_id = self._allocate_id()
+                rows.append((self.name, doc_id, _encode(document)))
+            self.db.write(
+                "INSERT INTO documents (tbl, doc_id, doc) VALUES (?, ?, ?)",
+                rows,
+                many=True,
+            )
+        return [doc_id for _, doc_id, _ in rows]
+
+    def get(
+        self,
+        cond: Callable | None = None,
+        doc_id: int | None = None,
+        doc_ids: list[int] | None = None,
+    ) -> Document | list[Document] | None:
+        if doc_id is not None:
+            row = self.db.execute(
+                "SELECT doc_id, doc FROM documents WHERE tbl = ? AND doc_id = ?",
+                (self.name, doc_id),
+            ).fetchone()
+            return _decode(*row) if row is not None else None
+        if doc_ids is not None:
+            return [doc for doc in map(self._get_one, doc_ids) if doc is not None]
+        if cond is None:
+            raise RuntimeError("You have to pass either cond or doc_id or doc_ids")
+        return next((doc for doc in self.all() if cond(doc)), None)
+
+    def _get_one(self, doc_id: int) -> Document | None:
+        return self.get(doc_id=doc_id)
+
+    def contains(self, cond: Callable | None = None, doc_id: int | None = None) -> bool:
+        if doc_id is not None:
+            row = self.db.execute(
+                "SELECT 1 FROM documents WHERE tbl = ? AND doc_id = ?",
+                (self.name, doc_id),
+            ).fetchone()
+            return row is not None
+        if cond is None:
+            raise RuntimeError("You have to pass either cond or doc_id")
+        return self.get(cond) is not None
+
+    def search(self, cond: Callable) -> list[Document]:
+        return [doc for doc in self.all() if cond(doc)]
+
+    def count(self, cond: Callable) -> int:
+        return len(self.search(cond))
+
+    def update(
+        self,
+        fields: Mapping | Callable[[dict], None],
+        cond: Callable | None = None,
+        doc_ids: Iterable[int] | None = None,
+    ) -> list[int]:
+        """Update the given fields (or apply a callable) to the matching documents."""
+        with self.db._lock:
+            if doc_ids is not None:
+                docs = [doc for doc in map(self._get_one, doc_ids) if doc is not None]
+            elif cond is not None:
+                docs = self.search(cond)
+            else:
+                docs = self.all()
+            for doc in docs:
+                if callable(fields):
+                    fields(doc)
+                else:
+                    doc.update(fields)
+            self.db.write(
+                "UPDATE documents SET doc = ? WHERE tbl = ? AND doc_id = ?",
+                [(_encode(doc), self.name, doc.doc_id) for doc in docs],
+                many=True,
+            )
+        return [doc.doc_id for doc in docs]
+
+    def remove(
+        self, cond: Callable | None = None, doc_ids: Iterable[int] | None = None
+    ) -> list[int]:
+        with self.db._lock:
+            if doc_ids is not None:
+                doc_ids = list(doc_ids)
+            elif cond is not None:
+                doc_ids = [doc.doc_id for doc in self.search(cond)]
+            else:
+                raise RuntimeError("Use truncate() to remove all documents")
+            self.db.write(
+                "DELETE FROM documents WHERE tbl = ? AND doc_id = ?",
+                [(self.name, doc_id) for doc_id in doc_ids],
+                many=True,
+            )
+        return doc_ids
+
+    def truncate(self) -> None:
+        with self.db._lock:
+            self.db.write("DELETE FROM documents WHERE tbl = ?", (self.name,))
+            self._next_id = None
+
+
+class SQLiteKeyIndex:
+    """
+    KeyIndex counterpart for SQLiteTable: lookups by a natural key (e.g.
+    systemCode, videoId) are answered by a JSON1 expression index on
+    (tbl, json_extract(doc, '$.key')) instead of a dict built in memory, so
+    opening a table costs nothing regardless of its size.
+    """
+
+    def __init__(self, table: SQLiteTable, key: str) -> None:
+        if not key.isidentifier():
+            raise ValueError(f"Cannot index {key!r}, not a plain field name")
+        self.table = table
+        self.key = key
+        self._path = f"$.{key}"
+        self.rebuild()
+
+    def __contains__(self, value) -> bool:
+        return self._doc_id(value) is not None
+
+    def __len__(self) -> int:
+        (count,) = self.table.db.execute(
+            "SELECT COUNT(DISTINCT json_extract(doc, ?)) FROM documents"
+            " WHERE tbl = ? AND json_extract(doc, ?) IS NOT NULL",
+            (self._path, self.table.name, self._path),
+        ).fetchone()
+        return count
+
+    def rebuild(self) -> None:
+        ## the expression must match the one in the queries below verbatim
+        self.table.db.execute(
+            f'CREATE INDEX IF NOT EXISTS "documents_{self.key}"'
+            f" ON documents (tbl, json_extract(doc, '{self._path}'))"
+        )
+
+    def _doc_id(self, value) -> int | None:
+        row = self.table.db.execute(
+            f"SELECT doc_id FROM documents WHERE tbl = ?"
+            f" AND json_extract(doc, '{self._path}') = ? ORDER BY doc_id LIMIT 1",
+            (self.table.name, value),
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def get(self, value) -> Document | None:
+        doc_id = self._doc_id(value)
+        return self.table.get(doc_id=doc_id) if doc_id is not None else None
+
+    def insert(self, document: Mapping) -> int:
+        return self.table.insert(document)
+
+    def update(self, fields: Mapping, value) -> int | None:
+        doc_id = self._doc_id(value)
+        if doc_id is None:
+            return None
+        if self.key in fields and fields[self.key] != value:
+            raise ValueError(f"Cannot change the indexed {self.key} of {value}")
+        self.table.update(fields, doc_ids=[doc_id])
+        return doc_id
+
+    def upsert(self, document: Mapping) -> int:
+        doc_id = self.update(document, document[self.key])
+        if doc_id is None:
+            doc_id = self.insert(document)
+        return doc_id
+
+    def truncate(self) -> None:
+        self.table.truncate()
@@ -0,0 +1,276 @@
+import atexit
+import json
+import os
+import tempfile
+import weakref
+
+from pathlib import Path
+from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import Storage
+from tinydb.table import Document, Table
+from typing import Literal, Mapping
+
+from congress_shared.sqlite_storage import SQLiteDatabase, SQLiteKeyIndex, SQLiteTable
+
+StorageBackend = Literal["tinydb", "sqlite"]
+STORAGE_BACKENDS: tuple[StorageBackend, ...] = ("tinydb", "sqlite")
+## read at import, and set by configure_storage_backend() so worker processes
+##  (e.g. the analyzers' multiprocessing pools) open the same backend
+STORAGE_BACKEND_ENV = "CONGRESS_STORAGE_BACKEND"
+SQLITE_SUFFIX = ".sqlite3"
+
+
+class AtomicJSONStorage(Storage):
+    """
+    TinyDB storage that keeps the same JSON file layout as TinyDB's JSONStorage
+    but never rewrites the file in place: every write goes to a temporary file
+    in the same directory which is then renamed over the target, so a crash
+    mid-write leaves the previous version intact.
+    """
+
+    def __init__(self, path: str | Path, create_dirs: bool = False, **kwargs) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.kwargs = kwargs
+
+        if create_dirs:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        ## match JSONStorage, which creates an empty file on open
+        self.path.touch(exist_ok=True)
+
+    def read(self) -> dict | None:
+        with open(self.path, encoding="utf-8") as handle:
+            contents = handle.read()
+        if not contents:
+            ## empty file, let TinyDB initialize the database
+            return None
+        return json.loads(contents)
+
+    def write(self, data: dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(data, **self.kwargs))
+                handle.flush()
+                os.fsync(handle.fileno())
+            ## mkstemp creates the file 0600, keep the target's permissions
+            os.chmod(tmp_path, os.stat(self.path).st_mode)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self) -> None:
+        pass
+
+
+class BufferedStorage(CachingMiddleware):
+    """
+    Keeps the database in memory and only writes it out on flush(), on close(),
+    every WRITE_CACHE_SIZE modifications, or at interpreter exit, instead of
+    rewriting the whole file on every insert.
+    """
+
+    WRITE_CACHE_SIZE = 1000
+
+
+## every buffered db that is still alive, flushed at interpreter exit
+_BUFFERED_DBS: "weakref.WeakSet[TinyDB | SQLiteDatabase]" = weakref.WeakSet()
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the backend open_tinydb() uses when none is given."""
+    backend = os.environ.get(STORAGE_BACKEND_ENV) or "tinydb"
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Invalid {STORAGE_BACKEND_ENV}: {backend}, must be one of: {STORAGE_BACKENDS}"
+        )
+    return backend
+
+
+def configure_storage_backend(backend: StorageBackend) -> None:
+    """Make backend the default of open_tinydb() in this process and its children."""
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Invalid backend: {backend}, must be one of: {STORAGE_BACKENDS}"
+        )
+    os.environ[STORAGE_BACKEND_ENV] = backend
+
+
+def resolve_storage_path(
+    path: str | Path, backend: StorageBackend | None = None
+) -> Path:
+    """
+    Map the TinyDB path of a table file (e.g. events.json) onto the file the
+    backend actually stores it in (e.g. events.sqlite3).
+    """
+    path = Path(path)
+    if (backend or get_storage_backend()) == "sqlite":
+        return path.with_suffix(SQLITE_SUFFIX)
+    return path
+
+
+def open_tinydb(
+    path: str | Path,
+    buffered: bool = True,
+    backend: StorageBackend | None = None,
+    **kwargs,
+) -> TinyDB | SQLiteDatabase:
+    """
+    Open the TinyDB JSON file at path written atomically, or with the sqlite
+    backend the SQLiteDatabase next to it (see resolve_storage_path()).
+
+    When buffered, writes are batched in memory until flush_tinydb() (or
+    one of BufferedStorage's other flush points) is reached. SQLite writes
+    are always batched in a transaction committed the same way.
+    """
+    backend = backend or get_storage_backend()
+    if backend == "sqlite":
+        db = SQLiteDatabase(resolve_storage_path(path, backend))
+        _BUFFERED_DBS.add(db)
+    elif buffered:
+        db = TinyDB(path, storage=BufferedStorage(AtomicJSONStorage), **kwargs)
+        _BUFFERED_DBS.add(db)
+    else:
+        db = TinyDB(path, storage=AtomicJSONStorage, **kwargs)
+    return db
+
+
+def flush_tinydb(db: TinyDB | SQLiteDatabase) -> None:
+    """Write any buffered changes of db to disk (no-op for unbuffered dbs)."""
+    if isinstance(db, SQLiteDatabase):
+        db.flush()
+        return
+    flush = getattr(db.storage, "flush", None)
+    if flush is not None:
+        flush()
+
+
+@atexit.register
+def flush_all_tinydbs() -> None:
+    """Write the buffered changes of every open db to disk."""
+    for db in list(_BUFFERED_DBS):
+        flush_tinydb(db)
+
+
+def read_tables(
+    path: str | Path, backend: StorageBackend | None = None
+) -> dict[str, dict[str, dict]]:
+    """
+    Read every table of a table file as {table: {doc_id: document}}, the
+    layout of TinyDB's JSON files, whatever the backend; {} if it's missing.
+    """
+    backend = backend or get_storage_backend()
+    path = resolve_storage_path(path, backend)
+    if not path.exists():
+        return {}
+    if backend == "sqlite":
+        db = SQLiteDatabase(path)
+        try:
+            tables: dict[str, dict[str, dict]] = {}
+            rows = db.execute(
+                "SELECT tbl, doc_id, doc FROM documents ORDER BY tbl, doc_id"
+            )
+            for name, doc_id, doc in rows:
+                tables.setdefault(name, {})[str(doc_id)] = json.loads(doc)
+            return tables
+        finally:
+            db.close()
+    with open(path, encoding="utf-8") as handle:
+        contents = handle.read()
+    return json.loads(contents) if contents else {}
+
+
+class KeyIndex:
+    """
+    In-memory hash index of a TinyDB table on one natural key (e.g. systemCode,
+    videoId), mapping each key to the doc_id of the first document holding it.
+
+    The index is built once from the table and kept current by the write
+    methods below, so writes to an indexed table should go through them.
+
+    Attributes:
+        table (Table): The indexed TinyDB table.
+        key (str): The indexed field.
+
+    Methods:
+        get(): Return the document holding a key, or None.
+        insert(): Insert a document and index it.
+        update(): Update the fields of the document holding a key.
+        upsert(): Update the document holding the document's key, or insert it.
+        truncate(): Empty the table and the index.
+        rebuild(): Re-index the table after writes that bypassed the index.
+    """
+
+    def __init__(self, table: Table, key: str) -> None:
+        self.table = table
+        self.key = key
+        self._doc_ids: dict = {}
+        self.rebuild()
+
+    def __contains__(self, value) -> bool:
+        return value in self._doc_ids
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def rebuild(self) -> None:
+        self._doc_ids = {}
+        for doc in self.table.all():
+            if self.key in doc:
+                ## keep the first match, like Table.get(query)
+                self._doc_ids.setdefault(doc[self.key], doc.doc_id)
+
+    def get(self, value) -> Document | None:
+        doc_id = self._doc_ids.get(value)
+        if doc_id is None:
+            return None
+        return self.table.get(doc_id=doc_id)
+
+    def insert(self, document: Mapping) -> int:
+        doc_id = self.table.insert(document)
+        if self.key in document:
+            self._doc_ids.setdefault(document[self.key], doc_id)
+        return doc_id
+
+    def update(self, fields: Mapping, value) -> int | None:
+        doc_id = self._doc_ids.get(value)
+        if doc_id is None:
+            return None
+        if self.key in fields and fields[self.key] != value:
+            raise ValueError(f"Cannot change the indexed {self.key} of {value}")
+        self.table.update(fields, doc_ids=[doc_id])
+        return doc_id
+
+    def upsert(self, document: Mapping) -> int:
+        doc_id = self.update(document, document[self.key])
+        if doc_id is None:
+            doc_id = self.insert(document)
+        return doc_id
+
+    def truncate(self) -> None:
+        self.table.truncate()
+        self._doc_ids = {}
+
+
+AnyTable = Table | SQLiteTable
+AnyKeyIndex = KeyIndex | SQLiteKeyIndex
+
+## one index per (table, key), built the first time it's requested
+_KEY_INDEXES: "weakref.WeakKeyDictionary[AnyTable, dict[str, AnyKeyIndex]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_key_index(table: AnyTable, key: str) -> AnyKeyIndex:
+    """Return the shared KeyIndex of table on key, building it on first use."""
+    indexes = _KEY_INDEXES.setdefault(table, {})
+    index = indexes.get(key)
+    if index is None:
+        index_class = SQLiteKeyIndex if isinstance(table, SQLiteTable) else KeyIndex
+        index = indexes[key] = index_class(table, key)
+    return index
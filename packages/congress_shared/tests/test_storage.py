@@ -0,0 +1,69 @@
+import pytest
+from tinydb import Query
+from tinydb.table import Document
+
+from congress_shared.migrate import migrate_file
+from congress_shared.storage import (
+    STORAGE_BACKENDS,
+    flush_tinydb,
+    get_key_index,
+    open_tinydb,
+    read_tables,
+    resolve_storage_path,
+)
+
+
+def write_store(path, backend) -> None:
+    """The same writes the fetchers make, through the given backend."""
+    db = open_tinydb(path, backend=backend)
+    committees = db.table("committees")
+    committees.insert_multiple(
+        [
+            {"systemCode": "hsag00", "name": "Agriculture", "chamber": "House"},
+            {"systemCode": "hsgo00", "name": "Oversight", "chamber": "House"},
+            {"systemCode": "ssju00", "name": "Judiciary", "chamber": "Senate"},
+        ]
+    )
+    committees.update({"name": "Oversight and Reform"}, Query().systemCode == "hsgo00")
+    committees.remove(Query().systemCode == "ssju00")
+    index = get_key_index(committees, "systemCode")
+    index.upsert({"systemCode": "hsag00", "subcommittees": [{"name": "Forestry"}]})
+    index.upsert({"systemCode": "hsju00", "name": "Judiciary – House"})
+
+    meetings = db.table("committee_meetings")
+    meetings.insert(
+        Document(
+            {"eventId": "115538", "committees": {"item": {"systemCode": "hsgo00"}}},
+            doc_id=115538,
+        )
+    )
+    meetings.insert({"eventId": "115539", "location": None, "congress": 118})
+    flush_tinydb(db)
+
+
+def test_read_tables_is_the_same_for_every_backend(tmp_path):
+    path = tmp_path / "store.json"
+    tables = {}
+    for backend in STORAGE_BACKENDS:
+        write_store(path, backend)
+        tables[backend] = read_tables(path, backend)
+
+    tinydb_tables = tables["tinydb"]
+    assert set(tinydb_tables) == {"committees", "committee_meetings"}
+    assert tinydb_tables["committees"]["1"]["subcommittees"] == [{"name": "Forestry"}]
+    assert "3" not in tinydb_tables["committees"]
+    assert set(tinydb_tables["committee_meetings"]) == {"115538", "115539"}
+    for backend_tables in tables.values():
+        assert backend_tables == tinydb_tables
+
+
+def test_read_tables_of_a_migrated_store(tmp_path):
+    path = tmp_path / "store.json"
+    write_store(path, "tinydb")
+    assert migrate_file(path) == resolve_storage_path(path, "sqlite")
+    assert read_tables(path, "sqlite") == read_tables(path, "tinydb")
+
+
+@pytest.mark.parametrize("backend", STORAGE_BACKENDS)
+def test_read_tables_of_a_missing_store(tmp_path, backend):
+    assert read_tables(tmp_path / "missing.json", backend) == {}
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of the event id matcher used by youtube-analyze.
+
+Compares the original ``re.search(".*(\\d{6}|eventid).*", ..., re.IGNORECASE)``
+check of description then title against youtube_api.event_id.has_event_id,
+over the videos stored in the committee TinyDBs (by default the ones committed
+under apps/committee_youtube/data), and checks that both agree on every video.
+
+    python packages/youtube_api/benchmarks/event_id.py [--tinydb_dir DIR] [--repeat N]
+"""
+
+import argparse
+import json
+import re
+import time
+
+from pathlib import Path
+
+from youtube_api.event_id import extract_event_id, has_event_id
+from youtube_api.tables import VIDEOS_TABLE_PREFIX
+
+LEGACY_EVENT_ID_REGEX = ".*(\\d{6}|eventid).*"
+
+DEFAULT_CORPUS_DIR = (
+    Path(__file__).resolve().parents[3] / "apps" / "committee_youtube" / "data"
+)
+
+
+def legacy_has_event_id(video: dict) -> bool:
+    return bool(
+        re.search(LEGACY_EVENT_ID_REGEX, video["description"], re.IGNORECASE)
+        or re.search(LEGACY_EVENT_ID_REGEX, video["title"], re.IGNORECASE)
+    )
+
+
+def load_corpus(tinydb_dir: Path) -> list[dict]:
+    """Read every stored video from the youtube_NN.json files in tinydb_dir."""
+    videos = []
+    for path in sorted(tinydb_dir.glob("youtube_*.json")):
+        with open(path, encoding="utf-8") as handle:
+            tables = json.load(handle)
+        for name, table in tables.items():
+            if name.startswith(VIDEOS_TABLE_PREFIX):
+                videos.extend(table.values())
+    return videos
+
+
+def time_matcher(matcher, videos: list[dict], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matched = sum(1 for video in videos if matcher(video))
+        best = min(best, time.perf_counter() - start)
+    return best, matched
+
+
+def main(tinydb_dir: Path = DEFAULT_CORPUS_DIR, repeat: int = 3) -> None:
+    videos = load_corpus(tinydb_dir)
+    total_chars = sum(len(v["title"]) + len(v["description"]) for v in videos)
+    print(f"{len(videos)} videos, {total_chars / max(len(videos), 1):.0f} chars each")
+
+    legacy_time, legacy_matched = time_matcher(legacy_has_event_id, videos, repeat)
+    new_time, new_matched = time_matcher(has_event_id, videos, repeat)
+    extract_time, extracted = time_matcher(extract_event_id, videos, repeat)
+
+    mismatches = sum(1 for v in videos if legacy_has_event_id(v) != has_event_id(v))
+    print(f"legacy regex:     {legacy_time:8.3f} s  ({legacy_matched} matched)")
+    print(
+        f"has_event_id:     {new_time:8.3f} s  ({new_matched} matched, "
+        f"{legacy_time / max(new_time, 1e-9):.0f}x faster)"
+    )
+    print(f"extract_event_id: {extract_time:8.3f} s  ({extracted} extracted)")
+    if mismatches:
+        raise SystemExit(f"{mismatches} videos classified differently")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tinydb_dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(**vars(parser.parse_args()))
@@ -1,22 +1,23 @@
 import argparse
-import csv
-import datetime
-import itertools
 import logging
 import multiprocessing
-import re
+import os
 import time
 
-from dataclasses import asdict, dataclass
 from pathlib import Path
-from tinydb import Query, TinyDB
+from tinydb import TinyDB
 
 from congress_shared.globals import add_global_args, add_youtube_args, CONGRESS_METADATA
 
+from youtube_api.congress_dates import CongressDateBuckets
+from youtube_api.event_id import has_event_id
+from youtube_api.report import EventIdReport, write_to_csv
 from youtube_api.tables import (
+    VIDEOS_TABLE_PREFIX,
     get_all_commitee_names,
     get_all_committee_handless,
     open_tinydb_for_committee,
+    youtube_tinydb_path,
 )
 from congress_shared.globals import (
     DEFAULT_YOUTUBE_REPORT_FILE,
@@ -24,23 +25,6 @@ from congress_shared.globals import (
     DEFAULT_CHANNELS_CSV,
 )
 
-EVENT_ID_REGEX = ".*(\\d{6}|eventid).*"
-
-
-_TINYDB: TinyDB = None
-
-
-## define columns in row of final report
-@dataclass
-class EventIdReport:
-    committee_name: str
-    handle: str
-    total_videos: int
-    missing_event_id: int
-    congress_number: int
-    control: str
-    chamber: str = "house"
-
 
 def main(
     output_path: Path = DEFAULT_YOUTUBE_REPORT_FILE,
@@ -55,148 +39,137 @@ def main(
         nthreads = multiprocessing.cpu_count()
 
     ## load all the names & their indices
-    committee_names = get_all_commitee_names(
-        csv_path=channels_csv_path
-    )
+    committee_names = get_all_commitee_names(csv_path=channels_csv_path)
 
     ## load all the corresponding handles
     committee_handless = get_all_committee_handless(channels_csv_path)
+
+    ## build one task per (committee, handle) so a single pool covers the run
+    tasks = []
     for committee_index, committee_name in enumerate(committee_names):
-        try:
-            ## define args required for opening the correct tinydb
-            tinydb_args = dict(
-                committee_name_or_index=committee_index,
-                csv_path=channels_csv_path,
-                tinydb_dir=tinydb_dir,
-                assert_exists=True,
+        ## define args required for opening the correct tinydb
+        tinydb_args = dict(
+            committee_name_or_index=committee_index,
+            csv_path=channels_csv_path,
+            tinydb_dir=tinydb_dir,
+            assert_exists=True,
+        )
+        ## skip committees without a tinydb, the workers do the opening
+        path = youtube_tinydb_path(committee_index, tinydb_dir)
+        if not os.path.exists(path):
+            logging.error(
+                f"No existing tinydb file for index {committee_index} at {path}"
             )
-            ## set the global _TINYDB for this process
-            global _TINYDB
-            _TINYDB = open_tinydb_for_committee(**tinydb_args)
-
-            ## TODO: this needs to be automatically set by handle once we add senate handles
-            ##  to the CSV
-            chamber = "house"
-
-            handles = committee_handless[committee_index]
-            for handle in handles:
-                if handle == "":
-                    ## skip when we're in a row that has fewer
-                    ##  handles than the max # (-> empty column)
-                    continue
-
-                ## load the tinydb table
-                all_videos = _TINYDB.table(f"youtube_videos_{handle}")
-
-                ## keep track of # of videos for validation at the end
-                total_count = len(all_videos)
-                running_count = 0
-
-                ## loop through each congress to split metrics by congress #
-                ##  define the args for generating each row of the report
-                argss = zip(
-                    itertools.repeat(committee_name),
-                    itertools.repeat(handle),
-                    CONGRESS_METADATA.keys(),
-                    CONGRESS_METADATA.values(),
-                    itertools.repeat(chamber),
-                )
-
-                if nthreads > 1:
-                    ## in parallel...
-                    ## have to open tinydb separately in each process
-                    with multiprocessing.Pool(
-                        nthreads, initializer=set_global_tinydb, initargs=[tinydb_args]
-                    ) as pool:
-                        reports = pool.starmap(
-                            generate_report_for_congress_number, argss
-                        )
-                else:
-                    ## in series...
-                    ## can share the existing tinydb in single process
-                    reports = [
-                        generate_report_for_congress_number(*args) for args in argss
-                    ]
-
-                ## concatenate the rows
-                running_count = sum([report.total_videos for report in reports])
-
-                ## validate that we didn't accidentally exclude any videos
-                if total_count != running_count:
-                    raise ValueError(
-                        f"{total_count - running_count} videos are outside"
-                        " the applied date ranges and were excluded from reporting."
-                    )
+            continue
+
+        ## TODO: this needs to be automatically set by handle once we add senate handles
+        ##  to the CSV
+        chamber = "house"
+
+        for handle in committee_handless[committee_index]:
+            if handle == "":
+                ## skip when we're in a row that has fewer
+                ##  handles than the max # (-> empty column)
+                continue
+            tasks.append((committee_name, handle, chamber, tinydb_args))
+
+    if nthreads > 1 and len(tasks) > 1:
+        ## in parallel...
+        ##  each worker opens (and keeps) its own copy of the tinydbs it's handed
+        with multiprocessing.Pool(min(nthreads, len(tasks))) as pool:
+            results = pool.starmap(report_handle_task, tasks, chunksize=1)
+    else:
+        ## in series...
+        results = [report_handle_task(*task) for task in tasks]
+
+    ## drop every row of a committee if any of its handles failed validation
+    failed_committees = set()
+    for (committee_name, *_), (_, error) in zip(tasks, results):
+        if error is not None:
+            logging.error(error)
+            failed_committees.add(committee_name)
+
+    ## concatenate the rows of every handle
+    for (committee_name, *_), (reports, _) in zip(tasks, results):
+        if committee_name not in failed_committees:
             final_reports.extend(reports)
-        except ValueError as e:
-            logging.error(e)
 
     write_to_csv(final_reports, output_path)
     logging.info(f"{time.time() - init_time} s elapsed")
 
 
-def set_global_tinydb(tinydb_args: dict[str, any]):
-    global _TINYDB
-    _TINYDB = open_tinydb_for_committee(**tinydb_args)
-
-
-def generate_report_for_congress_number(
+def report_handle_task(
+    committee_name: str,
+    handle: str,
+    chamber: str,
+    tinydb_args: dict[str, any],
+) -> tuple[list["EventIdReport"], str | None]:
+    """Pool task: report one handle, returning its rows or the validation error."""
+    ## served from this process's tinydb pool, so repeat committees aren't reparsed
+    tinydb = open_tinydb_for_committee(**tinydb_args)
+    try:
+        return (
+            generate_reports_for_handle(tinydb, committee_name, handle, chamber),
+            None,
+        )
+    except ValueError as e:
+        return [], str(e)
+
+
+def generate_reports_for_handle(
+    tinydb: TinyDB,
     committee_name: str,
     handle: str,
-    congress_number: int,
-    meta: dict[str, any],
     chamber: str,
-):
-    start_date = meta["start"]
-    end_date = meta["end"]
-    if end_date == "present":
-        end_date = datetime.date.today().isoformat()
+) -> list[EventIdReport]:
+    """
+    Generate one report row per congress for a handle in a single pass over
+    its videos, bucketing each video by its publishedAt date.
+    """
+    buckets = CongressDateBuckets()
+    total_counts = dict.fromkeys(CONGRESS_METADATA, 0)
+    has_event_id_counts = dict.fromkeys(CONGRESS_METADATA, 0)
 
     ## videos have:
     ##  "publishedAt": "2025-07-23T23:26:16Z",
-
-    all_videos = _TINYDB.table(f"youtube_videos_{handle}")
-    ## First filter videos by date range
-    video = Query()
-    videos_in_date_range = all_videos.search(
-        (video.publishedAt >= start_date) & (video.publishedAt <= end_date)
-    )
-
-    ## metric #1: total number of videos
-    congress_count = len(videos_in_date_range)
-
-    ## apply the RE to filter videos & count
-    has_event_id_count = sum(
-        1
-        for video in videos_in_date_range
-        if re.search(EVENT_ID_REGEX, video["description"], re.IGNORECASE)
-        or re.search(EVENT_ID_REGEX, video["title"], re.IGNORECASE)
-    )
-
-    row = EventIdReport(
-        ## committee name, repeats for multiple handles
-        committee_name,
-        handle,  ## this handle
-        congress_count,  ## all videos in this congress #
-        congress_count - has_event_id_count,  ## bad videos
-        congress_number,
-        meta[chamber],  ## party in control of this chamber
-        chamber,
-    )
-    logging.info(f"Reporting {row}")
-    return row
-
-
-def write_to_csv(report: list[EventIdReport], output_path: Path):
-    if len(report) == 0:
-        return
-    field_names = list(report[0].__annotations__.keys())
-    with open(output_path, mode="w", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=field_names)
-
-        writer.writeheader()
-        for row in report:
-            writer.writerow(asdict(row))
+    all_videos = tinydb.table(f"{VIDEOS_TABLE_PREFIX}{handle}")
+    excluded = 0
+    for video in all_videos:
+        congress_number = buckets.congress_of(video["publishedAt"])
+        if congress_number is None:
+            excluded += 1
+            continue
+
+        ## metric #1: total number of videos
+        total_counts[congress_number] += 1
+
+        ## apply the event id matcher to filter videos & count
+        if has_event_id(video):
+            has_event_id_counts[congress_number] += 1
+
+    ## validate that we didn't accidentally exclude any videos
+    if excluded > 0:
+        raise ValueError(
+            f"{excluded} videos are outside"
+            " the applied date ranges and were excluded from reporting."
+        )
+
+    rows = []
+    for congress_number, meta in CONGRESS_METADATA.items():
+        congress_count = total_counts[congress_number]
+        row = EventIdReport(
+            ## committee name, repeats for multiple handles
+            committee_name,
+            handle,  ## this handle
+            congress_count,  ## all videos in this congress #
+            congress_count - has_event_id_counts[congress_number],  ## bad videos
+            congress_number,
+            meta[chamber],  ## party in control of this chamber
+            chamber,
+        )
+        logging.info(f"Reporting {row}")
+        rows.append(row)
+    return rows
 
 
 def parse_args_and_run():
@@ -0,0 +1,72 @@
+import threading
+
+from googleapiclient.discovery import Resource, build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
+
+API_SERVICE_NAME = "youtube"
+API_VERSION = "v3"
+
+
+class _YoutubeClientMemoizer:
+    """Memoizes YouTube Data API service objects per (api key, discovery mode)."""
+
+    def __init__(self) -> None:
+        self._cache: dict[tuple[str, bool], Resource] = {}
+        self._lock = threading.Lock()
+
+    def get(self, youtube_api_key: str, static_discovery: bool = True) -> Resource:
+        key = (youtube_api_key, static_discovery)
+        with self._lock:
+            client = self._cache.get(key)
+            if client is None:
+                client = build(
+                    API_SERVICE_NAME,
+                    API_VERSION,
+                    developerKey=youtube_api_key,
+                    ## the discovery document bundled with the library, no network
+                    static_discovery=static_discovery,
+                    cache_discovery=False,
+                )
+                self._cache[key] = client
+            return client
+
+
+_CLIENT_MEMO = _YoutubeClientMemoizer()
+
+
+def get_youtube_client(youtube_api_key: str, static_discovery: bool = True) -> Resource:
+    """
+    Return the process-wide YouTube Data API client for youtube_api_key,
+    building it (and parsing the discovery document) only on first use.
+
+    Args:
+        youtube_api_key (str): The YouTube Data API key for authentication.
+        static_discovery (bool): Use the discovery document shipped with
+            google-api-python-client instead of fetching it.
+    """
+    return _CLIENT_MEMO.get(youtube_api_key, static_discovery)
+
+
+## httplib2 connections aren't thread safe, so every thread gets its own
+_THREAD_LOCAL = threading.local()
+
+
+def execute(request: HttpRequest, etag: str | None = None) -> dict | None:
+    """
+    Execute a request built from the shared client over this thread's connection.
+
+    When given the etag of a previous response, the request is made conditional
+    (If-None-Match) and None is returned if the resource is unchanged (304).
+    """
+    http = getattr(_THREAD_LOCAL, "http", None)
+    if http is None:
+        http = _THREAD_LOCAL.http = build_http()
+    if etag is not None:
+        request.headers["If-None-Match"] = etag
+    try:
+        return request.execute(http=http)
+    except HttpError as e:
+        if etag is not None and e.resp.status == 304:
+            return None
+        raise
@@ -0,0 +1,28 @@
+import bisect
+import datetime
+
+from congress_shared.globals import CONGRESS_METADATA
+
+
+class CongressDateBuckets:
+    """
+    Maps publishedAt timestamps to congress numbers by bisecting the sorted
+    congress start dates, matching each timestamp to the congress whose
+    ``start <= publishedAt <= end`` (compared as ISO strings).
+    """
+
+    def __init__(self, congress_metadata: dict[str, dict] = CONGRESS_METADATA):
+        today = datetime.date.today().isoformat()
+        spans = sorted(
+            (meta["start"], today if meta["end"] == "present" else meta["end"], key)
+            for key, meta in congress_metadata.items()
+        )
+        self.starts = [start for start, _, _ in spans]
+        self.ends = [end for _, end, _ in spans]
+        self.congress_numbers = [key for _, _, key in spans]
+
+    def congress_of(self, published_at: str) -> str | None:
+        i = bisect.bisect_right(self.starts, published_at) - 1
+        if i < 0 or published_at > self.ends[i]:
+            return None
+        return self.congress_numbers[i]
@@ -0,0 +1,35 @@
+import re
+
+## any 6 digit run or the literal "eventid" counts as a video carrying an event
+##  id; unanchored so re.search stops at the first hit instead of backtracking
+##  through a greedy ".*" on both sides
+EVENT_ID_PATTERN = re.compile(r"\d{6}|eventid", re.IGNORECASE)
+
+## an explicitly labelled id, e.g. "(EventID=118543)" or "Event ID: 118543"
+_LABELLED_EVENT_ID = re.compile(r"event\s*id\W{0,3}(\d{6})(?!\d)", re.IGNORECASE)
+## otherwise a standalone 6 digit number, e.g. ".../house-event/118543"
+_BARE_EVENT_ID = re.compile(r"(?<!\d)(\d{6})(?!\d)")
+
+
+def has_event_id(video: dict) -> bool:
+    """Whether a video's title or description mentions a Congress.gov event id."""
+    ## titles are short, so check them first and skip the description on a hit
+    return (
+        EVENT_ID_PATTERN.search(video["title"]) is not None
+        or EVENT_ID_PATTERN.search(video["description"]) is not None
+    )
+
+
+def extract_event_id(video: dict) -> int | None:
+    """
+    Return the Congress.gov event id a video's title or description refers to,
+    preferring an explicitly labelled id over a bare 6 digit number and the
+    title over the description, or None if there is none.
+    """
+    fields = (video["title"], video["description"])
+    for pattern in (_LABELLED_EVENT_ID, _BARE_EVENT_ID):
+        for text in fields:
+            match = pattern.search(text)
+            if match is not None:
+                return int(match.group(1))
+    return None
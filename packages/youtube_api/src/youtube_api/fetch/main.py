@@ -1,10 +1,13 @@
 import argparse
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from congress_shared.auth import load_youtube_api_key
 from congress_shared.globals import add_global_args, add_youtube_args
+from youtube_api.client import get_youtube_client
+from youtube_api.quota import DEFAULT_DAILY_QUOTA, QuotaAccountant, QuotaExhausted
 from youtube_api.tables import (
     get_all_committee_handless,
     get_all_commitee_names,
@@ -13,10 +16,26 @@ from youtube_api.tables import (
 from .youtube_event_fetcher import YoutubeEventFetcher
 
 
+## stop scheduling new committees once fewer units than this are left, so
+##  the committees already in flight can finish paging through their channels
+DEFAULT_QUOTA_RESERVE = 500
+
+
 def main(
-    tinydb_dir: Path, committee_name: str, committee_index: int, channels_csv_path: str
+    tinydb_dir: Path,
+    committee_name: str,
+    committee_index: int,
+    channels_csv_path: str,
+    nthreads: int = 1,
+    daily_quota: int = DEFAULT_DAILY_QUOTA,
+    enrich: bool = False,
+    incremental: bool = False,
 ) -> None:
     api_key = load_youtube_api_key()
+    ## build the API client once and share it with every committee's fetcher
+    youtube = get_youtube_client(api_key)
+    ## one accountant shared by every fetcher so the run stays under the quota
+    quota = QuotaAccountant(daily_quota, reserve=DEFAULT_QUOTA_RESERVE)
 
     ## read the names of each committee from the CSV file, include their row
     ##  indices so we can name their json files programmatically
@@ -37,8 +56,13 @@ def main(
             raise ValueError(f"Committee index {committee_index} is out of range (0-{len(committee_names)-1})")
         committee_names = [(committee_names[committee_index][0], committee_index)]
 
-    ## loop through the selected committees (defaults to all of them)
-    for committee_name, committee_index in committee_names:
+    def fetch_committee(committee_index: int) -> None:
+        if not quota.can_schedule():
+            logging.warning(
+                f"Skipping committee {committee_index}, only {quota.remaining} quota units left."
+            )
+            return
+
         ## specify the tinydb for this committee
         ## create a fetcher for this committee
         fetcher = YoutubeEventFetcher(
@@ -46,17 +70,38 @@ def main(
             committee_index=committee_index,
             csv_path=channels_csv_path,
             tinydb_dir=tinydb_dir,
+            youtube=youtube,
+            quota=quota,
         )
+        fetcher.incremental = incremental
 
         handles = all_committee_handless[committee_index]
-        for handle in handles:
-            logging.info(f"Working on: {handle}")
-            if len(handle) > 0:
-                ## save channel metadata to the fetcher & the DB
-                fetcher.get_channel(handle)
-                ## read the "uploaded" playlist from the previously fetched metadata
-                ##  and then store details about each video to the DB
-                fetcher.get_all_channel_videos(handle)
+        try:
+            for handle in handles:
+                logging.info(f"Working on: {handle}")
+                if len(handle) > 0:
+                    ## save channel metadata to the fetcher & the DB
+                    fetcher.get_channel(handle)
+                    ## read the "uploaded" playlist from the previously fetched metadata
+                    ##  and then store details about each video to the DB
+                    fetcher.get_all_channel_videos(handle)
+                    if enrich:
+                        ## add duration/live-stream/stats in batches of 50
+                        fetcher.enrich_videos(handle)
+        except QuotaExhausted as e:
+            logging.error(f"Stopped committee {committee_index}: {e}")
+
+    ## loop through the selected committees (defaults to all of them)
+    ##  each committee has its own tinydb, so they can be fetched concurrently
+    with ThreadPoolExecutor(max_workers=max(nthreads, 1)) as executor:
+        ## list() to surface any exception raised by a committee
+        list(
+            executor.map(
+                fetch_committee,
+                [committee_index for _, committee_index in committee_names],
+            )
+        )
+    quota.log_summary()
 
 
 def parse_args_and_run():
@@ -85,6 +130,35 @@ def parse_args_and_run():
         help="Index of the committee in the CSV file",
     )
 
+    parser.add_argument(
+        "--nthreads",
+        type=int,
+        default=1,
+        help="Number of committees to fetch concurrently (default: 1).",
+    )
+
+    parser.add_argument(
+        "--daily-quota",  ## dashes are automatically converted to underscores
+        type=int,
+        default=DEFAULT_DAILY_QUOTA,
+        help="YouTube Data API units this run may spend; no new committees are"
+        " started once the quota is nearly used up.",
+    )
+
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Also fetch duration, live-stream start/end and view stats of"
+        " stored videos that lack them (1 quota unit per 50 videos).",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Use the ETags and latest-video marks stored by the last sync to"
+        " skip unchanged channels with a single conditional request.",
+    )
+
     ## ignore the unknown args
     args = parser.parse_known_args()[0]
 
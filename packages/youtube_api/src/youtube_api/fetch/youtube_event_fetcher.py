@@ -1,12 +1,29 @@
 import logging
 
-from googleapiclient.discovery import build
+from datetime import datetime, timedelta, timezone
+from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 from pathlib import Path
 from tinydb import where
-from tinydb.table import Table
+from tinydb.table import Document, Table
 
-from youtube_api.tables import open_tinydb_for_committee
+from congress_shared.storage import flush_tinydb, get_key_index
+from youtube_api.client import (
+    API_SERVICE_NAME,
+    API_VERSION,
+    execute,
+    get_youtube_client,
+)
+from youtube_api.quota import QuotaAccountant
+from youtube_api.tables import VIDEOS_TABLE_PREFIX, open_tinydb_for_committee
+
+## videos.list accepts at most this many ids per call
+VIDEOS_LIST_MAX_IDS = 50
+
+## in incremental mode, stored channel metadata is revalidated this often
+CHANNEL_REVALIDATE_AFTER = timedelta(days=7)
+
+ISO_FMT = "%Y-%m-%dT%H:%M:%SZ"
 
 
 class YoutubeEventFetcher:
@@ -15,18 +32,27 @@ class YoutubeEventFetcher:
 
     Attributes:
         youtube: The YouTube API service client.
+        quota (QuotaAccountant): Tally of the API units spent, shared between
+            fetchers running concurrently.
+        incremental (bool): Send conditional requests using the ETags and
+            high-water marks stored in sync_tb, so an unchanged channel costs
+            a single request.
+        sync_tb (Table): Per-handle sync state (ETags, latest video seen).
 
     Methods:
         get_event(): Search for a YouTube video by title and optional channel ID.
         get_channel(): Retrieve channel information by handle.
+        get_all_channel_videos(): Store the snippets of a channel's uploads.
+        enrich_videos(): Add duration, live-stream and view details to stored videos.
     """
 
-    API_SERVICE_NAME = "youtube"
-    API_VERSION = "v3"
+    API_SERVICE_NAME = API_SERVICE_NAME
+    API_VERSION = API_VERSION
 
     videos_tbs = {}
     channels_tb: Table = None
     force = False
+    incremental = False
 
     def __init__(
         self,
@@ -34,16 +60,23 @@ class YoutubeEventFetcher:
         committee_index: int,
         csv_path: Path,
         tinydb_dir: Path,
+        youtube: Resource | None = None,
+        quota: QuotaAccountant | None = None,
     ):
         """
         Initialize the YouTube API client with the provided API key.
 
         Args:
             youtube_api_key (str): The YouTube Data API key for authentication.
+            youtube (Resource | None): A prebuilt YouTube API client to share
+                between fetchers, defaults to the process-wide client.
+            quota (QuotaAccountant | None): Accountant charged for every call,
+                defaults to a fresh one with the default daily quota.
         """
-        self.youtube = build(
-            self.API_SERVICE_NAME, self.API_VERSION, developerKey=youtube_api_key
-        )
+        if youtube is None:
+            youtube = get_youtube_client(youtube_api_key)
+        self.youtube = youtube
+        self.quota = quota if quota is not None else QuotaAccountant()
 
         self.tinydb = open_tinydb_for_committee(
             committee_name_or_index=committee_index,
@@ -53,6 +86,8 @@ class YoutubeEventFetcher:
 
         self.videos_tbs = {}
         self.channels_tb = self.tinydb.table("youtube_channels")
+        self.sync_tb = self.tinydb.table("youtube_sync_state")
+        self.sync_index = get_key_index(self.sync_tb, "handle")
 
     def get_channel(self, channel_handle: str) -> dict | None:
         """
@@ -98,6 +133,8 @@ class YoutubeEventFetcher:
 
             ## check if we've already stored this channel
             if len(search_results) == 1:
+                if self.incremental and self.channel_is_stale(channel_handle):
+                    return self.revalidate_channel(channel_handle, search_results[0])
                 return search_results[0]
             elif len(search_results) > 1:
                 if self.force:
@@ -108,28 +145,73 @@ class YoutubeEventFetcher:
                     )
 
             ## hit the API if our channel isn't in the store
-            channel_response = (
-                self.youtube.channels()
-                .list(part=["snippet", "contentDetails"], forHandle=channel_handle)
-                .execute()
+            self.quota.charge("channels.list")
+            channel_response = execute(
+                self.youtube.channels().list(
+                    part=["snippet", "contentDetails"], forHandle=channel_handle
+                )
             )
 
             channel_details = channel_response["items"][0]
 
             ## store the channel details
             self.store_channel(channel_handle, channel_details)
+            self.update_sync_state(
+                channel_handle,
+                channelEtag=channel_response.get("etag"),
+                channelCheckedAt=utcnow(),
+            )
 
             return channel_details
 
         except (HttpError, IndexError) as ex:
             logging.error(ex)
 
+    def channel_is_stale(self, channel_handle: str) -> bool:
+        state = self.sync_index.get(channel_handle)
+        if state is None or state.get("channelCheckedAt") is None:
+            return True
+        checked_at = datetime.strptime(state["channelCheckedAt"], ISO_FMT)
+        return datetime.now(timezone.utc).replace(tzinfo=None) - checked_at > (
+            CHANNEL_REVALIDATE_AFTER
+        )
+
+    def revalidate_channel(self, channel_handle: str, channel: Document) -> dict:
+        """Refresh stored channel metadata with a conditional channels.list."""
+        state = self.sync_index.get(channel_handle) or {}
+        self.quota.charge("channels.list")
+        channel_response = execute(
+            self.youtube.channels().list(
+                part=["snippet", "contentDetails"], forHandle=channel_handle
+            ),
+            etag=state.get("channelEtag"),
+        )
+        if channel_response is None:
+            logging.info(f"{channel_handle} metadata is unchanged.")
+            self.update_sync_state(channel_handle, channelCheckedAt=utcnow())
+            return channel
+
+        doc = parse_channel_details(channel_response["items"][0])
+        doc["handle"] = channel_handle
+        self.channels_tb.update(doc, doc_ids=[channel.doc_id])
+        self.update_sync_state(
+            channel_handle,
+            channelEtag=channel_response.get("etag"),
+            channelCheckedAt=utcnow(),
+        )
+        return self.channels_tb.get(doc_id=channel.doc_id)
+
+    def update_sync_state(self, channel_handle: str, **fields) -> None:
+        self.sync_index.upsert({"handle": channel_handle, **fields})
+        flush_tinydb(self.tinydb)
+
     def store_channel(self, channel_handle: str, channel_details: dict) -> None:
         doc = parse_channel_details(channel_details)
         doc["handle"] = channel_handle
 
         ## insert the channel
         self.channels_tb.insert(doc)
+        flush_tinydb(self.tinydb)
 
     def get_all_channel_videos(self, channel_handle: str) -> None:
         """
@@ -162,15 +244,20 @@ class YoutubeEventFetcher:
         ]
 
         ## create a videos table for this channel
-        videos_tb = self.tinydb.table(f"youtube_videos_{channel_handle}")
+        videos_tb = self.tinydb.table(f"{VIDEOS_TABLE_PREFIX}{channel_handle}")
 
         ## clear the table if we want to force download
         if self.force:
-            videos_tb.truncate()
+            get_key_index(videos_tb, "videoId").truncate()
 
         ## bind it so we can access it later
         self.videos_tbs[channel_handle] = videos_tb
 
+        ## the high-water marks of the last sync, ignored when forcing a refetch
+        state = {} if self.force else (self.sync_index.get(channel_handle) or {})
+        latest_published_at = state.get("latestPublishedAt")
+        new_state = {}
+
         ## pagination loop
         pageToken = None
         break_flag = False
@@ -178,25 +265,42 @@ class YoutubeEventFetcher:
         added = 0
         while True:
             ## get this page's videos
-            playlistItemsResponse = (
-                self.youtube.playlistItems()
-                .list(
+            self.quota.charge("playlistItems.list")
+            playlistItemsResponse = execute(
+                self.youtube.playlistItems().list(
                     part="snippet",
                     playlistId=playlistId,
                     maxResults=50,
                     pageToken=pageToken,
-                )
-                .execute()
+                ),
+                ## new uploads change the first page, so an unchanged first
+                ##  page means there is nothing new on the channel
+                etag=(
+                    state.get("firstPageEtag")
+                    if self.incremental and fetches == 0
+                    else None
+                ),
             )
+            if playlistItemsResponse is None:
+                logging.info(f"{channel_handle} is unchanged since the last sync.")
+                self.update_sync_state(channel_handle, syncedAt=utcnow())
+                return
+
+            if fetches == 0:
+                new_state = first_page_sync_state(playlistItemsResponse)
             fetches += 1
             total_results = playlistItemsResponse["pageInfo"]["totalResults"]
             logging.info(f"Fetch {fetches} of {int(total_results // 50 + 1)}.")
 
             break_flag, this_added = insert_videos_into_tb(
-                playlistItemsResponse["items"], videos_tb
+                playlistItemsResponse["items"],
+                videos_tb,
+                latest_published_at if self.incremental else None,
             )
 
             added += this_added
+            ## write this page's videos out in one go
+            flush_tinydb(self.tinydb)
 
             ## if we didn't break on the above loop
             if not break_flag:
@@ -208,8 +312,90 @@ class YoutubeEventFetcher:
             ## exit the loop, we're done!
             if break_flag:
                 break
+
+        ## only move the high-water mark forwards
+        if latest_published_at is not None and (
+            new_state.get("latestPublishedAt") is None
+            or new_state["latestPublishedAt"] < latest_published_at
+        ):
+            new_state.pop("latestPublishedAt", None)
+            new_state.pop("latestVideoId", None)
+        self.update_sync_state(channel_handle, **new_state, syncedAt=utcnow())
         logging.info(f"All done! Fetched {fetches * 50} videos, added {added}.")
 
+    def enrich_videos(self, channel_handle: str) -> int:
+        """
+        Add duration, live-stream timing and view stats to every stored video of
+        a channel that doesn't have them yet, asking videos.list for up to 50
+        videos per call (1 quota unit per call instead of per video).
+
+        video:
+        -----
+        {
+            "id": "lQnpl1K8dVY",
+            "contentDetails": { "duration": "PT2H31M12S", ... },
+            "liveStreamingDetails": {
+                "actualStartTime": "2025-07-23T14:02:11Z",
+                "actualEndTime": "2025-07-23T16:33:20Z",
+                "scheduledStartTime": "2025-07-23T14:00:00Z"
+            },
+            "statistics": { "viewCount": "1523", "likeCount": "31", "commentCount": "4" }
+        }
+
+        Returns:
+            int: The number of videos enriched.
+        """
+        videos_tb = self.tinydb.table(f"{VIDEOS_TABLE_PREFIX}{channel_handle}")
+
+        ## videos the API didn't return (private/deleted) are stored with a
+        ##  None duration so they aren't asked for again
+        video_ids = [doc["videoId"] for doc in videos_tb if "duration" not in doc]
+        logging.info(f"Enriching {len(video_ids)} videos of {channel_handle}.")
+
+        enriched = 0
+        for start in range(0, len(video_ids), VIDEOS_LIST_MAX_IDS):
+            batch = video_ids[start : start + VIDEOS_LIST_MAX_IDS]
+            self.quota.charge("videos.list")
+            videos_response = execute(
+                self.youtube.videos().list(
+                    part="contentDetails,liveStreamingDetails,statistics",
+                    id=",".join(batch),
+                )
+            )
+
+            details = dict.fromkeys(batch, {"duration": None})
+            for item in videos_response.get("items", []):
+                details[item["id"]] = parse_video_enrichment(item)
+                enriched += 1
+
+            ## write the whole batch back in one update
+            videos_index = get_key_index(videos_tb, "videoId")
+            videos_tb.update(
+                lambda doc: doc.update(details[doc["videoId"]]),
+                doc_ids=[videos_index.get(video_id).doc_id for video_id in batch],
+            )
+            flush_tinydb(self.tinydb)
+
+        logging.info(
+            f"Enriched {enriched}/{len(video_ids)} videos of {channel_handle}."
+        )
+        return enriched
+
+
+def first_page_sync_state(playlist_items_response: dict) -> dict:
+    """High-water marks of a sync, taken from the first page of a channel's uploads"""
+    state = {"firstPageEtag": playlist_items_response.get("etag")}
+    videos = [parse_video_details(item) for item in playlist_items_response["items"]]
+    if len(videos) > 0:
+        latest = max(videos, key=lambda video: video["publishedAt"])
+        state["latestVideoId"] = latest["videoId"]
+        state["latestPublishedAt"] = latest["publishedAt"]
+    return state
+
+
+def utcnow() -> str:
+    return datetime.now(timezone.utc).strftime(ISO_FMT)
+
 
 def parse_channel_details(channel_details: dict) -> dict:
     """Extract relevant details from channel API response"""
@@ -224,25 +410,56 @@ def parse_channel_details(channel_details: dict) -> dict:
     return channel_data
 
 
-def insert_videos_into_tb(items: list[dict], videos_tb: Table) -> bool:
+def insert_videos_into_tb(
+    items: list[dict], videos_tb: Table, published_after: str | None = None
+) -> tuple[bool, int]:
     break_flag = False
     added = 0
 
+    ## look up stored videos by id instead of scanning the table per item
+    videos_index = get_key_index(videos_tb, "videoId")
+
     ## insert each item OR determine if we should leave the loop
     for item in items:
         doc = parse_video_details(item)
-        search_results = videos_tb.search(where("videoId") == doc["videoId"])
         ## break if we've already processed up until this point
-        if len(search_results) > 0:
+        if doc["videoId"] in videos_index:
             logging.info(f"{doc['videoId']} already exists in {videos_tb}.")
             break_flag = True
             break
-        videos_tb.insert(doc)
+        ## or once we're past the newest video of the last sync
+        if published_after is not None and doc["publishedAt"] < published_after:
+            logging.info(f"{doc['videoId']} predates the last sync of {videos_tb}.")
+            break_flag = True
+            break
+        videos_index.insert(doc)
         added += 1
 
     return break_flag, added
 
 
+def parse_video_enrichment(video: dict) -> dict:
+    """Extract the fields we store from a videos.list API response item"""
+    live = video.get("liveStreamingDetails", {})
+    statistics = video.get("statistics", {})
+
+    return {
+        "duration": video.get("contentDetails", {}).get("duration"),
+        "actualStartTime": live.get("actualStartTime"),
+        "actualEndTime": live.get("actualEndTime"),
+        "scheduledStartTime": live.get("scheduledStartTime"),
+        "viewCount": (
+            int(statistics["viewCount"]) if "viewCount" in statistics else None
+        ),
+        "likeCount": (
+            int(statistics["likeCount"]) if "likeCount" in statistics else None
+        ),
+        "commentCount": (
+            int(statistics["commentCount"]) if "commentCount" in statistics else None
+        ),
+    }
+
+
 def parse_video_details(video_details: dict) -> dict:
     """Extract relevant details from playlistItems API response"""
     video_id = video_details["snippet"]["resourceId"]["videoId"]
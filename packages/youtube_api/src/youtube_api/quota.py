@@ -0,0 +1,64 @@
+import logging
+import threading
+
+## default YouTube Data API allotment per project per day
+DEFAULT_DAILY_QUOTA = 10000
+
+## unit cost of each API method we call
+## https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COSTS = {
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+    "search.list": 100,
+}
+
+
+class QuotaExhausted(RuntimeError):
+    """Raised instead of making a call that would exceed the daily quota."""
+
+
+class QuotaAccountant:
+    """
+    Thread-safe tally of the YouTube Data API units spent by this process.
+
+    Attributes:
+        daily_quota (int): Units available for the run.
+        reserve (int): Units kept back for work already in flight; no new
+            work should be scheduled once only the reserve is left.
+        used (int): Units spent so far.
+
+    Methods:
+        charge(): Account for a call before making it.
+        can_schedule(): Whether there is room to start new work.
+    """
+
+    def __init__(self, daily_quota: int = DEFAULT_DAILY_QUOTA, reserve: int = 0):
+        self.daily_quota = daily_quota
+        self.reserve = reserve
+        self.used = 0
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.daily_quota - self.used
+
+    def charge(self, method: str) -> None:
+        cost = QUOTA_COSTS[method]
+        with self._lock:
+            if self.used + cost > self.daily_quota:
+                raise QuotaExhausted(
+                    f"{method} would exceed the daily quota of {self.daily_quota} units"
+                )
+            self.used += cost
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def can_schedule(self) -> bool:
+        return self.remaining > self.reserve
+
+    def log_summary(self) -> None:
+        logging.info(
+            f"Used {self.used}/{self.daily_quota} quota units over calls: {self.calls}"
+        )
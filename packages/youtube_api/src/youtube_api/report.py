@@ -0,0 +1,28 @@
+import csv
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+## define columns in row of final report
+@dataclass
+class EventIdReport:
+    committee_name: str
+    handle: str
+    total_videos: int
+    missing_event_id: int
+    congress_number: int
+    control: str
+    chamber: str = "house"
+
+
+def write_to_csv(report: list[EventIdReport], output_path: Path):
+    if len(report) == 0:
+        return
+    field_names = list(report[0].__annotations__.keys())
+    with open(output_path, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=field_names)
+
+        writer.writeheader()
+        for row in report:
+            writer.writerow(asdict(row))
@@ -1,12 +1,23 @@
 import csv
 import logging
 import os
+import threading
+import weakref
 
+from collections import OrderedDict
 from pathlib import Path
 from tinydb import TinyDB
 from typing import TypedDict
 
 from congress_shared.globals import DEFAULT_CHANNELS_CSV, DEFAULT_TINYDB_DIR
+from congress_shared.sqlite_storage import SQLiteDatabase
+from congress_shared.storage import flush_tinydb, open_tinydb, resolve_storage_path
+
+## a channel's videos are stored in the table of this prefix + its handle
+VIDEOS_TABLE_PREFIX = "youtube_videos_"
+
+## maximum number of per-committee YouTube TinyDBs kept open at once
+DEFAULT_YOUTUBE_POOL_SIZE = 16
 
 
 class YoutubeChannelMetadata(TypedDict):
@@ -14,57 +25,187 @@ class YoutubeChannelMetadata(TypedDict):
     handles: list[str]
 
 
+class ChannelRegistry:
+    """
+    The parsed committee -> YouTube channel CSV, with O(1) lookups.
+
+    Attributes:
+        csv_path (Path): The CSV file the registry was parsed from.
+        system_codes (dict): Channel metadata keyed by committee systemCode.
+        names (list[str]): Committee names; a name's position is the index used
+            in the programmatic ``youtube_{index:02d}.json`` filenames.
+        handless (list[list[str]]): Channel handles of each committee, by index.
+
+    Methods:
+        get(): Return the channel metadata of a systemCode, or None.
+        index_of(): Return the index of a committee name.
+    """
+
+    def __init__(self, csv_path: Path = DEFAULT_CHANNELS_CSV) -> None:
+        self.csv_path = csv_path
+        self.system_codes: dict[str, YoutubeChannelMetadata] = {}
+        with open(csv_path, newline="", encoding="utf-8") as csvfile:
+            reader = csv.DictReader(csvfile)
+            rows = list(reader)
+
+            for row in rows:
+                ## unpack the row
+                name = row["committee"]
+                systemCode = row["systemCode"]
+                handle = row["handle"]
+                secondary = row["secondary"]
+
+                handles = [handle] + [secondary] * (secondary != " ")
+                self.system_codes[systemCode] = {
+                    "name": name,
+                    "handles": handles,
+                }
+
+        self.names = [meta["name"] for meta in self.system_codes.values()]
+        self.handless = [meta["handles"] for meta in self.system_codes.values()]
+        ## keep the first index of a repeated name, like list.index
+        self._indices: dict[str, int] = {}
+        for index, name in enumerate(self.names):
+            self._indices.setdefault(name, index)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, system_code: str) -> YoutubeChannelMetadata | None:
+        return self.system_codes.get(system_code)
+
+    def index_of(self, committee_name: str) -> int:
+        try:
+            return self._indices[committee_name]
+        except KeyError:
+            raise IndexError(
+                f"No committee name matched {committee_name} in {self.csv_path}"
+            )
+
+
+class _ChannelRegistryMemoizer:
+    """Memoizes ChannelRegistry instances per CSV path, reparsing when its mtime changes."""
+
+    def __init__(self) -> None:
+        self._cache: dict[str, tuple[int, ChannelRegistry]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, csv_path: Path) -> ChannelRegistry:
+        key = os.path.abspath(csv_path)
+        mtime = os.stat(key).st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, ChannelRegistry(csv_path))
+                self._cache[key] = cached
+            return cached[1]
+
+
+_REGISTRY_MEMO = _ChannelRegistryMemoizer()
+
+
+def load_channel_registry(csv_path: Path = DEFAULT_CHANNELS_CSV) -> ChannelRegistry:
+    """Return the ChannelRegistry of csv_path, parsing the file only when it changed."""
+    return _REGISTRY_MEMO.get(csv_path)
+
+
 def map_system_code_committee_handles(
     csv_path: Path = DEFAULT_CHANNELS_CSV,
 ) -> dict[str, YoutubeChannelMetadata]:
-    system_code_mapper = {}
-    with open(csv_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        rows = list(reader)
-
-        for row in rows:
-            ## unpack the row
-            name = row["committee"]
-            systemCode = row["systemCode"]
-            handle = row["handle"]
-            secondary = row["secondary"]
-
-            handles = [handle] + [secondary] * (secondary != " ")
-            system_code_mapper[systemCode] = {
-                "name": name,
-                "handles": handles,
-            }
-    return system_code_mapper
+    return dict(load_channel_registry(csv_path).system_codes)
 
 
 def get_all_committee_handless(
     csv_path: Path = DEFAULT_CHANNELS_CSV,
 ) -> list[list[str]]:
-    system_code_mapper = map_system_code_committee_handles(csv_path)
-    return [meta["handles"] for meta in system_code_mapper.values()]
+    return list(load_channel_registry(csv_path).handless)
 
 
 def get_all_commitee_names(
     csv_path: Path = DEFAULT_CHANNELS_CSV,
     with_index: bool = False,
 ) -> list[str] | list[tuple[str, int]]:
-    system_code_mapper = map_system_code_committee_handles(csv_path)
-    names = [meta["name"] for meta in system_code_mapper.values()]
+    names = load_channel_registry(csv_path).names
     if with_index:
         ## pair each name with its row index so callers can build the
         ## programmatic ``youtube_{index:02d}.json`` filenames.
         return [(name, index) for index, name in enumerate(names)]
-    return names
+    return list(names)
 
 
 def get_committee_index(
     committee_name: str, csv_path: Path = DEFAULT_CHANNELS_CSV
 ) -> int:
-    committee_names: list[str] = get_all_commitee_names(csv_path=csv_path)
-    try:
-        return committee_names.index(committee_name)
-    except ValueError:
-        raise IndexError(f"No committee name matched {committee_name} in {csv_path}")
+    return load_channel_registry(csv_path).index_of(committee_name)
+
+
+class _YoutubeTinyDBPool:
+    """
+    Process-wide pool of opened per-committee YouTube TinyDBs, keyed by
+    resolved path, so each ``youtube_NN.json`` is parsed once no matter how
+    many committees/subcommittees share it. At most `maxsize` databases are
+    kept open by the pool itself; beyond that the least recently used one is
+    dropped, but a database a caller still holds is handed out again rather
+    than opened a second time, and its buffered writes are only flushed once
+    the last reference to it is gone.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_YOUTUBE_POOL_SIZE) -> None:
+        self.maxsize = maxsize
+        self._dbs: OrderedDict[str, TinyDB] = OrderedDict()
+        ## every database handed out and still referenced, evicted or not
+        self._live: "weakref.WeakValueDictionary[str, TinyDB]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> TinyDB:
+        key = os.path.realpath(path)
+        with self._lock:
+            db = self._dbs.get(key)
+            if db is not None:
+                self._dbs.move_to_end(key)
+                return db
+
+            db = self._live.get(key)
+            if db is None:
+                if os.path.exists(path=key):
+                    logging.info(f"Using existing tinydb at {path}")
+                db = self._live[key] = open_tinydb(key)
+                _flush_when_collected(db)
+            self._dbs[key] = db
+            while len(self._dbs) > self.maxsize:
+                ## not flushed here, its holders may still be writing to it
+                self._dbs.popitem(last=False)
+            return db
+
+    def clear(self) -> None:
+        with self._lock:
+            for db in list(self._live.values()):
+                flush_tinydb(db)
+            self._dbs.clear()
+
+
+def _flush_when_collected(db: TinyDB | SQLiteDatabase) -> None:
+    """Write db's buffered changes to disk once nothing references it anymore."""
+    if isinstance(db, SQLiteDatabase):
+        flush = db.connection.commit
+    else:
+        flush = getattr(db.storage, "flush", None)
+    ## bound to the storage or connection, not db, which would keep it alive
+    if flush is not None:
+        weakref.finalize(db, flush)
+
+
+_YOUTUBE_POOL = _YoutubeTinyDBPool()
+
+
+def youtube_tinydb_path(
+    committee_index: int, tinydb_dir: Path = DEFAULT_TINYDB_DIR
+) -> Path:
+    return resolve_storage_path(
+        Path(tinydb_dir) / "youtube_{index:02d}.json".format(index=committee_index)
+    )
 
 
 def open_tinydb_for_committee(
@@ -78,14 +219,13 @@ def open_tinydb_for_committee(
         committee_name_or_index = get_committee_index(committee_name_or_index, csv_path)
 
     ## format the path
-    path = tinydb_dir / "youtube_{index:02d}.json".format(index=committee_name_or_index)
+    path = youtube_tinydb_path(committee_name_or_index, tinydb_dir)
 
     ## check for existence, when analyzing we want to break on
     ##  non-existent DBs, when fetching we want to create them
-    if os.path.exists(path=path):
-        logging.info(f"Using existing tinydb at {path}")
-    elif assert_exists:
+    if assert_exists and not os.path.exists(path=path):
         raise ValueError(
             f"No existing tinydb file for index {committee_name_or_index} at {path}"
         )
-    return TinyDB(path)
+    ## shared with every other caller asking for the same file
+    return _YOUTUBE_POOL.get(path)
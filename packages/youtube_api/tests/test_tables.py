@@ -0,0 +1,25 @@
+import gc
+import json
+
+from youtube_api.tables import _YoutubeTinyDBPool
+
+
+def test_evicted_database_still_held_is_reused(tmp_path):
+    pool = _YoutubeTinyDBPool(maxsize=1)
+    first = pool.get(tmp_path / "youtube_00.json")
+    first.table("youtube_videos_@a").insert({"videoId": "a1"})
+
+    ## evicts youtube_00 from the pool while first is still being written to
+    pool.get(tmp_path / "youtube_01.json")
+    assert pool.get(tmp_path / "youtube_00.json") is first
+
+
+def test_evicted_database_is_flushed_once_released(tmp_path):
+    path = tmp_path / "youtube_00.json"
+    pool = _YoutubeTinyDBPool(maxsize=1)
+    pool.get(path).table("youtube_videos_@a").insert({"videoId": "a1"})
+    assert not path.exists() or "a1" not in path.read_text()
+
+    pool.get(tmp_path / "youtube_01.json")
+    gc.collect()
+    assert json.loads(path.read_text())["youtube_videos_@a"] == {"1": {"videoId": "a1"}}